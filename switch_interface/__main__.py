@@ -7,15 +7,21 @@ from switch_interface.logging import setup as _setup_logging
 _setup_logging()
 
 import argparse
+import logging
+import multiprocessing
 import threading
-from queue import Empty, SimpleQueue
 
 import json
-from .detection import listen, check_device
+from dataclasses import asdict
+from .audio.supervisor import AudioSupervisor
+from .detection import listen, listen_switches, check_device
 from .calibration import calibrate, DetectorConfig, load_config, save_config
 from .kb_gui import VirtualKeyboard
 from .kb_layout_io import load_keyboard
+from .latency import LatencyTracker
 from .pc_control import PCController
+from .predictive import get_default_predictor
+from .press_delivery import PressDelivery
 from .scan_engine import Scanner
 
 from pathlib import Path
@@ -25,6 +31,8 @@ import sys
 
 _LOG_PATH = Path.home() / ".switch_interface.log"
 
+log = logging.getLogger(__name__)
+
 
 def _open_log_if_exists() -> None:
     if _LOG_PATH.exists():
@@ -57,6 +65,35 @@ def main(argv: list[str] | None = None) -> None:
         action="store_true",
         help="Use row/column scanning instead of simple linear scanning",
     )
+    parser.add_argument(
+        "--scan-cost-ranking",
+        action="store_true",
+        help="Order word predictions by the scan time they save",
+    )
+    parser.add_argument(
+        "--build-model-in-process",
+        action="store_true",
+        help="Build the predictive text model in a worker process",
+    )
+    parser.add_argument(
+        "--latency-report",
+        action="store_true",
+        help="Print switch-to-key latency percentiles on exit",
+    )
+    parser.add_argument(
+        "--switches",
+        type=int,
+        choices=(1, 2),
+        default=1,
+        help="Number of switches, one per input channel; "
+        "the second switch steps the scan",
+    )
+    parser.add_argument(
+        "--decimate-to",
+        type=int,
+        metavar="HZ",
+        help="Run switch detection at roughly this sample rate to save CPU",
+    )
     parser.add_argument(
         "--calibrate",
         action="store_true",
@@ -68,6 +105,8 @@ def main(argv: list[str] | None = None) -> None:
     if args.calibrate:
         cfg = calibrate(cfg)
         save_config(cfg)
+    if args.decimate_to:
+        cfg.decimate_to = args.decimate_to
 
     try:
         check_device(
@@ -86,37 +125,70 @@ def main(argv: list[str] | None = None) -> None:
     except json.JSONDecodeError as exc:
         parser.error(f"Invalid JSON in layout file '{args.layout}': {exc.msg}")
 
+    predictor = get_default_predictor(build_in_process=args.build_model_in_process)
+    latency = LatencyTracker()
+
+    def _emit(key) -> None:
+        pc_controller.on_key(key)
+        latency.mark_current("emitted")
+
     vk = VirtualKeyboard(
-        keyboard, on_key=pc_controller.on_key, state=pc_controller.state
-        )
+        keyboard,
+        on_key=_emit,
+        state=pc_controller.state,
+        predictor=predictor,
+    )
+    if args.scan_cost_ranking:
+        vk.set_scan_timing(args.dwell, args.row_column)
 
     scanner = Scanner(vk, dwell=args.dwell, row_column_scan=args.row_column)
     scanner.start()
 
-    press_queue: SimpleQueue[None] = SimpleQueue()
-
-    def _on_switch() -> None:
-        press_queue.put(None)
-
-    def _pump_queue() -> None:
-        while True:
-            try:
-                press_queue.get_nowait()
-            except Empty:
-                break
-            scanner.on_press()
-        vk.root.after(10, _pump_queue)
+    delivery = PressDelivery(
+        vk.root, lambda timestamp: latency.handle(timestamp, scanner.on_press)
+    )
+    supervisor = AudioSupervisor()
+    vk.watch_input(supervisor)
+
+    def _on_switch(timestamp: float) -> None:
+        latency.mark("detected", timestamp)
+        delivery.post(timestamp)
+
+    if args.switches == 1:
+        threading.Thread(
+            target=listen,
+            args=(_on_switch,),
+            kwargs=dict(asdict(cfg), supervisor=supervisor),
+            daemon=True,
+        ).start()
+    else:
+        step_delivery = PressDelivery(
+            vk.root, lambda _: scanner.step(), event="<<SwitchStep>>"
+        )
 
-    threading.Thread(
-        target=listen,
-        args=(_on_switch, cfg),
-        daemon=True,
-    ).start()
-    vk.root.after(10, _pump_queue)
-    vk.run()
+        def _on_switches(switch: int, timestamp: float) -> None:
+            if switch == 0:
+                _on_switch(timestamp)
+            else:
+                step_delivery.post(timestamp)
+
+        threading.Thread(
+            target=listen_switches,
+            args=(_on_switches,),
+            kwargs=dict(asdict(cfg), channels=args.switches, supervisor=supervisor),
+            daemon=True,
+        ).start()
+    try:
+        vk.run()
+    finally:
+        supervisor.stop()
+        log.info("%s", latency.log_line())
+        if args.latency_report:
+            print(latency.report())
 
 
 if __name__ == "__main__":  # pragma: no cover - manual entry point
+    multiprocessing.freeze_support()
     try:
         main()
     except Exception:
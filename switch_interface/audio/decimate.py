@@ -0,0 +1,63 @@
+"""Streaming decimation in front of the switch detector.
+
+A switch closure is a step lasting tens of milliseconds, so the detector
+loses nothing by running at a few kilohertz instead of the device rate.
+:class:`Decimator` keeps every ``factor``-th sample.  The output phase
+carries across blocks so any block size yields the same output stream.
+
+There is deliberately no anti-aliasing filter.  The detector fires on a
+fall from above the upper to below the lower threshold between two
+consecutive samples, and band-limiting to the output rate spreads that fall
+over two or three output samples, which hid about 40% of the presses in a
+synthetic clip.  Plain subsampling keeps such edges one sample wide and does
+not change the per-sample noise the thresholds were tuned for.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+__all__ = ["Decimator", "decimation_factor"]
+
+
+def decimation_factor(samplerate: float, target_rate: float) -> int:
+    """Largest integer factor that keeps the rate at or above ``target_rate``."""
+    if target_rate <= 0:
+        raise ValueError("target_rate must be > 0")
+    return max(1, int(samplerate // target_rate))
+
+
+class Decimator:
+    """Downsample blocks of ``(frames,)`` or ``(frames, channels)`` by ``factor``.
+
+    :meth:`process` returns a strided view of the block.
+    """
+
+    def __init__(self, factor: int) -> None:
+        if factor < 1:
+            raise ValueError("factor must be >= 1")
+        self.factor = factor
+        #: offset in the last block of the input sample the first output of
+        #: that block is taken from
+        self.first = 0
+        self._phase = 0
+
+    def output_rate(self, samplerate: float) -> float:
+        return samplerate / self.factor
+
+    def reset(self) -> None:
+        """Forget the output phase; the next block starts a new stream."""
+        self._phase = 0
+
+    def source_index(self, index: int) -> int:
+        """Offset in the last block of the input behind output ``index``."""
+        return self.first + index * self.factor
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Return the samples kept from ``block``."""
+        n = len(block)
+        phase = self._phase
+        self.first = phase
+        count = max(0, (n - phase + self.factor - 1) // self.factor)
+        self._phase = phase + count * self.factor - n
+        return block[phase :: self.factor]
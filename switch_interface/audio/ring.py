@@ -0,0 +1,120 @@
+"""Single-producer/single-consumer ring buffer for audio callbacks.
+
+The producer (the PortAudio callback) only copies samples into a
+preallocated NumPy array and then publishes its write counter; the consumer
+reads up to that counter and publishes its read counter.  Each counter has
+exactly one writer and rebinding an ``int`` attribute is atomic in CPython,
+so no lock is needed and the callback never blocks.  Counters grow without
+wrapping; positions are taken modulo the power-of-two capacity.
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+
+__all__ = ["RingMetrics", "SampleRing"]
+
+
+class RingMetrics(NamedTuple):
+    written: int
+    read: int
+    overruns: int
+    dropped: int
+    high_water: int
+    capacity: int
+
+
+class SampleRing:
+    """Fixed-size ring of ``dtype`` frames of ``channels`` samples.
+
+    With one channel frames are scalars; otherwise data is written and read
+    as ``(frames, channels)`` arrays.  A :meth:`write` that does not fit is
+    dropped whole and counted as an overrun rather than overwriting unread
+    frames.
+    """
+
+    def __init__(
+        self, capacity: int, dtype: str | np.dtype = "float32", channels: int = 1
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be > 0")
+        if channels <= 0:
+            raise ValueError("channels must be > 0")
+        size = 1 << (capacity - 1).bit_length()
+        shape = (size,) if channels == 1 else (size, channels)
+        self.channels = channels
+        self.buffer = np.zeros(shape, dtype=dtype)
+        self._mask = size - 1
+        self.written = 0  # producer-owned
+        self.read = 0  # consumer-owned
+        self.overruns = 0  # producer-owned
+        self.dropped = 0  # producer-owned
+        self.high_water = 0  # producer-owned
+        #: ``(sample index, perf_counter time)`` of a recent sample, set by the
+        #: producer so the consumer can timestamp samples it reads
+        self.anchor: tuple[int, float] = (0, 0.0)
+
+    @property
+    def capacity(self) -> int:
+        return len(self.buffer)
+
+    def __len__(self) -> int:
+        """Number of samples written but not yet read."""
+        return self.written - self.read
+
+    # ───────── producer side ───────────────────────────────────────────────
+    def write(self, data: np.ndarray, timestamp: float | None = None) -> bool:
+        """Copy ``data`` in; return ``False`` (and count an overrun) if full.
+
+        ``timestamp`` is the :func:`time.perf_counter` time of ``data[0]``.
+        """
+        n = len(data)
+        written = self.written
+        fill = written - self.read
+        if fill + n > len(self.buffer):
+            self.overruns += 1
+            self.dropped += n
+            return False
+        start = written & self._mask
+        first = min(n, len(self.buffer) - start)
+        self.buffer[start : start + first] = data[:first]
+        if first < n:
+            self.buffer[: n - first] = data[first:]
+        if fill + n > self.high_water:
+            self.high_water = fill + n
+        if timestamp is not None:
+            self.anchor = (written, timestamp)
+        self.written = written + n  # publish after the copy
+        return True
+
+    # ───────── consumer side ───────────────────────────────────────────────
+    def read_into(self, out: np.ndarray) -> int:
+        """Move up to ``len(out)`` unread samples into ``out``; return the count."""
+        read = self.read
+        n = min(len(out), self.written - read)
+        if n <= 0:
+            return 0
+        start = read & self._mask
+        first = min(n, len(self.buffer) - start)
+        out[:first] = self.buffer[start : start + first]
+        if first < n:
+            out[first:n] = self.buffer[: n - first]
+        self.read = read + n  # release the space after the copy
+        return n
+
+    def time_of(self, index: int, samplerate: float) -> float:
+        """Return the ``perf_counter`` time of absolute sample ``index``."""
+        anchor_index, anchor_time = self.anchor
+        return anchor_time + (index - anchor_index) / samplerate
+
+    def metrics(self) -> RingMetrics:
+        return RingMetrics(
+            self.written,
+            self.read,
+            self.overruns,
+            self.dropped,
+            self.high_water,
+            len(self.buffer),
+        )
@@ -13,7 +13,7 @@ import sounddevice as sd
 
 log = logging.getLogger(__name__)
 
-__all__ = ["open_input", "rescan_backends"]
+__all__ = ["forget_devices", "open_input", "refresh_devices", "rescan_backends"]
 
 
 class InputBackend(abc.ABC):
@@ -46,6 +46,9 @@ class InputBackend(abc.ABC):
 
 _BACKENDS: list[InputBackend] = []
 _BACKENDS_LOADED = False
+#: backend chosen for each requested device; querying PortAudio for the host
+#: API is slow enough to dominate a reconnect
+_RESOLVED: dict[int | str | None, InputBackend] = {}
 
 def _discover_backends() -> None:
 
@@ -132,8 +135,10 @@ def open_input(
                 break
         else:
             raise RuntimeError(f"Requested backend {backend!r} not found")
+    elif device in _RESOLVED:
+        chosen = _RESOLVED[device]
     else:
-        chosen = _select_backend(device)
+        chosen = _RESOLVED[device] = _select_backend(device)
 
     with chosen.open(
         samplerate=samplerate,
@@ -146,9 +151,36 @@ def open_input(
     ) as stream:
         yield stream
 
+def forget_devices() -> None:
+    """Drop cached device-to-backend choices."""
+    _RESOLVED.clear()
+
+
+def refresh_devices() -> None:
+    """Make PortAudio enumerate devices again, e.g. after a USB re-plug.
+
+    PortAudio only lists devices when it is initialised, so this restarts
+    it; no stream may be open.
+    """
+    forget_devices()
+    # sounddevice has no public way to restart PortAudio; these private
+    # helpers exist in current releases but may go away in a later one
+    terminate = getattr(sd, "_terminate", None)
+    initialize = getattr(sd, "_initialize", None)
+    if terminate is None or initialize is None:
+        log.debug("sounddevice cannot re-initialise PortAudio; device list kept")
+        return
+    try:
+        terminate()
+        initialize()
+    except Exception as exc:
+        log.debug("Could not re-initialise PortAudio: %s", exc)
+
+
 def rescan_backends() -> None:
     global _BACKENDS_LOADED
     _BACKENDS_LOADED = False
     _BACKENDS.clear()
-    _discover_backends()    
+    forget_devices()
+    _discover_backends()
     log.debug("Re-scanning backends")
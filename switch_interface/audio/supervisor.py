@@ -0,0 +1,174 @@
+"""Keep the audio input open across device errors, stalls and unplugging.
+
+:class:`AudioSupervisor` opens the input through
+:func:`~switch_interface.audio.stream.open_input` and watches it from the
+consumer loop.  A stream that fails to open, stops being active or delivers
+no audio for ``stall_timeout`` seconds is closed and reopened with
+exponential backoff.  The first retry reuses the cached device resolution,
+so a transient error costs one stream restart.  Later retries make PortAudio
+enumerate devices again so a re-plugged adapter is found.
+
+:attr:`AudioSupervisor.state` is safe to read from any thread; the GUI
+polls it to tell the user when presses cannot be heard.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import AbstractContextManager
+from enum import Enum
+from typing import Any, Callable, Optional
+
+from .wakeup import Wakeup
+
+log = logging.getLogger(__name__)
+
+__all__ = ["AudioSupervisor", "InputState"]
+
+
+class InputState(str, Enum):
+    connecting = "connecting"
+    running = "running"
+    reconnecting = "reconnecting"
+    stopped = "stopped"
+
+
+class StreamLost(RuntimeError):
+    """The open stream stopped or went quiet."""
+
+
+class AudioSupervisor:
+    """Run an input stream until :meth:`stop`, reopening it when it fails."""
+
+    def __init__(
+        self,
+        *,
+        stall_timeout: float = 1.0,
+        initial_backoff: float = 0.05,
+        max_backoff: float = 5.0,
+        on_state: Optional[Callable[[InputState], None]] = None,
+        open_stream: Optional[Callable[..., AbstractContextManager[Any]]] = None,
+        refresh_devices: Optional[Callable[[], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.stall_timeout = stall_timeout
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.on_state = on_state
+        self._open_stream = open_stream
+        self._refresh_devices = refresh_devices
+        self._clock = clock
+        self._sleep = sleep
+        self._stop = threading.Event()
+        self._wake: Wakeup | None = None
+        #: set while ``on_poll`` runs so its errors are not taken for a lost device
+        self._polling = False
+        self.state = InputState.stopped
+        #: why the stream was last lost, for display
+        self.error: str | None = None
+        #: number of times a working stream was lost and reopened
+        self.reconnects = 0
+        self._last_audio = 0.0
+        self._heard = False
+
+    def stop(self) -> None:
+        """Make :meth:`run` return after its current poll or backoff wait."""
+        self._stop.set()
+        if self._wake is not None:
+            self._wake.set()
+
+    def _set_state(self, state: InputState) -> None:
+        if state is self.state:
+            return
+        self.state = state
+        log.info("Audio input %s", state.value)
+        if self.on_state is not None:
+            self.on_state(state)
+
+    def _backoff(self, failures: int) -> float:
+        return min(self.max_backoff, self.initial_backoff * 2 ** (failures - 1))
+
+    def run(
+        self,
+        callback: Callable[..., None],
+        on_poll: Callable[[], None],
+        poll: float,
+        *,
+        wake: Wakeup | None = None,
+        **stream_kwargs: Any,
+    ) -> None:
+        """Stream into ``callback``, calling ``on_poll`` every ``poll`` seconds.
+
+        With ``wake``, ``on_poll`` runs as soon as it is set (by ``callback``
+        when it has work) and ``poll`` is only the longest wait.
+        ``stream_kwargs`` go to ``open_input``.  Returns after :meth:`stop`,
+        at once if that was called before; a stopped supervisor stays
+        stopped.  Any exception from ``on_poll`` propagates instead of
+        reopening the stream.
+        """
+        open_stream = self._open_stream
+        refresh = self._refresh_devices
+        if open_stream is None or refresh is None:
+            from . import stream
+
+            open_stream = open_stream or stream.open_input
+            refresh = refresh or stream.refresh_devices
+
+        def _watched(*args: Any) -> None:
+            self._last_audio = self._clock()
+            self._heard = True
+            callback(*args)
+
+        self._wake = wake
+        self._polling = False
+        self._set_state(InputState.connecting)
+        failures = 0
+        try:
+            while not self._stop.is_set():
+                if failures > 1:
+                    refresh()
+                self._heard = False
+                try:
+                    with open_stream(callback=_watched, **stream_kwargs) as stream:
+                        self._last_audio = self._clock()
+                        self._watch(stream, on_poll, poll)
+                    break  # stopped
+                except Exception as exc:
+                    if self._polling:
+                        raise  # a consumer bug, not a lost device
+                    self.error = str(exc) or type(exc).__name__
+                if self._heard:
+                    # it worked for a while: start the backoff again
+                    self.reconnects += 1
+                    failures = 0
+                failures += 1
+                delay = self._backoff(failures)
+                log.warning(
+                    "Audio input lost (%s); retrying in %.2f s", self.error, delay
+                )
+                self._set_state(InputState.reconnecting)
+                self._stop.wait(delay)
+        finally:
+            self._set_state(InputState.stopped)
+
+    def _watch(self, stream: Any, on_poll: Callable[[], None], poll: float) -> None:
+        wake = self._wake
+        while not self._stop.is_set():
+            if wake is None:
+                self._sleep(poll)
+            else:
+                wake.wait(poll)
+                wake.clear()
+            self._polling = True
+            on_poll()
+            self._polling = False
+            if self._heard and self.state is not InputState.running:
+                self.error = None
+                self._set_state(InputState.running)
+            if not getattr(stream, "active", True):
+                raise StreamLost("audio stream stopped")
+            if self._clock() - self._last_audio > self.stall_timeout:
+                raise StreamLost(f"no audio for {self.stall_timeout:g} s")
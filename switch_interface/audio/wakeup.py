@@ -0,0 +1,51 @@
+"""Lock-free wake-up from the audio callback to its consumer.
+
+The PortAudio callback must not take locks, so it cannot set a
+:class:`threading.Event`, whose ``set`` acquires a condition lock and
+notifies waiters.  :class:`Wakeup` is a self-pipe instead: :meth:`set`
+writes one byte to a non-blocking socket and the consumer waits for it with
+:func:`select.select`.  A socket pair rather than :func:`os.pipe` because on
+Windows ``select`` only takes sockets.
+"""
+
+from __future__ import annotations
+
+import select
+import socket
+
+__all__ = ["Wakeup"]
+
+
+class Wakeup:
+    """Event-like ``set``/``wait``/``clear`` over a non-blocking socket pair.
+
+    :meth:`set` never blocks: when the socket buffer is full a wake-up is
+    already pending and the byte is dropped.
+    """
+
+    def __init__(self) -> None:
+        self._reader, self._writer = socket.socketpair()
+        self._reader.setblocking(False)
+        self._writer.setblocking(False)
+
+    def set(self) -> None:
+        try:
+            self._writer.send(b"\0")
+        except OSError:
+            pass  # buffer full, so a wake-up is pending; or already closed
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait up to ``timeout`` seconds for :meth:`set`; True if it was."""
+        readable, _, _ = select.select([self._reader], [], [], timeout)
+        return bool(readable)
+
+    def clear(self) -> None:
+        try:
+            while self._reader.recv(4096):
+                pass
+        except OSError:
+            pass  # nothing left to read
+
+    def close(self) -> None:
+        self._reader.close()
+        self._writer.close()
@@ -6,24 +6,30 @@ Fast, data-driven calibration for clean digital-switch signals.
 
 • Pass ``verbose=True`` or set ``SWITCH_CALIB_VERBOSE=1`` for DEBUG logs.
 • Public API:
-      calibrate(samples, fs, *, target_presses=None, verbose=None) -> CalibResult
+      calibrate(samples, fs, *, target_presses=None, verbose=None,
+                workers=1, session=None, blocksize=64,
+                bias_time_constant_ms=1160.0) -> CalibResult
+      CalibrationSession(samples, fs) – the per-clip work ``calibrate`` shares
+      CalibrationSession.sweep(...) -> SweepResult – counts over a settings grid
 """
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import math
+import multiprocessing
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from functools import lru_cache
-from typing import List
+from typing import List, Sequence
 
 import numpy as np
-from numpy.lib.stride_tricks import sliding_window_view
-from scipy.signal import find_peaks
-from scipy.ndimage import uniform_filter1d
+from scipy.signal import find_peaks, lfilter
+from scipy.ndimage import distance_transform_cdt, rank_filter, uniform_filter1d
 
-from .detection import EdgeState, detect_edges
+from .detection import BIAS_TIME_CONSTANT_MS, _ema_weights, bias_decay
 
 # ------------------------------------------------------------------ #
 # logging
@@ -52,9 +58,80 @@ class CalibResult:
     calib_ok: bool = True
 
 
+@dataclass
+class SweepResult:
+    """Press counts over a grid of threshold scales × debounce times.
+
+    ``counts[i, j]`` is the number of presses detected with both offsets
+    multiplied by ``scales[i]`` and a ``debounces[j]`` ms debounce.  Where
+    the count is further from ``target`` than the best cell's, it may only
+    be a lower bound: the sweep stops counting there.  ``exact`` is False
+    for those cells; it defaults to all True.
+    """
+
+    scales: np.ndarray
+    debounces: np.ndarray
+    counts: np.ndarray
+    target: int
+    exact: np.ndarray | None = None
+
+    def __post_init__(self) -> None:
+        if self.exact is None:
+            self.exact = np.ones(self.counts.shape, dtype=bool)
+
+    @property
+    def errors(self) -> np.ndarray:
+        return np.abs(self.counts - self.target)
+
+    def robustness(self) -> np.ndarray:
+        """Grid steps from each cell to the nearest one with a larger error.
+
+        Cells past the edge of the grid count as worse, since nothing is
+        known about them.  Cells with more than the smallest error are 0.
+        """
+        best = self.errors == self.errors.min()
+        padded = np.pad(best, 1, constant_values=False)
+        return distance_transform_cdt(padded, metric="chessboard")[1:-1, 1:-1]
+
+    def best(self) -> tuple[float, int]:
+        """``(scale, debounce_ms)`` deepest inside the smallest-error region.
+
+        Ties go to the scale closest to 1, then to the shorter debounce.
+        """
+        robust = self.robustness()
+        rows, cols = np.nonzero(robust == robust.max())
+        order = np.lexsort((cols, np.abs(np.log(self.scales[rows]))))
+        i, j = rows[order[0]], cols[order[0]]
+        return float(self.scales[i]), int(self.debounces[j])
+
+
 # ------------------------------------------------------------------ #
 # helpers
 # ------------------------------------------------------------------ #
+def _rolling_quantile(raw: np.ndarray, win_len: int, q: float) -> np.ndarray:
+    """Return ``np.quantile`` of every length-``win_len`` window of ``raw``.
+
+    Equivalent to ``np.quantile(sliding_window_view(raw, win_len), q, axis=-1)``
+    (linear interpolation) without the ``len(raw) x win_len`` temporary: the
+    two order statistics around ``q`` come from SciPy's 1-D rank filter,
+    which keeps a sorted window for O(N log w) time and O(w) extra memory.
+    """
+    pos = q * (win_len - 1)
+    lo = int(math.floor(pos))
+    t = pos - lo
+    # an origin of (w - 1) // 2 makes output j rank the window ending at j
+    origin = (win_len - 1) // 2
+    below = rank_filter(raw, lo, size=win_len, origin=origin)[win_len - 1 :]
+    if t == 0:
+        return below
+    above = rank_filter(raw, lo + 1, size=win_len, origin=origin)[win_len - 1 :]
+    # numpy's lerp, so results match np.quantile bit for bit
+    diff = above - below
+    if t < 0.5:
+        return below + diff * t
+    return above - diff * (1 - t)
+
+
 def _rolling_baseline(raw: np.ndarray, fs: int) -> np.ndarray:
     """Return a baseline vector based on a rolling 80th percentile."""
     win_len = int(fs)
@@ -67,16 +144,26 @@ def _rolling_baseline(raw: np.ndarray, fs: int) -> np.ndarray:
         base = np.quantile(raw, 0.80)
         return np.full_like(raw, base)
 
-    windows = sliding_window_view(raw, win_len)
-    base = np.quantile(windows, 0.80, axis=-1)
-    base = uniform_filter1d(base, size=fs, mode="nearest")
+    return _baseline_from_quantiles(_rolling_quantile(raw, win_len, 0.80), raw, fs)
+
 
-    base = np.pad(base, (win_len - 1, 0), mode="edge")[: raw.size]
+def _baseline_from_quantiles(
+    quantiles: np.ndarray, raw: np.ndarray, fs: int
+) -> np.ndarray:
+    """Finish :func:`_rolling_baseline` from the rolling percentiles of ``raw``."""
+    base = uniform_filter1d(quantiles, size=fs, mode="nearest")
+
+    base = np.pad(base, (int(fs) - 1, 0), mode="edge")[: raw.size]
     return base.astype(raw.dtype, copy=False)
 
 
 def _choose_thresholds(
-    raw: np.ndarray, baseline: np.ndarray, fs: int, *, tag: str = ""
+    raw: np.ndarray,
+    baseline: np.ndarray,
+    fs: int,
+    *,
+    tag: str = "",
+    trough_idx: np.ndarray | None = None,
 ) -> tuple[float, float]:
     """Return absolute thresholds based on trough depth.
 
@@ -88,10 +175,13 @@ def _choose_thresholds(
         Rolling baseline vector aligned with ``raw``.
     fs:
         Sample rate in Hz.
+    trough_idx:
+        Troughs of ``raw - baseline`` if already known.
     """
     baseline_med = float(np.median(baseline))
-    residual = raw - baseline
-    trough_idx, _ = find_peaks(-residual, distance=int(0.020 * fs))
+    if trough_idx is None:
+        residual = raw - baseline
+        trough_idx, _ = find_peaks(-residual, distance=int(0.020 * fs))
     troughs = raw[trough_idx] if trough_idx.size else np.array([raw.min()])
     depth = baseline_med - float(np.median(troughs))
 
@@ -116,65 +206,402 @@ def _has_duplicates(events: list[int], db_ms: int, fs: int) -> bool:
     return any((b - a) < min_gap for a, b in zip(events, events[1:]))
 
 
-def _count_events(
-    samples: np.ndarray,
-    fs: int,
-    upper: float,
-    lower: float,
-    debounce_ms: int,
-    block: int = 64,
-) -> list[int]:
-    """Return *indices* of detected presses – memoised for speed."""
-    return _memoised_count(
-        samples.tobytes(),  # hashable key
-        samples.dtype.str,  # original dtype!
-        samples.size,
-        fs,
-        upper,
-        lower,
-        debounce_ms,
-        block,
-    )
+class _ClipBlocks:
+    """A clip cut into detector blocks, for replaying the runtime detector offline.
+
+    :meth:`events` returns exactly the blocks of the presses that feeding the
+    clip's whole blocks through :meth:`~switch_interface.detection.EdgeDetector.process_all`
+    with a per-sample EMA bias, as :func:`~switch_interface.detection.listen`
+    does, reports, without a numpy call per block.  The bias is always a
+    weighted mean of zero and the blocks' EMA-weighted levels, so only
+    samples that cross the thresholds for some bias in that range are
+    candidates.  The state machine steps from one candidate block to the
+    next, advancing the bias over the blocks in between in one go.
+
+    The samples on either side of each candidate are gathered once per
+    threshold pair.  A block with a few candidates reads them as Python
+    floats; a busy one, as when the thresholds sit in the noise, is tested
+    in one array comparison against float64 scalars, as the detector's
+    float64 buffer is.  The blocks' bias contributions come from one matrix
+    product, so the bias can differ from the detector's in the last bits.
+    """
 
+    #: quiet stretches shorter than this are stepped in Python
+    SHORT = 32
+    #: blocks with more candidates than this are tested in one comparison
+    DENSE = 8
+
+    def __init__(self, samples: np.ndarray, block: int, decay: float) -> None:
+        x = np.asarray(samples)
+        self.block = block
+        # like ``listen``, the detector never sees a trailing partial block
+        self.n_blocks = len(x) // block
+        self.n = n = self.n_blocks * block
+        self.x = x = x[:n]
+        #: per-block bias decay and each block's share of the bias after it
+        self.decay = decay**block
+        self.gains = x.reshape(-1, block) @ _ema_weights(decay, block)
+        self._gains = self.gains.tolist()
+        self._bias_a = np.array([1.0, -self.decay])
+        peak = max(abs(float(x.min())), abs(float(x.max()))) if n else 0.0
+        self._slack = 4 * np.finfo(np.float64).eps * (1.0 + peak)
+        levels = self.gains / (1.0 - self.decay)
+        self._bias_range = (
+            min(0.0, float(levels.min())) if n else 0.0,
+            max(0.0, float(levels.max())) if n else 0.0,
+        )
+        self._candidates: dict[
+            tuple[float, float],
+            tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+        ] = {}
+
+    def candidates(
+        self, upper: float, lower: float
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Candidate crossings, the index of the first one in each block and
+        the samples before and at each candidate."""
+        key = (upper, lower)
+        found = self._candidates.get(key)
+        if found is None:
+            lo, hi = self._bias_range
+            above = np.float64(lo + upper - self._slack)
+            below = np.float64(hi + lower + self._slack)
+            x = self.x
+            k = np.flatnonzero((x[:-1] >= above) & (x[1:] <= below)) + 1
+            before = x[k - 1]
+            if self.n and 0.0 >= above and x.item(0) <= below:
+                k = np.concatenate(([0], k))
+                before = np.concatenate(([0], before)).astype(x.dtype)
+            first = np.searchsorted(k, np.arange(self.n_blocks + 1) * self.block)
+            found = (k, first, before, x[k])
+            self._candidates[key] = found
+        return found
+
+    def _advance(self, bias: float, b: int, e: int) -> float:
+        """Bias after armed blocks ``b`` to ``e - 1``."""
+        if e - b <= self.SHORT:
+            for gain in self._gains[b:e]:
+                bias = self.decay * bias + gain
+            return bias
+        zi = [self.decay * bias]
+        return float(lfilter([1.0], self._bias_a, self.gains[b:e], zi=zi)[0][-1])
+
+    def _rearm(self, start: int, limit: float) -> int:
+        """Index of the first sample from ``start`` that is >= limit, or -1."""
+        x = self.x
+        for i in range(start, min(start + 4, self.n)):
+            if x.item(i) >= limit:
+                return i
+        start += 4
+        size = 16
+        while start < self.n:
+            rearm = x[start : start + size] >= np.float64(limit)
+            if rearm.any():
+                return start + int(rearm.argmax())
+            start += size
+            size *= 2
+        return -1
+
+    def events(
+        self,
+        upper: float,
+        lower: float,
+        refractory: int,
+        stop_after: int | None = None,
+    ) -> list[int]:
+        """Start index of the block of every press ``process_all`` reports.
+
+        With ``stop_after`` the replay ends at press ``stop_after + 1``.
+        """
+        cand, first, before, after = self.candidates(upper, lower)
+        n_blocks, size, dense = self.n_blocks, self.block, self.DENSE
+        x, n, n_cand = self.x, self.n, len(cand)
+        gains, decay, short = self._gains, self.decay, self.SHORT
+        events: list[int] = []
+        b, bias, armed = 0, 0.0, True
+        resume = 0  # first sample a press may be at after the refractory period
+        up = low = 0.0
+        while b < n_blocks:
+            if armed:
+                lo = first.item(b)
+                if lo == n_cand:
+                    break  # no crossing left
+                c = cand.item(lo) // size
+                if c - b < short:
+                    for gain in gains[b : c + 1]:
+                        bias = decay * bias + gain
+                else:
+                    bias = self._advance(bias, b, c + 1)
+                b = c
+                up, low = bias + upper, bias + lower
+            else:
+                # disarmed with the bias frozen: the detector re-arms at the
+                # end of the block holding the first sample back above upper
+                # after the refractory period, and a crossing needs one too
+                i = max(resume, b * size) - 1
+                if i >= n:
+                    break
+                if x.item(i) < up:
+                    i = self._rearm(i + 1, up)
+                    if i < 0:
+                        break
+                b = max(b, i // size)
+                lo = first.item(b)
+            hi = first.item(b + 1)
+            while lo < hi and cand.item(lo) < resume:
+                lo += 1
+            pressed = False
+            while lo < hi:
+                hit = -1
+                if hi - lo > dense:
+                    # one comparison over the block's candidates
+                    found = (before[lo:hi] >= np.float64(up)) & (
+                        after[lo:hi] <= np.float64(low)
+                    )
+                    j = int(found.argmax())
+                    if found[j]:
+                        hit = lo + j
+                else:
+                    for i in range(lo, hi):
+                        if before.item(i) >= up and after.item(i) <= low:
+                            hit = i
+                            break
+                if hit < 0:
+                    break
+                press = cand.item(hit)
+                events.append(b * size)
+                if stop_after is not None and len(events) > stop_after:
+                    return events
+                pressed = True
+                resume = press + refractory + 1
+                lo = hit + 1
+                while lo < hi and cand.item(lo) < resume:
+                    lo += 1
+            if pressed:
+                # re-armed only by a sample above upper after the refractory
+                # period, within this block
+                end = (b + 1) * size
+                armed = resume <= end and bool(
+                    (x[resume - 1 : end] >= np.float64(up)).any()
+                )
+            else:
+                armed = True
+            b += 1
+        return events
+
+
+class CalibrationSession:
+    """Everything :func:`calibrate` derives from one clip, computed once.
+
+    The session holds the rolling baseline, the residual, the trough
+    positions and the per-block arrays the press counter needs.  Presses
+    are counted as :func:`~switch_interface.detection.listen` would detect
+    them when reading ``block`` samples at a time with a
+    ``bias_time_constant_ms`` bias.
+    :meth:`count` memoises by threshold and debounce, so the repeated
+    evaluations of a calibration share that work and never copy the clip.
+    :attr:`fingerprint` identifies the clip's contents.  Pass the clip's
+    :func:`_rolling_baseline` as ``baseline`` if it is already known, as an
+    :class:`~switch_interface.online_calibration.OnlineCalibrator` keeps it
+    while recording; it is the costliest part of the set-up.
+    """
 
-@lru_cache(maxsize=256)
-def _memoised_count(
-    buf: bytes,
-    dtype_str: str,
-    n: int,
-    fs: int,
-    upper: float,
-    lower: float,
-    debounce_ms: int,
-    block: int,
+    def __init__(
+        self,
+        samples: np.ndarray,
+        fs: int,
+        *,
+        block: int = 64,
+        bias_time_constant_ms: float = BIAS_TIME_CONSTANT_MS,
+        baseline: np.ndarray | None = None,
+    ) -> None:
+        self.samples = np.asarray(samples)
+        self.fs = fs
+        self.block = block
+        self.bias_decay = bias_decay(bias_time_constant_ms, fs)
+        self.fingerprint = _fingerprint(self.samples, fs, block)
+        if baseline is None:
+            baseline = _rolling_baseline(self.samples, fs)
+        self.baseline = baseline
+        self.residual = self.samples - self.baseline
+        self.trough_idx, _ = find_peaks(-self.residual, distance=int(0.020 * fs))
+        self._clip = _ClipBlocks(self.samples, block, self.bias_decay)
+        self._counts: dict[tuple[float, float, int], list[int]] = {}
+        # settings known to give more presses than the value
+        self._more_than: dict[tuple[float, float, int], int] = {}
+
+    def count(self, upper: float, lower: float, debounce_ms: int) -> list[int]:
+        """Return *indices* of the blocks a press is detected in."""
+        key = (upper, lower, debounce_ms)
+        events = self._counts.get(key)
+        if events is None:
+            refractory = math.ceil(debounce_ms / 1000 * self.fs)
+            events = self._clip.events(upper, lower, refractory)
+            self._counts[key] = events
+        return events
+
+    def _count_up_to(
+        self, upper: float, lower: float, debounce_ms: int, cap: int
+    ) -> int:
+        """Like ``len(count(...))``, but ``cap + 1`` once it passes ``cap``."""
+        key = (upper, lower, debounce_ms)
+        events = self._counts.get(key)
+        if events is not None:
+            return len(events)
+        if self._more_than.get(key, -1) >= cap:
+            return cap + 1
+        refractory = math.ceil(debounce_ms / 1000 * self.fs)
+        events = self._clip.events(upper, lower, refractory, stop_after=cap)
+        if len(events) > cap:
+            self._more_than[key] = cap
+            return cap + 1
+        self._counts[key] = events
+        return len(events)
+
+    def sweep(
+        self,
+        upper: float,
+        lower: float,
+        target: int,
+        *,
+        debounces: Sequence[int] = range(10, 61, 2),
+        scales: Sequence[float] | None = None,
+        workers: int = 1,
+        full: bool = False,
+    ) -> SweepResult:
+        """Count presses for every scale of ``upper``/``lower`` × debounce.
+
+        ``scales`` defaults to ``1.15 ** k`` for ``k`` in -4..4.  Only the
+        cells closest to ``target`` matter, so a count stops once it is
+        further from the target than the best cell so far; the setting with
+        the fewest presses is counted first to set that bound.  Cells cut
+        short hold that bound plus one and are False in
+        :attr:`SweepResult.exact`; ``full=True`` counts every cell exactly.
+        Counts at one scale share their crossing candidates and whole counts
+        are memoised with :meth:`count`.  With ``workers`` > 1 the scales
+        are counted in that many worker processes.
+        """
+        scale_arr = (
+            1.15 ** np.arange(-4, 5) if scales is None else np.asarray(scales, float)
+        )
+        db_arr = np.asarray(debounces, dtype=int)
+        rows = [(upper * sc, lower * sc) for sc in scale_arr.tolist()]
+        if full:
+            cap = sys.maxsize
+        else:
+            fewest = self.count(
+                *rows[int(np.argmax(np.abs(scale_arr)))], int(db_arr.max())
+            )
+            cap = target + abs(len(fewest) - target)
+        if workers > 1:
+            self._count_in_workers(rows, db_arr, cap, workers)
+        counts = np.zeros((len(rows), len(db_arr)), dtype=int)
+        exact = np.zeros(counts.shape, dtype=bool)
+        for i, (up, low) in enumerate(rows):
+            for j, d in enumerate(db_arr.tolist()):
+                n = self._count_up_to(up, low, d, cap)
+                counts[i, j] = n
+                exact[i, j] = n <= cap
+                if n <= cap and not full:
+                    cap = min(cap, target + abs(n - target))
+        return SweepResult(scale_arr, db_arr, counts, target, exact)
+
+    def _count_in_workers(
+        self,
+        rows: list[tuple[float, float]],
+        debounces: np.ndarray,
+        cap: int,
+        workers: int,
+    ) -> None:
+        """Fill the memos for a grid using a process pool."""
+        debounce_list = debounces.tolist()
+        rows = [
+            (up, low)
+            for up, low in rows
+            if any(
+                (up, low, d) not in self._counts
+                and self._more_than.get((up, low, d), -1) < cap
+                for d in debounce_list
+            )
+        ]
+        if not rows:
+            return
+        refractories = [math.ceil(d / 1000 * self.fs) for d in debounce_list]
+        # spawn: forking a process that runs Tk and audio threads is unsafe
+        ctx = multiprocessing.get_context("spawn")
+        try:
+            with ProcessPoolExecutor(
+                min(workers, len(rows)),
+                mp_context=ctx,
+                initializer=_init_sweep_worker,
+                initargs=(self.samples, self.block, self.bias_decay),
+            ) as pool:
+                results = list(
+                    pool.map(
+                        _sweep_row,
+                        rows,
+                        [refractories] * len(rows),
+                        [cap] * len(rows),
+                    )
+                )
+        except Exception:
+            logger.warning("Sweep workers failed; counting in-process", exc_info=True)
+            return
+        for (up, low), row in zip(rows, results):
+            for d, events in zip(debounce_list, row):
+                if len(events) > cap:
+                    self._more_than[(up, low, d)] = cap
+                else:
+                    self._counts[(up, low, d)] = events
 
-) -> list[int]:
-    """Return a list so :func:`_count_events` can use the result directly."""
-    samples = np.frombuffer(buf, dtype=np.dtype(dtype_str), count=n)
 
-    refractory = math.ceil(debounce_ms / 1000 * fs)
-    state = EdgeState(armed=True, cooldown=0)
-    events: list[int] = []
+# the clip a sweep worker process counts presses in
+_worker_clip: _ClipBlocks | None = None
 
-    for start in range(0, len(samples), block):
-        blk = samples[start : start + block]
-        state, pressed = detect_edges(blk, state, upper, lower, refractory)
-        if pressed:
-            events.append(start)
 
-    return events
+def _init_sweep_worker(samples: np.ndarray, block: int, decay: float) -> None:
+    global _worker_clip
+    _worker_clip = _ClipBlocks(samples, block, decay)
+
+
+def _sweep_row(
+    thresholds: tuple[float, float], refractories: list[int], cap: int
+) -> list:
+    assert _worker_clip is not None
+    upper, lower = thresholds
+    return [_worker_clip.events(upper, lower, r, stop_after=cap) for r in refractories]
+
+
+def _fingerprint(samples: np.ndarray, fs: int, block: int) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{samples.dtype.str}{samples.shape}{fs}/{block}".encode())
+    digest.update(np.ascontiguousarray(samples).data)
+    return digest.hexdigest()
 
 
-# ------------------------------------------------------------------ #
-# public API
-# ------------------------------------------------------------------ #
 def calibrate(
     samples: np.ndarray,
     fs: int,
     *,
     target_presses: int | None = None,
     verbose: bool | None = None,
+    workers: int = 1,
+    session: CalibrationSession | None = None,
+    blocksize: int = 64,
+    bias_time_constant_ms: float = BIAS_TIME_CONSTANT_MS,
 ) -> CalibResult:
+    """Choose detector offsets and debounce for ``samples``.
+
+    Presses are counted as :func:`~switch_interface.detection.listen` would
+    detect them with ``blocksize`` and ``bias_time_constant_ms``.  With
+    ``target_presses`` every debounce × threshold scale is counted (in
+    ``workers`` processes if more than one) and the setting deepest inside
+    the region closest to the target wins.
+
+    Pass the :class:`CalibrationSession` of an earlier call on the same clip
+    as ``session`` to skip its set-up; the caller decides how long it lives,
+    and its block size and bias time constant are used.
+    """
 
     if verbose is None:
         verbose = os.getenv("SWITCH_CALIB_VERBOSE", "0") == "1"
@@ -183,66 +610,75 @@ def calibrate(
 
     tag = "[CALIB]"
 
-    baseline_vec = _rolling_baseline(samples, fs)
+    samples = np.asarray(samples)
+    if session is None:
+        session = CalibrationSession(
+            samples,
+            fs,
+            block=blocksize,
+            bias_time_constant_ms=bias_time_constant_ms,
+        )
+    elif session.fingerprint != _fingerprint(samples, fs, session.block):
+        raise ValueError("session was built from a different clip")
+    baseline_vec = session.baseline
+    count = session.count
 
     # ---- Phase 0: first-guess thresholds --------------------------- #
-    upper, lower = _choose_thresholds(samples, baseline_vec, fs, tag=tag)
+    upper, lower = _choose_thresholds(
+        samples, baseline_vec, fs, tag=tag, trough_idx=session.trough_idx
+    )
     baseline_med = float(np.median(baseline_vec))
     u_off = upper - baseline_med
     l_off = lower - baseline_med
 
-    # ---- Phase 1: choose debounce --------------------------------- #
+    # ---- Phase 1: choose debounce (and hysteresis) ------------------ #
     db_list = range(10, 61, 2)
     best_db = 10
-    best_events = _count_events(samples, fs, u_off, l_off, best_db)
-    score = lambda ev: abs(len(ev) - (target_presses or len(ev)))
 
     if target_presses is not None:
-        best_err = score(best_events)
-        for d in db_list[1:]:
-            ev = _count_events(samples, fs, u_off, l_off, d)
-            err = score(ev)
-            if err == 0:
-                best_db, best_events = d, ev
-                logger.debug(
-                    "%s  debounce=%d → EXACT match %d presses", tag, d, target_presses
-                )
-                break
-            if err < best_err:
-                best_db, best_events, best_err = d, ev, err
-        if best_err:
+        # every debounce × threshold scale, then the most robust match
+        surface = session.sweep(
+            u_off, l_off, target_presses, debounces=db_list, workers=workers
+        )
+        scale, best_db = surface.best()
+        u_off, l_off = u_off * scale, l_off * scale
+        best_events = count(u_off, l_off, best_db)
+        logger.debug(
+            "%s  sweep counts (rows ×%s, columns %s ms):\n%s",
+            tag,
+            np.round(surface.scales, 3).tolist(),
+            surface.debounces.tolist(),
+            surface.counts,
+        )
+        if len(best_events) != target_presses:
             logger.warning(
-                "%s  no exact debounce; using %d ms (count=%d)",
+                "%s  no exact setting; using ×%.2f and %d ms (count=%d)",
                 tag,
+                scale,
                 best_db,
                 len(best_events),
             )
+        else:
+            logger.debug(
+                "%s  ×%.2f, debounce=%d → EXACT match %d presses",
+                tag,
+                scale,
+                best_db,
+                target_presses,
+            )
     else:
-        ref = _count_events(samples, fs, u_off, l_off, 10)
-        ref_n = max(1, len(ref))
+        best_events = count(u_off, l_off, best_db)
+        ref_n = max(1, len(best_events))
         for d in db_list[1:]:
-            ev = _count_events(samples, fs, u_off, l_off, d)
+            ev = count(u_off, l_off, d)
             if len(ev) / ref_n >= 0.98:
                 best_db, best_events = d, ev
                 break
 
-    # ---- Phase 2: one hysteresis tweak if still off --------------- #
-    if target_presses is not None and len(best_events) != target_presses:
-        direction = 1 if len(best_events) < target_presses else -1
-        scale = 1.0
-        for _ in range(4):
-            scale *= 1.15**direction
-            ev = _count_events(samples, fs, u_off * scale, l_off * scale, best_db)
-            if len(ev) == target_presses:
-                u_off, l_off, best_events = u_off * scale, l_off * scale, ev
-                break
-            if score(ev) < score(best_events):
-                u_off, l_off, best_events = u_off * scale, l_off * scale, ev
-
     # ---- Phase 3: ensure no double-fires -------------------------- #
     while _has_duplicates(list(best_events), best_db, fs) and best_db < 60:
         best_db += 2
-        best_events = _count_events(samples, fs, u_off, l_off, best_db)
+        best_events = count(u_off, l_off, best_db)
 
     # ---- Diagnostics ------------------------------------------------- #
     idle_mask = np.ones(len(samples), dtype=bool)
@@ -251,7 +687,7 @@ def calibrate(
         start = max(0, idx - pad)
         end = min(len(samples), idx + pad)
         idle_mask[start:end] = False
-    residual = samples - baseline_vec
+    residual = session.residual
     if idle_mask.any():
         baseline_std = float(residual[idle_mask].std())
     else:
@@ -262,7 +698,7 @@ def calibrate(
         diffs = np.diff(best_events)
         min_gap = float(diffs.min() / fs)
 
-    trough_idx, _ = find_peaks(-(samples - baseline_vec), distance=int(0.020 * fs))
+    trough_idx = session.trough_idx
     troughs = samples[trough_idx] if trough_idx.size else np.array([samples.min()])
     baseline_vals = (
         baseline_vec[trough_idx]
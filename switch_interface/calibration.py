@@ -9,7 +9,7 @@ import sounddevice as sd
 import math
 
 from .audio.backends.wasapi import get_extra_settings
-from .detection import detect_edges, EdgeState
+from .detection import BIAS_TIME_CONSTANT_MS, EdgeDetector, bias_decay
 
 @dataclass
 class DetectorConfig:
@@ -19,6 +19,9 @@ class DetectorConfig:
     blocksize: int = 256
     debounce_ms: int = 40
     device: str | None = None
+    bias_time_constant_ms: float = BIAS_TIME_CONSTANT_MS
+    #: detect at roughly this rate (Hz) instead of ``samplerate``; ``None`` is off
+    decimate_to: int | None = None
 
 
 CONFIG_DIR = os.path.join(os.path.expanduser("~"), ".switch_interface")
@@ -117,9 +120,14 @@ def calibrate(config: DetectorConfig | None = None) -> DetectorConfig:
     result: DetectorConfig | None = None
     buf = np.zeros(int(sr_var.get()) * 2, dtype=np.float32)
     buf_index = 0
-    bias = 0.0
     stream: sd.InputStream | None = None
-    edge_state = EdgeState(armed=True, cooldown=0)
+    # same bias tracking as at runtime, so the preview matches what is detected
+    detector = EdgeDetector(
+        config.upper_offset,
+        config.lower_offset,
+        0,
+        bias_decay=bias_decay(config.bias_time_constant_ms, config.samplerate),
+    )
     press_pending = False
     normal_bg = root.cget("bg")
 
@@ -133,7 +141,7 @@ def calibrate(config: DetectorConfig | None = None) -> DetectorConfig:
             stream = None
 
     def _callback(indata: np.ndarray, frames: int, time: int, status: int) -> None:
-        nonlocal buf_index, edge_state, press_pending
+        nonlocal buf_index, press_pending
         mono = indata.mean(axis=1) if indata.shape[1] > 1 else indata[:, 0]
         n = len(mono)
         if n > len(buf):
@@ -147,19 +155,19 @@ def calibrate(config: DetectorConfig | None = None) -> DetectorConfig:
             buf[buf_index:] = mono[:first]
             buf[: n - first] = mono[first:]
         buf_index = (buf_index + n) % len(buf)
-        refract = int(math.ceil((db_var.get() / 1000) * int(sr_var.get())))
-        edge_state, pressed = detect_edges(
-            mono,
-            edge_state,
-            u_var.get(),
-            l_var.get(),
-            refract,
+        detector.refractory_samples = int(
+            math.ceil((db_var.get() / 1000) * int(sr_var.get()))
         )
-        if pressed:
+        detector.upper_offset = u_var.get()
+        detector.lower_offset = l_var.get()
+        if detector.process(mono) >= 0:
             press_pending = True
 
     def _start_stream() -> None:
         nonlocal stream
+        detector.bias_decay = bias_decay(
+            config.bias_time_constant_ms, int(sr_var.get())
+        )
         extra = get_extra_settings()
         kwargs = dict(
             samplerate=int(sr_var.get()),
@@ -196,8 +204,7 @@ def calibrate(config: DetectorConfig | None = None) -> DetectorConfig:
         wave_canvas.delete("all")
         _draw_ruler()
         data = np.concatenate([buf[buf_index:], buf[:buf_index]])
-        nonlocal bias
-        bias = 0.995 * bias + 0.005 * float(data.mean())
+        bias = detector.bias
         step = max(1, len(data) // WIDTH)
         if step > 1:
             trimmed = data[: step * WIDTH]
@@ -233,6 +240,8 @@ def calibrate(config: DetectorConfig | None = None) -> DetectorConfig:
             blocksize=int(bs_var.get()),
             debounce_ms=db_var.get(),
             device=dev_var.get() or None,
+            bias_time_constant_ms=config.bias_time_constant_ms,
+            decimate_to=config.decimate_to,
         )
         _stop_stream()
         root.destroy()
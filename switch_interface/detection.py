@@ -1,14 +1,51 @@
 from __future__ import annotations
 
+import logging
 import math
 import time
 from dataclasses import dataclass
-from typing import Callable, Optional, Tuple
+from typing import Callable, Optional, Sequence, Tuple
 
 from .audio.backends.wasapi import get_extra_settings
+from .audio.decimate import Decimator, decimation_factor
+from .audio.ring import SampleRing
+from .audio.wakeup import Wakeup
+from .audio.supervisor import AudioSupervisor
 
 import numpy as np
 
+log = logging.getLogger(__name__)
+
+#: Bias time constant matching the old fixed ``0.995``-per-block update at
+#: the default 256-sample blocks and 44.1 kHz.
+BIAS_TIME_CONSTANT_MS = 1160.0
+
+
+def bias_decay(time_constant_ms: float, samplerate: float) -> float:
+    """Return the per-sample EMA coefficient for ``time_constant_ms``."""
+    if time_constant_ms <= 0:
+        raise ValueError("time_constant_ms must be > 0")
+    return math.exp(-1000.0 / (time_constant_ms * samplerate))
+
+
+def _ema_weights(decay: float, n: int) -> np.ndarray:
+    """Weights giving a length-``n`` block's contribution to a per-sample EMA."""
+    return (1.0 - decay) * decay ** np.arange(n - 1, -1, -1, dtype=np.float64)
+
+
+def _update_bias(bias: float, block: np.ndarray, decay: float | None) -> float:
+    """Advance ``bias`` over ``block``.
+
+    With ``decay`` the result is the per-sample EMA
+    ``bias = decay * bias + (1 - decay) * x`` evaluated in closed form, so it
+    does not depend on how the signal is split into blocks.  Without it the
+    legacy per-block update ``0.995 * bias + 0.005 * mean`` is applied.
+    """
+    if decay is None:
+        return 0.995 * bias + 0.005 * float(block.mean())
+    n = len(block)
+    return decay**n * bias + float(np.dot(_ema_weights(decay, n), block))
+
 
 @dataclass
 class EdgeState:
@@ -24,9 +61,13 @@ def detect_edges(
     upper_offset: float,
     lower_offset: float,
     refractory_samples: int,
+    bias_decay: float | None = None,
 ) -> Tuple[EdgeState, bool]:
     """Detect a falling edge in ``block``.
 
+    ``bias_decay`` is the per-sample coefficient from :func:`bias_decay`;
+    the default keeps the block-size dependent legacy bias update.
+
     Returns the updated ``EdgeState`` and whether a press was detected.
     """
 
@@ -35,7 +76,7 @@ def detect_edges(
 
     if state.armed:
         # exponential moving average over the current block
-        state.bias = 0.995 * state.bias + 0.005 * float(block.mean())
+        state.bias = _update_bias(state.bias, block, bias_decay)
 
     dyn_upper = state.bias + upper_offset
     dyn_lower = state.bias + lower_offset
@@ -84,6 +125,499 @@ def detect_edges(
     )
 
 
+def detect_presses(
+    block: np.ndarray,
+    state: EdgeState,
+    upper_offset: float,
+    lower_offset: float,
+    refractory_samples: int,
+    bias_decay: float | None = None,
+) -> Tuple[EdgeState, np.ndarray]:
+    """Detect every falling edge in ``block``.
+
+    Like :func:`detect_edges`, but presses after the first one in a block are
+    reported too: any crossing at least ``refractory_samples`` samples after
+    the previous press counts, so a fast double tap inside one large block is
+    not merged.  Returns the updated ``EdgeState`` and the sample index of
+    each press within ``block``.
+    """
+
+    if block.ndim != 1:
+        raise ValueError(f"block must be a 1-D array (got shape {block.shape})")
+
+    n = len(block)
+    if state.armed:
+        state.bias = _update_bias(state.bias, block, bias_decay)
+
+    dyn_upper = state.bias + upper_offset
+    dyn_lower = state.bias + lower_offset
+
+    samples = np.concatenate(([state.prev_sample], block))
+    above = samples >= dyn_upper
+    candidates = np.flatnonzero(above[:-1] & (samples[1:] <= dyn_lower))
+
+    # greedy refractory selection: jump to the first crossing past each
+    # press's refractory period
+    start = 0 if state.armed else state.cooldown
+    presses: list[int] = []
+    i = int(np.searchsorted(candidates, start))
+    while i < len(candidates):
+        press = int(candidates[i])
+        presses.append(press)
+        start = press + refractory_samples + 1
+        i = int(np.searchsorted(candidates, start, side="left"))
+
+    if presses or not state.armed:
+        cooldown = max(start - n, 0)
+        # re-arm once the signal is back above dyn_upper after the cooldown
+        armed = cooldown == 0 and bool(above[min(start, n) :].any())
+    else:
+        cooldown = 0
+        armed = True
+
+    return (
+        EdgeState(
+            armed=armed,
+            cooldown=cooldown,
+            prev_sample=float(block[-1]) if n else state.prev_sample,
+            bias=state.bias,
+        ),
+        np.asarray(presses, dtype=np.intp),
+    )
+
+
+class EdgeDetector:
+    """Streaming edge detector that allocates no arrays per block.
+
+    Holds the fields of :class:`EdgeState` directly and reuses scratch
+    buffers sized for the current block length (they are only rebuilt when
+    the length changes).  :meth:`process` gives the same result as
+    :func:`detect_edges` and :meth:`process_all` the same as
+    :func:`detect_presses`.
+    """
+
+    __slots__ = (
+        "upper_offset",
+        "lower_offset",
+        "refractory_samples",
+        "armed",
+        "cooldown",
+        "prev_sample",
+        "bias",
+        "bias_decay",
+        "presses",
+        "_n",
+        "_samples",
+        "_prev",
+        "_cur",
+        "_above",
+        "_cross",
+        "_below",
+        "_weights",
+    )
+
+    def __init__(
+        self,
+        upper_offset: float,
+        lower_offset: float,
+        refractory_samples: int,
+        state: EdgeState | None = None,
+        bias_decay: float | None = None,
+    ) -> None:
+        state = state or EdgeState(armed=True, cooldown=0)
+        self.upper_offset = upper_offset
+        self.lower_offset = lower_offset
+        self.refractory_samples = refractory_samples
+        self.armed = state.armed
+        self.cooldown = state.cooldown
+        self.prev_sample = state.prev_sample
+        self.bias = state.bias
+        self.bias_decay = bias_decay
+        self._weights = np.zeros(0)
+        self._resize(0)
+
+    @property
+    def state(self) -> EdgeState:
+        """Snapshot of the detector state as an :class:`EdgeState`."""
+        return EdgeState(self.armed, self.cooldown, self.prev_sample, self.bias)
+
+    def _resize(self, n: int) -> None:
+        self._n = n
+        self._samples = np.zeros(n + 1, dtype=np.float64)
+        self._prev = self._samples[:-1]
+        self._cur = self._samples[1:]
+        self._above = np.zeros(n + 1, dtype=bool)
+        self._cross = np.zeros(n, dtype=bool)
+        self._below = np.zeros(n, dtype=bool)
+        #: press indices found by the last :meth:`process_all`
+        self.presses = np.zeros(n, dtype=np.intp)
+
+    def _thresholds(self, block: np.ndarray) -> tuple[float, float]:
+        """Update the bias and return the dynamic ``(upper, lower)`` thresholds."""
+        if block.ndim != 1:
+            raise ValueError(f"block must be a 1-D array (got shape {block.shape})")
+        if self.armed:
+            if self.bias_decay is None:
+                self.bias = 0.995 * self.bias + 0.005 * float(block.mean())
+            else:
+                n = len(block)
+                weights = self._weights
+                if len(weights) != n or weights[-1] != 1.0 - self.bias_decay:
+                    self._weights = _ema_weights(self.bias_decay, n)
+                self.bias = self.bias_decay**n * self.bias + float(
+                    np.dot(self._weights, block)
+                )
+        return self.bias + self.upper_offset, self.bias + self.lower_offset
+
+    def _fill(self, block: np.ndarray, upper: float, lower: float) -> None:
+        """Fill the threshold and crossing masks for ``block``."""
+        if len(block) != self._n:
+            self._resize(len(block))
+        self._samples[0] = self.prev_sample
+        np.copyto(self._cur, block)
+        np.greater_equal(self._samples, upper, out=self._above)
+        np.less_equal(self._cur, lower, out=self._below)
+        np.logical_and(self._above[:-1], self._below, out=self._cross)
+
+    def _first(self, start: int) -> int:
+        """Return the first crossing at or after ``start`` or ``-1``."""
+        if start >= self._n:
+            return -1
+        if start:
+            self._cross[:start] = False
+        j = int(self._cross.argmax())
+        return j if self._cross[j] else -1
+
+    def process(self, block: np.ndarray) -> int:
+        """Feed ``block``; return the index of its press or ``-1``.
+
+        Same decision as :func:`detect_edges`: at most one press per block.
+        """
+        n = len(block)
+        if n == 0:
+            return -1
+        upper, lower = self._thresholds(block)
+        press = -1
+        start = 0
+        if not self.armed:
+            if self.cooldown >= n:
+                self.cooldown -= n
+                start = n
+            else:
+                start = self.cooldown
+                resume = self.prev_sample if start == 0 else block[start - 1]
+                if float(resume) >= upper:
+                    self.armed = True
+                else:
+                    start = n
+        # no sample at or below ``lower`` means no crossing: skip the masks
+        if start < n and float(block.min()) <= lower:
+            self._fill(block, upper, lower)
+            press = self._first(start)
+
+        if press >= 0:
+            self.armed = False
+            self.cooldown = self.refractory_samples - (n - press - 1)
+            if self.cooldown <= 0:
+                self.cooldown = 0
+                if block[-1] >= upper:
+                    self.armed = True
+        self.prev_sample = block[-1]
+        return press
+
+    def process_all(self, block: np.ndarray) -> int:
+        """Feed ``block``; return how many presses it holds.
+
+        Their indices are ``presses[:count]``, as :func:`detect_presses`
+        would report them.
+        """
+        n = len(block)
+        if n == 0:
+            return 0
+        upper, lower = self._thresholds(block)
+        if self.armed and float(block.min()) > lower:
+            self.prev_sample = float(block[-1])
+            return 0
+
+        self._fill(block, upper, lower)
+        start = 0 if self.armed else self.cooldown
+        count = 0
+        press = self._first(start)
+        while press >= 0:
+            self.presses[count] = press
+            count += 1
+            start = press + self.refractory_samples + 1
+            press = self._first(start)
+
+        if count or not self.armed:
+            self.cooldown = max(start - n, 0)
+            self.armed = self.cooldown == 0 and bool(self._above[min(start, n) :].any())
+        else:
+            self.cooldown = 0
+            self.armed = True
+        self.prev_sample = float(block[-1])
+        return count
+
+
+def _block_time(time_info: object, frames: int, samplerate: int) -> float:
+    """Return the :func:`time.perf_counter` time of a block's first sample.
+
+    PortAudio reports when that sample hit the ADC on the stream clock;
+    without that, the last sample is assumed to be current.
+    """
+    now = time.perf_counter()
+    adc = getattr(time_info, "inputBufferAdcTime", 0.0) or 0.0
+    current = getattr(time_info, "currentTime", 0.0) or 0.0
+    if adc and current:
+        return now - (current - adc)
+    return now - frames / samplerate
+
+
+class MultiEdgeDetector:
+    """:class:`EdgeDetector` for several switches, one per input channel.
+
+    Every channel has its own thresholds, debounce and state; a
+    ``(frames, channels)`` block is thresholded for all channels at once and
+    only channels with a crossing (or a pending cooldown) are visited one by
+    one.  Channel ``c`` reports exactly the presses ``EdgeDetector`` would on
+    that channel alone.
+    """
+
+    __slots__ = (
+        "channels",
+        "upper_offset",
+        "lower_offset",
+        "refractory_samples",
+        "bias_decay",
+        "armed",
+        "cooldown",
+        "prev_sample",
+        "bias",
+        "presses",
+        "switches",
+        "_n",
+        "_samples",
+        "_above",
+        "_cross",
+        "_upper",
+        "_lower",
+        "_weights",
+        "_all_armed",
+    )
+
+    def __init__(
+        self,
+        upper_offset: float | Sequence[float],
+        lower_offset: float | Sequence[float],
+        refractory_samples: int | Sequence[int],
+        channels: int,
+        bias_decay: float | None = None,
+    ) -> None:
+        if channels <= 0:
+            raise ValueError("channels must be > 0")
+        self.channels = channels
+        self.upper_offset = np.broadcast_to(
+            np.asarray(upper_offset, dtype=np.float64), (channels,)
+        ).copy()
+        self.lower_offset = np.broadcast_to(
+            np.asarray(lower_offset, dtype=np.float64), (channels,)
+        ).copy()
+        self.refractory_samples = np.broadcast_to(
+            np.asarray(refractory_samples, dtype=np.int64), (channels,)
+        ).copy()
+        if np.any(self.upper_offset <= self.lower_offset):
+            raise ValueError("upper_offset must be > lower_offset on every channel")
+        self.bias_decay = bias_decay
+        self.armed = np.ones(channels, dtype=bool)
+        self._all_armed = True
+        self.cooldown = np.zeros(channels, dtype=np.int64)
+        self.prev_sample = np.zeros(channels, dtype=np.float64)
+        self.bias = np.zeros(channels, dtype=np.float64)
+        self._upper = np.zeros(channels, dtype=np.float64)
+        self._lower = np.zeros(channels, dtype=np.float64)
+        self._weights = np.zeros(0)
+        self._resize(0)
+
+    def state(self, channel: int) -> EdgeState:
+        """Snapshot of one channel's state as an :class:`EdgeState`."""
+        return EdgeState(
+            bool(self.armed[channel]),
+            int(self.cooldown[channel]),
+            float(self.prev_sample[channel]),
+            float(self.bias[channel]),
+        )
+
+    def _resize(self, n: int) -> None:
+        self._n = n
+        # channel-major so each channel's samples are contiguous
+        self._samples = np.zeros((self.channels, n + 1), dtype=np.float64)
+        self._above = np.zeros((self.channels, n + 1), dtype=bool)
+        self._cross = np.zeros((self.channels, n), dtype=bool)
+        #: press sample indices and switch ids of the last :meth:`process_all`
+        self.presses = np.zeros(n * self.channels, dtype=np.intp)
+        self.switches = np.zeros(n * self.channels, dtype=np.intp)
+
+    def _first(self, channel: int, start: int) -> int:
+        if start >= self._n:
+            return -1
+        row = self._cross[channel]
+        if start:
+            row[:start] = False
+        j = int(row.argmax())
+        return j if row[j] else -1
+
+    def process_all(self, block: np.ndarray) -> int:
+        """Feed a ``(frames, channels)`` block; return how many presses it holds.
+
+        Presses are ``presses[:count]`` (sample index) and
+        ``switches[:count]`` (channel), in time order.
+        """
+        if block.ndim != 2 or block.shape[1] != self.channels:
+            raise ValueError(
+                f"block must have shape (frames, {self.channels}) (got {block.shape})"
+            )
+        n = block.shape[0]
+        if n == 0:
+            return 0
+        if n != self._n:
+            self._resize(n)
+
+        if self.bias_decay is None:
+            update = 0.995 * self.bias + 0.005 * block.mean(axis=0)
+        else:
+            if len(self._weights) != n or self._weights[-1] != 1.0 - self.bias_decay:
+                self._weights = _ema_weights(self.bias_decay, n)
+            update = self.bias_decay**n * self.bias + self._weights @ block
+        if self._all_armed:
+            self.bias = update
+        else:
+            np.copyto(self.bias, update, where=self.armed)
+        np.add(self.bias, self.lower_offset, out=self._lower)
+
+        # every call costs about a microsecond at these sizes, so test each
+        # channel's lowest sample against its lower threshold at once: with
+        # every channel armed and none of them that low there is no crossing
+        if self._all_armed and bool((block.min(axis=0) > self._lower).all()):
+            self.prev_sample[:] = block[-1]
+            return 0
+        np.add(self.bias, self.upper_offset, out=self._upper)
+
+        samples = self._samples
+        samples[:, 0] = self.prev_sample
+        np.copyto(samples[:, 1:], block.T)
+        np.greater_equal(samples, self._upper[:, None], out=self._above)
+        np.less_equal(samples[:, 1:], self._lower[:, None], out=self._cross)
+        np.logical_and(self._cross, self._above[:, :-1], out=self._cross)
+
+        count = 0
+        for ch in range(self.channels):
+            armed = bool(self.armed[ch])
+            if armed and not self._cross[ch].any():
+                continue
+            start = 0 if armed else int(self.cooldown[ch])
+            found = 0
+            press = self._first(ch, start)
+            while press >= 0:
+                self.presses[count] = press
+                self.switches[count] = ch
+                count += 1
+                found += 1
+                start = press + int(self.refractory_samples[ch]) + 1
+                press = self._first(ch, start)
+            if found or not armed:
+                cooldown = max(start - n, 0)
+                self.cooldown[ch] = cooldown
+                self.armed[ch] = cooldown == 0 and bool(
+                    self._above[ch, min(start, n) :].any()
+                )
+        self.prev_sample[:] = block[-1]
+        self._all_armed = bool(self.armed.all())
+
+        if count > 1:
+            order = np.argsort(self.presses[:count], kind="stable")
+            self.presses[:count] = self.presses[:count][order]
+            self.switches[:count] = self.switches[:count][order]
+        return count
+
+
+def make_detector(
+    *,
+    upper_offset: float,
+    lower_offset: float,
+    samplerate: float,
+    debounce_ms: int,
+    bias_time_constant_ms: float = BIAS_TIME_CONSTANT_MS,
+) -> EdgeDetector:
+    """Return the :class:`EdgeDetector` :func:`listen` uses for these settings.
+
+    ``samplerate`` is the rate the detector sees, after any decimation.
+    """
+    if upper_offset <= lower_offset:
+        raise ValueError("upper_offset must be > lower_offset (both negative values)")
+    return EdgeDetector(
+        upper_offset,
+        lower_offset,
+        int(math.ceil((debounce_ms / 1_000) * samplerate)),
+        bias_decay=bias_decay(bias_time_constant_ms, samplerate),
+    )
+
+
+def drain_presses(
+    ring: SampleRing,
+    detector: EdgeDetector,
+    block: np.ndarray,
+    samplerate: int,
+    on_press: Callable[[float], None],
+    decimator: Decimator | None = None,
+) -> None:
+    """Run every whole ``len(block)`` block waiting in ``ring`` through ``detector``.
+
+    ``on_press`` gets the ring timestamp of each press sample.  With a
+    ``decimator`` the detector sees its output and timestamps are mapped
+    back to the input sample.  This is the consumer
+    side of :func:`listen`.
+    """
+    blocksize = len(block)
+    while len(ring) >= blocksize:
+        start = ring.read
+        ring.read_into(block)
+        if decimator is None:
+            for i in range(detector.process_all(block)):
+                on_press(ring.time_of(start + int(detector.presses[i]), samplerate))
+            continue
+        for i in range(detector.process_all(decimator.process(block))):
+            index = decimator.source_index(int(detector.presses[i]))
+            on_press(ring.time_of(start, samplerate) + index / samplerate)
+
+
+def drain_switch_presses(
+    ring: SampleRing,
+    detector: MultiEdgeDetector,
+    block: np.ndarray,
+    samplerate: int,
+    on_press: Callable[[int, float], None],
+    decimator: Decimator | None = None,
+) -> None:
+    """Like :func:`drain_presses`, calling ``on_press(switch, timestamp)``."""
+    blocksize = len(block)
+    while len(ring) >= blocksize:
+        start = ring.read
+        ring.read_into(block)
+        if decimator is None:
+            for i in range(detector.process_all(block)):
+                on_press(
+                    int(detector.switches[i]),
+                    ring.time_of(start + int(detector.presses[i]), samplerate),
+                )
+            continue
+        for i in range(detector.process_all(decimator.process(block))):
+            index = decimator.source_index(int(detector.presses[i]))
+            on_press(
+                int(detector.switches[i]),
+                ring.time_of(start, samplerate) + index / samplerate,
+            )
+
+
 def check_device(
     *,
     samplerate: int = 44_100,
@@ -118,44 +652,78 @@ def check_device(
             raise RuntimeError("Failed to open audio input device") from exc
 
 
-def listen(
-    on_press: Callable[[], None],
+# longest the consumer waits for the callback's signal before draining anyway
+_DRAIN_TIMEOUT = 0.1
+
+
+def _stream(
+    drain: Callable[[SampleRing, np.ndarray], None],
     *,
-    upper_offset: float = -0.2,
-    lower_offset: float = -0.5,
-    samplerate: int = 44_100,
-    blocksize: int = 256,
-    debounce_ms: int = 40,
-    device: Optional[int | str] = None,
+    channels: int,
+    samplerate: int,
+    blocksize: int,
+    device: Optional[int | str],
+    ring: SampleRing | None,
+    read_size: int | None = None,
+    supervisor: AudioSupervisor | None = None,
 ) -> None:
-    import sounddevice as sd
+    """Feed ``ring`` from an input stream and ``drain`` it until interrupted.
 
-    if upper_offset <= lower_offset:
-        raise ValueError("upper_offset must be > lower_offset (both negative values)")
-
-    refractory_samples = int(math.ceil((debounce_ms / 1_000) * samplerate))
+    ``drain`` is handed ``read_size`` frames at a time (default ``blocksize``).
+    With a ``supervisor`` the stream is reopened whenever it fails and this
+    also returns after :meth:`AudioSupervisor.stop`.
+    """
+    import sounddevice as sd
 
-    state = EdgeState(armed=True, cooldown=0)
+    if ring is None:
+        ring = SampleRing(max(samplerate, 8 * blocksize), channels=channels)
+    if ring.channels != channels:
+        raise ValueError(f"ring has {ring.channels} channels, expected {channels}")
+    samples = ring
+    # set by the callback once a whole read is waiting, so the consumer
+    # sleeps until there is work instead of polling the ring; a self-pipe
+    # because the callback must not take the lock an Event would
+    ready = Wakeup()
+
+    if channels == 1:
+
+        def _callback(
+            indata: np.ndarray, frames: int, time_info: object, _: int
+        ) -> None:
+            samples.write(indata[:, 0], _block_time(time_info, frames, samplerate))
+            if len(samples) >= len(block):
+                ready.set()
 
-    def _callback(indata: np.ndarray, frames: int, _: int, __: int) -> None:
-        nonlocal state
-        mono = indata.mean(axis=1) if indata.shape[1] > 1 else indata[:, 0]
+    else:
 
-        state, pressed = detect_edges(
-            mono,
-            state,
-            upper_offset,
-            lower_offset,
-            refractory_samples,
-        )
-        if pressed:
-            on_press()
+        def _callback(
+            indata: np.ndarray, frames: int, time_info: object, _: int
+        ) -> None:
+            samples.write(indata, _block_time(time_info, frames, samplerate))
+            if len(samples) >= len(block):
+                ready.set()
+
+    frames = read_size or blocksize
+    shape = (frames,) if channels == 1 else (frames, channels)
+    block = np.zeros(shape, dtype=np.float32)
+    overruns = 0
+
+    def _drain() -> None:
+        nonlocal overruns
+        drain(samples, block)
+        if samples.overruns != overruns:
+            log.warning(
+                "Audio consumer fell behind; dropped %d samples in %d blocks",
+                samples.dropped,
+                samples.overruns,
+            )
+            overruns = samples.overruns
 
     extra = get_extra_settings()
     stream_kwargs = dict(
         samplerate=samplerate,
         blocksize=blocksize,
-        channels=1,
+        channels=channels,
         dtype="float32",
         callback=_callback,
         device=device,
@@ -163,29 +731,168 @@ def listen(
     if extra is not None:
         stream_kwargs["extra_settings"] = extra
 
-    def _run(kwargs):
-        with sd.InputStream(**kwargs):
-            try:
-                while True:
-                    time.sleep(0.1)
-            except KeyboardInterrupt:
-                return
-
     try:
-        _run(stream_kwargs)
-    except sd.PortAudioError as exc:
-        if extra is not None:
-            stream_kwargs.pop("extra_settings", None)
+        if supervisor is not None:
             try:
-                _run(stream_kwargs)
-            except sd.PortAudioError as exc2:
+                supervisor.run(
+                    _callback,
+                    _drain,
+                    _DRAIN_TIMEOUT,
+                    wake=ready,
+                    samplerate=samplerate,
+                    blocksize=blocksize,
+                    channels=channels,
+                    dtype="float32",
+                    device=device,
+                )
+            except KeyboardInterrupt:
+                pass
+            log.debug("Audio ring metrics: %s", samples.metrics())
+            return
+
+        def _run(kwargs):
+            with sd.InputStream(**kwargs):
+                try:
+                    while True:
+                        ready.wait(_DRAIN_TIMEOUT)
+                        ready.clear()
+                        _drain()
+                except KeyboardInterrupt:
+                    log.debug("Audio ring metrics: %s", samples.metrics())
+                    return
+
+        try:
+            _run(stream_kwargs)
+        except sd.PortAudioError as exc:
+            if extra is not None:
+                stream_kwargs.pop("extra_settings", None)
+                try:
+                    _run(stream_kwargs)
+                except sd.PortAudioError as exc2:
+                    raise RuntimeError(
+                        "Failed to open audio input device"
+                    ) from exc2
+            else:
                 raise RuntimeError(
                     "Failed to open audio input device"
-                ) from exc2
-        else:
-            raise RuntimeError(
-                "Failed to open audio input device"
-            ) from exc
+                ) from exc
+    finally:
+        ready.close()
+
+
+def _decimation(
+    samplerate: int, blocksize: int, decimate_to: int | None
+) -> tuple[Decimator | None, float, int]:
+    """Return the decimator, detector rate and read size for ``decimate_to``.
+
+    Reads are a whole number of decimation periods so every block gives the
+    detector the same number of samples.
+    """
+    factor = 1 if decimate_to is None else decimation_factor(samplerate, decimate_to)
+    if factor == 1:
+        return None, samplerate, blocksize
+    read_size = factor * max(1, round(blocksize / factor))
+    return Decimator(factor), samplerate / factor, read_size
+
+
+def listen(
+    on_press: Callable[[float], None],
+    *,
+    upper_offset: float = -0.2,
+    lower_offset: float = -0.5,
+    samplerate: int = 44_100,
+    blocksize: int = 256,
+    debounce_ms: int = 40,
+    device: Optional[int | str] = None,
+    bias_time_constant_ms: float = BIAS_TIME_CONSTANT_MS,
+    ring: SampleRing | None = None,
+    decimate_to: int | None = None,
+    supervisor: AudioSupervisor | None = None,
+) -> None:
+    """Call ``on_press(timestamp)`` for every switch press until interrupted.
+
+    ``timestamp`` is the :func:`time.perf_counter` time at which the press
+    sample was captured, accurate to one sample where the host API reports
+    ADC times.  The signal level the offsets are relative to follows the
+    input with a time constant of ``bias_time_constant_ms`` whatever the
+    ``blocksize``.
+
+    The audio callback only copies samples into ``ring`` (by default about a
+    second of audio); detection and ``on_press`` run on the calling thread.
+    Pass a :class:`~switch_interface.audio.ring.SampleRing` to read its
+    overrun metrics.
+
+    ``decimate_to`` (Hz) runs detection on every n-th input sample only,
+    cutting the detector's work by the decimation factor; the debounce and
+    bias time constant keep their meaning at the lower rate.
+
+    Pass an :class:`~switch_interface.audio.supervisor.AudioSupervisor` to
+    keep listening through device errors and unplugging; otherwise a
+    failing stream ends the call.
+    """
+    decimator, rate, read_size = _decimation(samplerate, blocksize, decimate_to)
+    detector = make_detector(
+        upper_offset=upper_offset,
+        lower_offset=lower_offset,
+        samplerate=rate,
+        debounce_ms=debounce_ms,
+        bias_time_constant_ms=bias_time_constant_ms,
+    )
+    _stream(
+        lambda ring, block: drain_presses(
+            ring, detector, block, samplerate, on_press, decimator
+        ),
+        channels=1,
+        samplerate=samplerate,
+        blocksize=blocksize,
+        device=device,
+        ring=ring,
+        read_size=read_size,
+        supervisor=supervisor,
+    )
+
+
+def listen_switches(
+    on_press: Callable[[int, float], None],
+    *,
+    channels: int = 2,
+    upper_offset: float | Sequence[float] = -0.2,
+    lower_offset: float | Sequence[float] = -0.5,
+    samplerate: int = 44_100,
+    blocksize: int = 256,
+    debounce_ms: int | Sequence[int] = 40,
+    device: Optional[int | str] = None,
+    bias_time_constant_ms: float = BIAS_TIME_CONSTANT_MS,
+    ring: SampleRing | None = None,
+    decimate_to: int | None = None,
+    supervisor: AudioSupervisor | None = None,
+) -> None:
+    """Like :func:`listen` with one switch per input channel.
+
+    Calls ``on_press(switch, timestamp)`` where ``switch`` is the channel
+    index.  Offsets and debounce may be given per channel.
+    """
+    decimator, rate, read_size = _decimation(samplerate, blocksize, decimate_to)
+    debounce = np.broadcast_to(np.asarray(debounce_ms, dtype=np.float64), (channels,))
+    detector = MultiEdgeDetector(
+        upper_offset,
+        lower_offset,
+        np.ceil(debounce / 1_000 * rate).astype(int).tolist(),
+        channels,
+        bias_decay=bias_decay(bias_time_constant_ms, rate),
+    )
+    _stream(
+        lambda ring, block: drain_switch_presses(
+            ring, detector, block, samplerate, on_press, decimator
+        ),
+        channels=channels,
+        samplerate=samplerate,
+        blocksize=blocksize,
+        device=device,
+        ring=ring,
+        read_size=read_size,
+        supervisor=supervisor,
+    )
 
 
 if __name__ == "__main__":
@@ -201,7 +908,7 @@ if __name__ == "__main__":
 
     presscount = 0
 
-    def _on_press() -> None:
+    def _on_press(_timestamp: float) -> None:
         global presscount
         ts = _dt.datetime.now().strftime("%H:%M:%S.%f")[:-3]
         presscount += 1
@@ -4,9 +4,12 @@ from types import SimpleNamespace
 from typing import Callable
 
 from .kb_layout import Key, Keyboard
+from .audio.supervisor import AudioSupervisor, InputState
 from .key_types import Action
 from .modifier_state import ModifierState
-from .predictive import Predictor, default_predictor
+from .predictive import Predictor, get_default_predictor
+from .press_delivery import PressDelivery, _tcl_threaded
+from .scan_cost import ScanCostModel
 
 
 class VirtualKeyboard:
@@ -22,7 +25,7 @@ class VirtualKeyboard:
         self.keyboard = keyboard
         self.on_key = on_key
         self.state = state
-        self.predictor = predictor or default_predictor
+        self.predictor = predictor or get_default_predictor()
 
         self.current_page = 0
         self.highlight_index = 0
@@ -30,7 +33,11 @@ class VirtualKeyboard:
         self.key_widgets: list[tuple[tk.Label, Key]] = []
         self.row_start_indices: list[int] = []
         self.row_indices: list[int] = []
-        self.current_word: str = ""
+        self.session = self.predictor.session()
+        #: ``(dwell, row_column)`` when ranking words by scan time saved
+        self.scan_timing: tuple[float, bool] | None = None
+        #: the first word slot shows loading progress instead of a word
+        self.showing_loading = False
 
         self.root = tk.Tk()
         self.root.title("Virtual Keyboard")
@@ -45,6 +52,10 @@ class VirtualKeyboard:
 
         self.root.resizable(True, True)
 
+        # shown above the keys while switch presses cannot be heard
+        self.input_banner = tk.Label(self.root, bg="#ffb0b0")
+        self.input_supervisor: AudioSupervisor | None = None
+
         self.page_frame = tk.Frame(self.root)
         self.page_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
@@ -66,6 +77,8 @@ class VirtualKeyboard:
         self.base_width = self.root.winfo_width()
         self.base_height = self.root.winfo_height()
         self.root.bind("<Configure>", self._on_resize)
+        if not self.predictor.loaded:
+            self._watch_predictor()
 
     # ───────── public control API ──────────────────────────────────────────
     def advance_highlight(self):
@@ -81,6 +94,8 @@ class VirtualKeyboard:
         widget, key = self.key_widgets[self.highlight_index]
         mode = getattr(key, "mode", "tap")
         action = getattr(key, "action", None)
+        if action == Action.predict_word and self.showing_loading:
+            return  # the word slots show loading progress, not words
         label = widget.cget("text")
 
         send_key = key
@@ -95,19 +110,22 @@ class VirtualKeyboard:
             send_key = SimpleNamespace(label=label, action=action, mode=mode)
         self.on_key(send_key)  # hand to pc_control
 
-        # update current word buffer
+        # update current word buffer; finished words are learned
         if action == Action.predict_word:
-            self.current_word = ""
+            if label:
+                self.session.commit(label)
+            else:
+                self.session.reset()
         elif action == Action.predict_letter and label:
-            self.current_word += label.lower()
+            self.session.push(label)
         elif action == Action.backspace:
-            self.current_word = self.current_word[:-1]
+            self.session.pop()
         elif len(label) == 1 and label.isalpha():
-            self.current_word += label.lower()
+            self.session.push(label)
         elif action in (Action.space, Action.enter):
-            self.current_word = ""
+            self.session.commit()
         else:
-            self.current_word = ""
+            self.session.reset()
 
         self._update_predictions()
 
@@ -116,6 +134,17 @@ class VirtualKeyboard:
         self._refresh_letters()  # letters + tints
         self._update_highlight()  # keep yellow cursor
 
+    def set_scan_timing(self, dwell: float, row_column: bool = False) -> None:
+        """Rank word predictions by the scan time they save on this layout."""
+        self.scan_timing = (dwell, row_column)
+        self._update_scan_cost()
+        self._update_predictions()
+
+    def watch_input(self, supervisor: AudioSupervisor) -> None:
+        """Show a banner whenever ``supervisor`` has no working audio input."""
+        self.input_supervisor = supervisor
+        self._poll_input()
+
     def next_page(self):
         if self.current_page < len(self.keyboard) - 1:
             self.current_page += 1
@@ -126,6 +155,16 @@ class VirtualKeyboard:
             self.current_page -= 1
             self.render_page()
 
+    @property
+    def current_word(self) -> str:
+        """The partially typed word predictions are based on."""
+        return self.session.prefix
+
+    @current_word.setter
+    def current_word(self, word: str) -> None:
+        self.session.reset()
+        self.session.push(word)
+
     def row_start_for_index(self, index: int) -> int:
         """Return the first key index of the row containing ``index``."""
         row = self.row_indices[index]
@@ -149,8 +188,12 @@ class VirtualKeyboard:
             widget.config(bg=self._bg_for_key(k))
 
     def _update_predictions(self):
-        words = self.predictor.suggest_words(self.current_word, 3)
-        letters = self.predictor.suggest_letters(self.current_word, 3)
+        words = self.session.words(3)
+        self.showing_loading = not self.predictor.loaded
+        if self.showing_loading:
+            _, fraction = self.predictor.progress
+            words = [f"loading {fraction:.0%}"]
+        letters = self.session.letters(3)
         word_idx = 0
         letter_idx = 0
         for widget, k in self.key_widgets:
@@ -164,6 +207,59 @@ class VirtualKeyboard:
                 widget.config(text=label)
                 letter_idx += 1
 
+    def _watch_predictor(self) -> None:
+        """Show loading progress, then suggestions as soon as the words load.
+
+        The predictor reports ``ready`` on its loading thread, so with a
+        thread-enabled Tcl that is handed to the Tk thread like a switch
+        press.  The 100 ms poll keeps the progress current and otherwise
+        picks up the load.
+        """
+        if _tcl_threaded(self.root):
+            ready = PressDelivery(
+                self.root,
+                lambda _: self._update_predictions(),
+                event="<<PredictorReady>>",
+            )
+            report = self.predictor.on_progress
+
+            def _on_progress(stage: str, fraction: float) -> None:
+                if report is not None:
+                    report(stage, fraction)
+                if stage == "ready":
+                    ready.post(0.0)
+
+            self.predictor.on_progress = _on_progress
+            if self.predictor.loaded:  # finished before the hook was in
+                ready.post(0.0)
+        self.root.after(100, self._await_predictor)
+
+    def _await_predictor(self) -> None:
+        """Swap fallback suggestions for real ones once the word list loads."""
+        self._update_predictions()
+        if not self.predictor.loaded:
+            self._watch_predictor()
+
+    def _poll_input(self) -> None:
+        supervisor = self.input_supervisor
+        if supervisor is None:
+            return
+        state = supervisor.state
+        if state is InputState.running:
+            self.input_banner.pack_forget()
+        else:
+            text = {
+                InputState.connecting: "Connecting to the switch…",
+                InputState.reconnecting: "Switch input lost, reconnecting…",
+                InputState.stopped: "Switch input stopped",
+            }[state]
+            if supervisor.error and state is InputState.reconnecting:
+                text += f" ({supervisor.error})"
+            self.input_banner.config(text=text)
+            if not self.input_banner.winfo_ismapped():
+                self.input_banner.pack(fill=tk.X, before=self.page_frame)
+        self.root.after(250, self._poll_input)
+
     def render_page(self):
         # clear out old widgets from the frame before rendering the new page
         for child in self.page_frame.winfo_children():
@@ -204,8 +300,16 @@ class VirtualKeyboard:
         self.highlight_index = 0
         self.highlight_row_index = None
         self._update_highlight()
+        self._update_scan_cost()
         self._update_predictions()
 
+    def _update_scan_cost(self) -> None:
+        if self.scan_timing is not None:
+            dwell, row_column = self.scan_timing
+            self.predictor.scan_cost = ScanCostModel.from_keyboard(
+                self, dwell, row_column
+            )
+
     def _update_highlight(self):
         for idx, (widget, key) in enumerate(self.key_widgets):
             if self.highlight_row_index is not None:
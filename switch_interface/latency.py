@@ -0,0 +1,124 @@
+"""Press latency instrumentation.
+
+Every press carries the :func:`time.perf_counter` time its sample reached
+the ADC.  :class:`LatencyTracker` records how long after that each later
+stage ran (detection, dequeue on the GUI thread, the OS key event, the
+scanner finishing with the press) in a fixed-size :class:`LatencyHistogram` per stage, so recording
+never allocates and memory does not grow with uptime.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Callable, Sequence
+
+import numpy as np
+
+__all__ = ["STAGES", "LatencyHistogram", "LatencyTracker"]
+
+#: Stages after the ADC capture, in pipeline order.
+STAGES = ("detected", "dequeued", "emitted", "handled")
+
+
+class LatencyHistogram:
+    """Counts of latencies in ``resolution_ms`` bins up to ``max_ms``.
+
+    Larger values land in a final overflow bin and report as ``max_ms``.
+    """
+
+    def __init__(self, max_ms: float = 1000.0, resolution_ms: float = 0.1) -> None:
+        self.max_ms = max_ms
+        self.resolution_ms = resolution_ms
+        self.counts = np.zeros(int(round(max_ms / resolution_ms)) + 1, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return int(self.counts.sum())
+
+    def record(self, ms: float) -> None:
+        i = int(max(ms, 0.0) / self.resolution_ms)
+        self.counts[min(i, len(self.counts) - 1)] += 1
+
+    def percentile(self, p: float) -> float | None:
+        """Return the upper edge of the bin holding percentile ``p`` (0-100)."""
+        total = len(self)
+        if not total:
+            return None
+        rank = max(1, int(np.ceil(p / 100.0 * total)))
+        i = int(np.searchsorted(np.cumsum(self.counts), rank))
+        return min((i + 1) * self.resolution_ms, self.max_ms)
+
+    def summary(
+        self, percentiles: Sequence[float] = (50, 95, 99)
+    ) -> dict[str, float | int | None]:
+        out: dict[str, float | int | None] = {"n": len(self)}
+        for p in percentiles:
+            out[f"p{p:g}"] = self.percentile(p)
+        return out
+
+
+class LatencyTracker:
+    """Per-stage latency histograms for switch presses.
+
+    ``detected`` is marked on the listening thread; the other stages are
+    marked on the GUI thread between :meth:`begin` and :meth:`end`, which is
+    how ``emitted`` finds the press an OS key event belongs to.  ``handled``
+    is marked once the scanner has finished with the press and moved the
+    highlight, so it also covers presses that emit no key (see
+    :meth:`handle`).
+    """
+
+    def __init__(self, max_ms: float = 1000.0, resolution_ms: float = 0.1) -> None:
+        self.histograms = {
+            stage: LatencyHistogram(max_ms, resolution_ms) for stage in STAGES
+        }
+        self.current: float | None = None
+
+    def mark(self, stage: str, adc_time: float, now: float | None = None) -> None:
+        """Record that ``stage`` ran for the press captured at ``adc_time``."""
+        t = time.perf_counter() if now is None else now
+        self.histograms[stage].record((t - adc_time) * 1000.0)
+
+    def begin(self, adc_time: float) -> None:
+        """Start handling a press on the GUI thread; marks ``dequeued``."""
+        self.current = adc_time
+        self.mark("dequeued", adc_time)
+
+    def mark_current(self, stage: str) -> None:
+        """Mark ``stage`` for the press being handled, if any."""
+        if self.current is not None:
+            self.mark(stage, self.current)
+
+    def end(self) -> None:
+        """Finish the current press."""
+        self.current = None
+
+    def handle(self, adc_time: float, scanner: Callable[[], None]) -> None:
+        """Run ``scanner`` for the press captured at ``adc_time``.
+
+        Marks ``dequeued`` before calling it, so keys it emits are marked
+        ``emitted``, and ``handled`` once it returns.
+        """
+        self.begin(adc_time)
+        try:
+            scanner()
+            self.mark_current("handled")
+        finally:
+            self.end()
+
+    def summary(self) -> dict[str, dict[str, float | int | None]]:
+        return {stage: h.summary() for stage, h in self.histograms.items()}
+
+    def log_line(self) -> str:
+        """Return the summary as one JSON object for structured logs."""
+        return json.dumps({"press_latency_ms": self.summary()}, sort_keys=True)
+
+    def report(self) -> str:
+        """Return a human-readable table of the summary."""
+        lines = [f"{'stage':<10}{'n':>7}{'p50':>9}{'p95':>9}{'p99':>9}  (ms after ADC)"]
+        for stage, s in self.summary().items():
+            cells = [
+                "-" if s[k] is None else f"{s[k]:.1f}" for k in ("p50", "p95", "p99")
+            ]
+            lines.append(f"{stage:<10}{s['n']:>7}" + "".join(f"{c:>9}" for c in cells))
+        return "\n".join(lines)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import multiprocessing
 import tkinter as tk
 from importlib import resources
 from pathlib import Path
@@ -80,4 +81,5 @@ def main() -> None:
 
 
 if __name__ == "__main__":  # pragma: no cover - manual entry point
+    multiprocessing.freeze_support()
     main()
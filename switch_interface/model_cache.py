@@ -0,0 +1,125 @@
+"""Versioned binary container for predictive-text model arrays.
+
+Layout: an 8-byte magic, a little-endian ``uint32`` header length, a JSON
+header describing ``meta`` and every array (dtype, shape, offset), then the
+raw array data, each aligned to 64 bytes.  :func:`load` memory-maps the file
+so the arrays are views onto the page cache rather than fresh allocations.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import os
+import struct
+from typing import Any, Mapping
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".switch_interface")
+
+#: Bump when the arrays stored by :class:`~switch_interface.predictive.Predictor`
+#: change meaning, so stale files are rebuilt rather than misread.
+FORMAT_VERSION = 1
+
+_MAGIC = b"SWIMODEL"
+_ALIGN = 64
+
+
+def _aligned(n: int) -> int:
+    return -(-n // _ALIGN) * _ALIGN
+
+
+def pack(meta: Mapping[str, Any], arrays: Mapping[str, np.ndarray]) -> bytes:
+    """Serialise ``arrays`` plus JSON-compatible ``meta`` into one buffer."""
+    contiguous = [np.ascontiguousarray(arr) for arr in arrays.values()]
+    entries: list[dict[str, Any]] = []
+    offset = 0  # relative to the start of the aligned data section
+    for name, arr in zip(arrays, contiguous):
+        entries.append(
+            {
+                "name": name,
+                "dtype": arr.dtype.str,
+                "shape": list(arr.shape),
+                "offset": offset,
+            }
+        )
+        offset = _aligned(offset + arr.nbytes)
+
+    header = json.dumps(
+        {"version": FORMAT_VERSION, "meta": dict(meta), "arrays": entries}
+    ).encode()
+    data_start = _aligned(len(_MAGIC) + 4 + len(header))
+    buf = bytearray(data_start + offset)
+    buf[: len(_MAGIC)] = _MAGIC
+    buf[len(_MAGIC) : len(_MAGIC) + 4] = struct.pack("<I", len(header))
+    buf[len(_MAGIC) + 4 : len(_MAGIC) + 4 + len(header)] = header
+    for entry, arr in zip(entries, contiguous):
+        start = data_start + entry["offset"]
+        buf[start : start + arr.nbytes] = arr.tobytes()
+    return bytes(buf)
+
+
+def unpack(buffer: Any) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+    """Return ``(meta, arrays)`` from :func:`pack` output without copying.
+
+    ``buffer`` may be ``bytes`` or an :class:`mmap.mmap`; the arrays are
+    read-only views onto it.  Raises ``ValueError`` on a foreign or stale
+    buffer.
+    """
+    view = memoryview(buffer)
+    if bytes(view[: len(_MAGIC)]) != _MAGIC:
+        raise ValueError("not a switch_interface model buffer")
+    (header_len,) = struct.unpack("<I", view[len(_MAGIC) : len(_MAGIC) + 4])
+    start = len(_MAGIC) + 4
+    header = json.loads(bytes(view[start : start + header_len]))
+    if header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"unsupported model format {header.get('version')!r}")
+
+    data_start = _aligned(start + header_len)
+    arrays: dict[str, np.ndarray] = {}
+    for entry in header["arrays"]:
+        dtype = np.dtype(entry["dtype"])
+        count = int(np.prod(entry["shape"], dtype=np.int64))
+        arr = np.frombuffer(
+            buffer, dtype=dtype, count=count, offset=data_start + entry["offset"]
+        )
+        arrays[entry["name"]] = arr.reshape(entry["shape"])
+    return header["meta"], arrays
+
+
+def load(path: str, meta: Mapping[str, Any]) -> dict[str, np.ndarray] | None:
+    """Memory-map ``path`` and return its arrays if its meta equals ``meta``.
+
+    Returns ``None`` when the file is missing, unreadable or built for
+    different settings.
+    """
+    try:
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        stored, arrays = unpack(mapped)
+    except (ValueError, KeyError, TypeError, struct.error) as exc:
+        log.debug("Ignoring model cache %s (%s)", path, exc)
+        return None
+    if stored != dict(meta):
+        log.debug("Model cache %s is stale: %s != %s", path, stored, dict(meta))
+        return None
+    return arrays
+
+
+def save(path: str, meta: Mapping[str, Any], arrays: Mapping[str, np.ndarray]) -> None:
+    """Atomically write ``arrays`` to ``path``."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(pack(meta, arrays))
+    os.replace(tmp, path)
+
+
+__all__ = ["CACHE_DIR", "FORMAT_VERSION", "load", "pack", "save", "unpack"]
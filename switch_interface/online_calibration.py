@@ -0,0 +1,266 @@
+"""Auto-calibrate from a live stream while the user presses the switch.
+
+:class:`OnlineCalibrator` is fed audio blocks as they arrive.  A moment
+after each press it hears, the baseline, trough depth and threshold offsets
+are re-estimated from the audio so far, exactly as :func:`~switch_interface.
+auto_calibration.calibrate` derives its first-guess thresholds.  The
+rolling percentile behind the baseline, the costly part, is only computed
+for new audio.
+
+Those first guesses can sit inside the noise (``calibrate`` scales them
+in its sweep), so presses are spotted with offsets at least 4 and 8 times
+the residual noise below the level, by the detector
+:func:`~switch_interface.detection.listen` runs.
+
+Once a few presses have moved the offsets by less than ``tolerance`` of
+the trough depth the estimate reports itself converged, so a calibration
+session can stop there instead of recording for a fixed time.
+:meth:`OnlineCalibrator.result` then runs the full debounce and threshold
+sweep of ``calibrate`` on the recording.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.signal import find_peaks
+
+from .auto_calibration import (
+    CalibResult,
+    CalibrationSession,
+    _ClipBlocks,
+    _baseline_from_quantiles,
+    _choose_thresholds,
+    _rolling_baseline,
+    _rolling_quantile,
+    calibrate,
+)
+from .detection import BIAS_TIME_CONSTANT_MS, EdgeDetector, bias_decay
+
+__all__ = ["OnlineCalibrator", "OnlineEstimate"]
+
+
+@dataclass
+class OnlineEstimate:
+    """Calibration estimate from the audio heard so far.
+
+    Offsets are relative to the baseline median, as in
+    :class:`~switch_interface.auto_calibration.CalibResult`.
+    """
+
+    #: presses detected so far
+    presses: int
+    #: seconds of audio the estimate is based on
+    seconds: float
+    baseline: float
+    depth: float
+    upper_offset: float
+    lower_offset: float
+    #: robust standard deviation of the signal around the baseline
+    noise: float = 0.0
+    converged: bool = False
+
+
+class OnlineCalibrator:
+    """Refine calibration thresholds block by block from a live stream.
+
+    ``settle`` is the number of earlier estimates since the first press
+    whose offsets must stay within ``tolerance`` × depth of the latest one,
+    with at least ``min_presses`` presses heard, before the estimate counts
+    as converged.
+    Estimates are made at most every ``min_interval`` seconds of audio, and
+    the first one after a second so the baseline window is full.
+    ``bias_time_constant_ms`` is the detector's, as for
+    :func:`~switch_interface.detection.listen`.
+    """
+
+    def __init__(
+        self,
+        fs: int,
+        *,
+        settle: int = 3,
+        tolerance: float = 0.05,
+        min_presses: int = 3,
+        min_interval: float = 0.5,
+        debounce_ms: int = 40,
+        bias_time_constant_ms: float = BIAS_TIME_CONSTANT_MS,
+    ) -> None:
+        self.fs = fs
+        self.settle = settle
+        self.tolerance = tolerance
+        self.min_presses = min_presses
+        self.min_interval = min_interval
+        self.bias_time_constant_ms = bias_time_constant_ms
+        self._pad = int(0.05 * fs)  # let the trough finish before estimating
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self.n = 0
+        self._quantiles: list[np.ndarray] = []
+        self._quantiles_end = 0
+        # infinite offsets only advance the bias until the depth is known
+        self._detector = EdgeDetector(
+            math.inf,
+            -math.inf,
+            math.ceil(debounce_ms / 1000 * fs),
+            bias_decay=bias_decay(bias_time_constant_ms, fs),
+        )
+        #: length of the blocks being fed (the first one, as the last may be
+        #: short), which re-arming depends on
+        self._blocksize = 64
+        self._due: int | None = int(fs)
+        self._last_update = -math.inf
+        self.presses = 0
+        #: latest estimate, ``None`` until the first second has been heard
+        self.estimate: OnlineEstimate | None = None
+        self.history: list[OnlineEstimate] = []
+
+    @property
+    def samples(self) -> np.ndarray:
+        """Everything fed so far."""
+        return self._buffer[: self.n]
+
+    @property
+    def converged(self) -> bool:
+        return self.estimate is not None and self.estimate.converged
+
+    def feed(self, block: np.ndarray) -> OnlineEstimate | None:
+        """Add a block of audio; return the new estimate if one was made."""
+        block = np.asarray(block)
+        if block.ndim != 1:
+            raise ValueError(f"block must be a 1-D array (got shape {block.shape})")
+        if not self.n and len(block):
+            self._blocksize = len(block)
+        self._append(block)
+
+        pressed = self._detector.process_all(block)
+        if pressed:
+            self.presses += pressed
+            if self._due is None:
+                self._due = self.n + self._pad
+
+        if (
+            self._due is not None
+            and self.n >= self._due
+            and self.n - self._last_update >= self.min_interval * self.fs
+        ):
+            self._due = None
+            return self._update()
+        return None
+
+    def finish(self) -> OnlineEstimate:
+        """Estimate from everything fed, as the batch thresholds would be."""
+        return self._update()
+
+    def result(
+        self, *, target_presses: int | None = None, workers: int = 1
+    ) -> CalibResult:
+        """Run :func:`~switch_interface.auto_calibration.calibrate` on the clip.
+
+        Presses are counted in blocks the size of those fed.  The rolling
+        baseline is only extended over audio since the last estimate.
+        """
+        raw = self.samples
+        session = CalibrationSession(
+            raw,
+            self.fs,
+            block=self._blocksize,
+            bias_time_constant_ms=self.bias_time_constant_ms,
+            baseline=self._baseline(raw),
+        )
+        return calibrate(
+            raw,
+            self.fs,
+            target_presses=target_presses,
+            workers=workers,
+            session=session,
+        )
+
+    # ───────── internal helpers ───────────────────────────────────────────
+    def _append(self, block: np.ndarray) -> None:
+        end = self.n + len(block)
+        if end > len(self._buffer):
+            grown = np.zeros(max(end, 2 * len(self._buffer)), dtype=block.dtype)
+            grown[: self.n] = self._buffer[: self.n]
+            self._buffer = grown
+        self._buffer[self.n : end] = block
+        self.n = end
+
+    def _baseline(self, raw: np.ndarray) -> np.ndarray:
+        win_len = int(self.fs)
+        if len(raw) < win_len:
+            return _rolling_baseline(raw, self.fs)
+        # percentiles of the windows ending in audio not covered yet
+        first = max(self._quantiles_end, win_len - 1)
+        if first < len(raw):
+            self._quantiles.append(
+                _rolling_quantile(raw[first - (win_len - 1) :], win_len, 0.80)
+            )
+            self._quantiles_end = len(raw)
+        quantiles = np.concatenate(self._quantiles)
+        self._quantiles = [quantiles]
+        return _baseline_from_quantiles(quantiles, raw, self.fs)
+
+    def _update(self) -> OnlineEstimate:
+        raw = self.samples
+        baseline = self._baseline(raw)
+        residual = raw - baseline
+        trough_idx, _ = find_peaks(-residual, distance=int(0.020 * self.fs))
+        upper, lower = _choose_thresholds(
+            raw, baseline, self.fs, trough_idx=trough_idx
+        )
+        baseline_med = float(np.median(baseline))
+        troughs = raw[trough_idx] if trough_idx.size else np.array([raw.min()])
+        depth = baseline_med - float(np.median(troughs))
+        noise = 1.4826 * float(np.median(np.abs(residual - np.median(residual))))
+
+        u_off, l_off = upper - baseline_med, lower - baseline_med
+        self._set_detector(u_off, l_off, noise)
+
+        estimate = OnlineEstimate(
+            presses=self.presses,
+            seconds=self.n / self.fs,
+            baseline=baseline_med,
+            depth=depth,
+            upper_offset=u_off,
+            lower_offset=l_off,
+            noise=noise,
+        )
+        # estimates from before the first press say nothing about presses
+        recent = [e for e in self.history if e.presses][-self.settle :]
+        estimate.converged = (
+            self.presses >= self.min_presses
+            and len(recent) == self.settle
+            and all(
+                abs(e.upper_offset - u_off) <= self.tolerance * depth
+                and abs(e.lower_offset - l_off) <= self.tolerance * depth
+                for e in recent
+            )
+        )
+        self.history.append(estimate)
+        self.estimate = estimate
+        self._last_update = self.n
+        return estimate
+
+    def _set_detector(self, u_off: float, l_off: float, noise: float) -> None:
+        """Detect presses with offsets outside the noise from now on."""
+        upper = min(u_off, -4 * noise)
+        lower = min(l_off, -8 * noise)
+        detector = self._detector
+        if lower >= upper:
+            # no trough depth yet (a silent input); look again shortly
+            detector.upper_offset, detector.lower_offset = math.inf, -math.inf
+            self._due = self.n + int(self.min_interval * self.fs)
+            return
+        if math.isinf(detector.upper_offset):
+            # the press that revealed the depth went by undetected: count
+            # the presses so far as the detector would have seen them, in
+            # blocks the size of those being fed
+            clip = _ClipBlocks(
+                self.samples,
+                self._blocksize,
+                bias_decay(self.bias_time_constant_ms, self.fs),
+            )
+            events = clip.events(upper, lower, detector.refractory_samples)
+            self.presses = len(events)
+        detector.upper_offset, detector.lower_offset = upper, lower
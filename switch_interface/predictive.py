@@ -1,138 +1,792 @@
-"""Simple predictive text helpers without module-level state."""
+"""Simple predictive text helpers.
+
+The module-level helpers share a predictor that is only created on first
+use, so importing this module never loads the word list.  Built models are
+cached on disk by :mod:`switch_interface.model_cache`.
+
+A :class:`Predictor` created with ``build_in_process=True`` builds its model
+in a :class:`~concurrent.futures.ProcessPoolExecutor` worker, so the work
+does not hold the GIL the GUI and audio callback need, and receives the
+tables back as one :func:`~switch_interface.model_cache.pack` buffer.
+"""
 
 from __future__ import annotations
 
-from collections import Counter, defaultdict
-from functools import lru_cache
-from typing import Counter as CounterType, DefaultDict
+import logging
+import multiprocessing
+import os
+import queue
+from collections import Counter, OrderedDict
+from importlib import metadata
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Hashable, Iterable, NamedTuple
 
 import threading
 
+import numpy as np
 from wordfreq import top_n_list
 
+from . import model_cache
+from . import user_vocab as _user_vocab
+from .prefix_index import PrefixIndex, PrefixTrie
+from .scan_cost import ScanCostModel
+from .user_vocab import UserVocabulary, WordBigrams
+
+log = logging.getLogger(__name__)
+
+
+# English letter frequency order, offered until the word list has loaded.
+FALLBACK_LETTERS = "etaoinshrdlcumwfgypbvkjxqz"
+
+# Most probable completions re-ranked when ranking by scan cost.
+SCAN_COST_POOL = 16
+
+
+def _letters(word: str) -> str:
+    return "".join(c for c in word.lower() if c.isalpha())
+
+
+class LetterNgrams:
+    """Start-letter, bigram and trigram letter counts as dense arrays.
+
+    Letters map to their index in :attr:`alphabet`; row ``a * len(alphabet)
+    + b`` of :attr:`trigrams` holds the counts of letters following ``ab``.
+    """
+
+    def __init__(
+        self,
+        alphabet: str,
+        starts: np.ndarray,
+        bigrams: np.ndarray,
+        trigrams: np.ndarray,
+    ) -> None:
+        self.alphabet = alphabet
+        self.starts = starts
+        self.bigrams = bigrams
+        self.trigrams = trigrams
+        self._pos = {c: i for i, c in enumerate(alphabet)}
+
+    @classmethod
+    def build(cls, words: Iterable[str]) -> LetterNgrams:
+        """Count letter n-grams over the alphabetic characters of ``words``."""
+        starts: Counter[str] = Counter()
+        bigrams: Counter[tuple[str, str]] = Counter()
+        trigrams: Counter[tuple[str, str, str]] = Counter()
+        for word in words:
+            w = _letters(word)
+            if not w:
+                continue
+            starts[w[0]] += 1
+            bigrams.update(zip(w, w[1:]))
+            trigrams.update(zip(w, w[1:], w[2:]))
+
+        alphabet = "".join(sorted(set(starts).union(*bigrams)))
+        pos = {c: i for i, c in enumerate(alphabet)}
+        n = len(alphabet)
+        start_arr = np.zeros(n, dtype=np.int32)
+        bigram_arr = np.zeros((n, n), dtype=np.int32)
+        trigram_arr = np.zeros((n * n, n), dtype=np.int32)
+        for c, count in starts.items():
+            start_arr[pos[c]] = count
+        for (a, b), count in bigrams.items():
+            bigram_arr[pos[a], pos[b]] = count
+        for (a, b, c), count in trigrams.items():
+            trigram_arr[pos[a] * n + pos[b], pos[c]] = count
+        return cls(alphabet, start_arr, bigram_arr, trigram_arr)
+
+    @classmethod
+    def from_arrays(cls, arrays: dict[str, np.ndarray]) -> LetterNgrams:
+        alphabet = arrays["alphabet"].tobytes().decode("utf-32-le")
+        return cls(alphabet, arrays["starts"], arrays["bigrams"], arrays["trigrams"])
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        return {
+            "alphabet": np.frombuffer(self.alphabet.encode("utf-32-le"), dtype="<u4"),
+            "starts": self.starts,
+            "bigrams": self.bigrams,
+            "trigrams": self.trigrams,
+        }
+
+    def next_letters(self, letters: str, k: int) -> list[str]:
+        """Return up to ``k`` letters likely to follow the end of ``letters``.
+
+        Uses the trigram on the last two letters, backing off to the bigram on
+        the last letter and finally to start-letter counts.
+        """
+        n = len(self.alphabet)
+        row: np.ndarray | None = None
+        if len(letters) >= 2:
+            a = self._pos.get(letters[-2])
+            b = self._pos.get(letters[-1])
+            if a is not None and b is not None and self.trigrams[a * n + b].any():
+                row = self.trigrams[a * n + b]
+        if row is None and letters:
+            b = self._pos.get(letters[-1])
+            if b is not None and self.bigrams[b].any():
+                row = self.bigrams[b]
+        if row is None:
+            row = self.starts
+        order = np.argsort(-row, kind="stable")[:k]
+        return [self.alphabet[i] for i in order.tolist() if row[i] > 0]
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class SuggestionCache:
+    """Bounded least-recently-used mapping with hit/miss counters.
+
+    Unlike :func:`functools.lru_cache` on a method, the cache belongs to one
+    predictor, so it dies with it and can be cleared when its model changes.
+    """
+
+    def __init__(self, maxsize: int = 2048) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the value for ``key`` (marking it recent) or ``None``."""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry; the hit/miss counters are kept."""
+        with self._lock:
+            self._data.clear()
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+
+#: ``on_progress(stage, fraction)`` callback reporting model loading.
+ProgressCallback = Callable[[str, float], None]
+
+
+def _section(arrays: dict[str, np.ndarray], name: str) -> dict[str, np.ndarray]:
+    prefix = name + "."
+    return {k[len(prefix) :]: v for k, v in arrays.items() if k.startswith(prefix)}
+
+
+def _model_arrays(
+    words: list[str], index: PrefixIndex, trie: PrefixTrie, ngrams: LetterNgrams
+) -> dict[str, np.ndarray]:
+    arrays = {"words": np.frombuffer("\n".join(words).encode("utf-8"), np.uint8)}
+    for name, part in (("index", index), ("trie", trie), ("ngrams", ngrams)):
+        for key, arr in part.to_arrays().items():
+            arrays[f"{name}.{key}"] = arr
+    return arrays
+
+
+def _model_from_arrays(
+    arrays: dict[str, np.ndarray],
+) -> tuple[list[str], PrefixIndex, PrefixTrie, LetterNgrams]:
+    words = arrays["words"].tobytes().decode("utf-8").split("\n")
+    return (
+        words,
+        PrefixIndex.from_arrays(words, _section(arrays, "index")),
+        PrefixTrie.from_arrays(_section(arrays, "trie")),
+        LetterNgrams.from_arrays(_section(arrays, "ngrams")),
+    )
+
+
+# ───────── process-pool model building ───────────────────────────────────
+_worker_progress: Any = None
+
+
+def _init_worker(progress: Any) -> None:
+    global _worker_progress
+    _worker_progress = progress
+
+
+def _worker_report(stage: str, fraction: float) -> None:
+    if _worker_progress is not None:
+        _worker_progress.put((stage, fraction))
+
+
+def build_model_buffer(words: list[str] | None, lang: str, n_words: int) -> bytes:
+    """Build every predictor structure and return them as one packed buffer.
+
+    Runs in a worker process; progress goes to the queue handed to the
+    pool initializer.
+    """
+    _worker_report("words", 0.0)
+    words = list(words or top_n_list(lang, n_words))
+    _worker_report("index", 0.25)
+    index = PrefixIndex(words)
+    _worker_report("trie", 0.5)
+    trie = PrefixTrie(index)
+    _worker_report("ngrams", 0.75)
+    ngrams = LetterNgrams.build(words)
+    return model_cache.pack({}, _model_arrays(words, index, trie, ngrams))
+
 
 class Predictor:
-    """Generate common word and letter suggestions."""
+    """Generate common word and letter suggestions.
+
+    With ``background=True`` the word list and prefix structures are built on
+    a daemon thread; until :attr:`loaded` is true, :meth:`suggest_words`
+    returns nothing and :meth:`suggest_letters` returns
+    :data:`FALLBACK_LETTERS`.
+
+    When ``words`` is not given, the top ``n_words`` words of ``lang`` are
+    used and the built model is cached in ``cache_dir`` (``None`` disables
+    the cache).  A cache hit memory-maps every structure, including the
+    n-grams, so the predictor is :attr:`ready` as soon as it is loaded.
+
+    Suggestions are memoised per instance in two :class:`SuggestionCache`
+    objects of ``cache_size`` entries, cleared by :meth:`invalidate_caches`
+    whenever the model changes.
+
+    Words taught through :meth:`learn` are kept in ``user_vocab`` and blended
+    into both word and letter ranking: a candidate scores its Zipf weight
+    ``1 / (rank + 1)`` plus ``user_weight`` times its decayed use count.
+    Consecutive learned words also train ``next_words``, which drives
+    :meth:`suggest_next_words` between words.
 
-    def __init__(self, words: list[str] | None = None) -> None:
-        self.words = words or top_n_list("en", 80_000)
-        self.fallback_starts = Counter(
-            w[0] for w in self.words if w and w[0].isalpha()
+    With a :attr:`scan_cost` model, completions are instead ranked by the
+    expected scan time they save (see :meth:`expected_savings`).
+
+    ``build_in_process=True`` (which implies ``background``) builds the whole
+    model, n-grams included, in a worker process.  Loading progress is kept
+    in :attr:`progress` and passed to ``on_progress(stage, fraction)`` from
+    the loading thread; the final call is ``("ready", 1.0)``.
+    """
+
+    words: list[str]
+    index: PrefixIndex
+    trie: PrefixTrie
+
+    def __init__(
+        self,
+        words: list[str] | None = None,
+        *,
+        background: bool = False,
+        lang: str = "en",
+        n_words: int = 80_000,
+        cache_dir: str | None = model_cache.CACHE_DIR,
+        cache_size: int = 2048,
+        user_vocab: UserVocabulary | None = None,
+        user_weight: float = 0.1,
+        next_words: WordBigrams | None = None,
+        scan_cost: ScanCostModel | None = None,
+        build_in_process: bool = False,
+        on_progress: ProgressCallback | None = None,
+    ) -> None:
+        self._scan_cost = scan_cost
+        self.on_progress = on_progress
+        self.build_in_process = build_in_process
+        self.progress: tuple[str, float] = ("pending", 0.0)
+        self.user_vocab = user_vocab
+        self.next_words = next_words
+        self.user_weight = user_weight
+        self.word_cache = SuggestionCache(cache_size)
+        self.letter_cache = SuggestionCache(cache_size)
+        self.lang = lang
+        self.n_words = n_words
+        self.cache_path = (
+            os.path.join(cache_dir, f"predictor-{lang}-{n_words}.bin")
+            if cache_dir is not None
+            else None
         )
-        self.start_letters: CounterType[str] | None = None
-        self.bigrams: DefaultDict[str, CounterType[str]] | None = None
-        self.trigrams: DefaultDict[str, CounterType[str]] | None = None
+        self._cacheable = False
+        self.ngrams: LetterNgrams | None = None
         self.ready = False
         self.thread: threading.Thread | None = None
         self.lock = threading.Lock()
+        self._loaded = threading.Event()
+        self.load_thread: threading.Thread | None = None
+        if build_in_process:
+            self.load_thread = threading.Thread(
+                target=self._load_in_process, args=(words,), daemon=True
+            )
+            self.load_thread.start()
+        elif background:
+            self.load_thread = threading.Thread(
+                target=self._load, args=(words,), daemon=True
+            )
+            self.load_thread.start()
+        else:
+            self._load(words)
+
+    @property
+    def loaded(self) -> bool:
+        """``True`` once the word list and prefix index are available."""
+        return self._loaded.is_set()
+
+    def wait_loaded(self, timeout: float | None = None) -> bool:
+        """Block until the word list has loaded; return :attr:`loaded`."""
+        return self._loaded.wait(timeout)
+
+    def invalidate_caches(self) -> None:
+        """Forget memoised suggestions after the model has changed."""
+        self.word_cache.clear()
+        self.letter_cache.clear()
+
+    @property
+    def scan_cost(self) -> ScanCostModel | None:
+        """Scan timing used to rank completions by seconds saved, if any."""
+        return self._scan_cost
+
+    @scan_cost.setter
+    def scan_cost(self, model: ScanCostModel | None) -> None:
+        self._scan_cost = model
+        self.invalidate_caches()
+
+    def learn(self, word: str, previous: str | None = None) -> None:
+        """Record that the user committed ``word`` (after ``previous``)."""
+        changed = self.user_vocab is not None and self.user_vocab.learn(word)
+        if self.next_words is not None and previous:
+            changed = self.next_words.add(previous, word) or changed
+        if changed:
+            self.invalidate_caches()
+
+    def cache_info(self) -> dict[str, CacheInfo]:
+        """Return hit/miss statistics of the word and letter caches."""
+        return {"words": self.word_cache.info(), "letters": self.letter_cache.info()}
 
     # ───────── internal helpers ────────────────────────────────────────────
-    def _build_ngrams(self) -> None:
-        start_letters: CounterType[str] = Counter()
-        bigrams: DefaultDict[str, CounterType[str]] = defaultdict(Counter)
-        trigrams: DefaultDict[str, CounterType[str]] = defaultdict(Counter)
+    def _cache_meta(self) -> dict[str, object]:
+        try:
+            version = metadata.version("wordfreq")
+        except metadata.PackageNotFoundError:
+            version = "unknown"
+        return {"lang": self.lang, "n_words": self.n_words, "wordfreq": version}
 
-        for word in self.words:
-            w = "".join(c for c in word.lower() if c.isalpha())
-            if not w:
-                continue
-            start_letters[w[0]] += 1
-            for a, b in zip(w, w[1:]):
-                bigrams[a][b] += 1
-            for a, b, c in zip(w, w[1:], w[2:]):
-                trigrams[a + b][c] += 1
+    def _report(self, stage: str, fraction: float) -> None:
+        self.progress = (stage, fraction)
+        if self.on_progress is not None:
+            self.on_progress(stage, fraction)
 
-        self.start_letters = start_letters
-        self.bigrams = bigrams
-        self.trigrams = trigrams
+    def _load(self, words: list[str] | None) -> None:
+        if not words and self.cache_path is not None:
+            if self._load_cache(self.cache_path):
+                return
+            self._cacheable = True
+        self._report("words", 0.0)
+        words = words or top_n_list(self.lang, self.n_words)
+        self._report("index", 0.5)
+        index = PrefixIndex(words)
+        self.trie = PrefixTrie(index)
+        self.index = index
+        self.words = words
+        self.invalidate_caches()
+        self._loaded.set()
+        self._report("ready", 1.0)
+
+    def _load_in_process(self, words: list[str] | None) -> None:
+        if not words and self.cache_path is not None:
+            if self._load_cache(self.cache_path):
+                return
+            self._cacheable = True
+        self._report("starting", 0.0)
+        # spawn: forking a process that runs Tk and audio threads is unsafe
+        ctx = multiprocessing.get_context("spawn")
+        progress = ctx.Queue()
+        try:
+            with ProcessPoolExecutor(
+                1, mp_context=ctx, initializer=_init_worker, initargs=(progress,)
+            ) as pool:
+                future = pool.submit(
+                    build_model_buffer, words, self.lang, self.n_words
+                )
+                while not future.done():
+                    try:
+                        self._report(*progress.get(timeout=0.05))
+                    except queue.Empty:
+                        pass
+                buffer = future.result()
+            _, arrays = model_cache.unpack(buffer)
+            model = _model_from_arrays(arrays)
+        except Exception:
+            log.warning("Model build worker failed; building in-thread", exc_info=True)
+            self.build_in_process = False
+            self._load(words)
+            return
+        finally:
+            progress.close()
+        self._adopt(*model)
+        if self._cacheable and self.cache_path is not None:
+            self._save_cache(self.cache_path)
+
+    def _adopt(
+        self,
+        words: list[str],
+        index: PrefixIndex,
+        trie: PrefixTrie,
+        ngrams: LetterNgrams,
+    ) -> None:
+        self.trie = trie
+        self.index = index
+        self.words = words
+        self.ngrams = ngrams
         self.ready = True
+        self.invalidate_caches()
+        self._loaded.set()
+        self._report("ready", 1.0)
+
+    def _load_cache(self, path: str) -> bool:
+        arrays = model_cache.load(path, self._cache_meta())
+        if arrays is None:
+            return False
+        try:
+            model = _model_from_arrays(arrays)
+        except (KeyError, UnicodeDecodeError) as exc:
+            log.debug("Ignoring incomplete model cache %s (%s)", path, exc)
+            return False
+        self._adopt(*model)
+        log.debug("Loaded predictive model from %s", path)
+        return True
+
+    def _save_cache(self, path: str) -> None:
+        assert self.ngrams is not None
+        arrays = _model_arrays(self.words, self.index, self.trie, self.ngrams)
+        try:
+            model_cache.save(path, self._cache_meta(), arrays)
+        except OSError as exc:
+            log.debug("Could not write model cache %s (%s)", path, exc)
+
+    def _build_ngrams(self) -> None:
+        self._loaded.wait()
+        self.ngrams = LetterNgrams.build(self.words)
+        self.ready = True
+        self.invalidate_caches()
+        if self._cacheable and self.cache_path is not None:
+            self._save_cache(self.cache_path)
 
     def _ensure_thread(self) -> None:
         """Kick off n-gram building in the background if not already running."""
 
-        if self.ready or self.thread is not None:
+        if self.ready or self.thread is not None or self.build_in_process:
             return
         with self.lock:
             if self.thread is None and not self.ready:
                 self.thread = threading.Thread(target=self._build_ngrams, daemon=True)
                 self.thread.start()
 
-    def _fallback_letters(self, prefix: str, k: int) -> list[str]:
-        cleaned = "".join(c for c in prefix.lower() if c.isalpha())
-
-        counts: Counter[str] = Counter()
-        if not cleaned:
-            counts = self.fallback_starts
-        else:
-            n = len(cleaned)
-            for w in self.words:
-                if w.startswith(cleaned) and len(w) > n:
-                    c = w[n]
-                    if c.isalpha():
-                        counts[c] += 1
-            if not counts:
-                counts = self.fallback_starts
-
-        return [c for c, _ in counts.most_common(k)]
-
     # ───────── public API ─────────────────────────────────────────────────
-    @lru_cache(maxsize=2048)
     def suggest_words(self, prefix: str, k: int = 3) -> list[str]:
         """Return up to ``k`` common words starting with ``prefix``."""
         self._ensure_thread()
 
-        if not prefix:
+        if not prefix or not self.loaded:
             return []
-        p = prefix.lower()
-        return [w for w in self.words if w.startswith(p)][:k]
+        key = (prefix, k)
+        words = self.word_cache.get(key)
+        if words is None:
+            p = prefix.lower()
+            words = self._words_in(*self.index.prefix_range(p), p, k)
+            self.word_cache.put(key, words)
+        return words
 
     def suggest_letters(self, prefix: str, k: int = 3) -> list[str]:
-        """Suggest up to ``k`` likely next letters for ``prefix``."""
+        """Suggest up to ``k`` likely next letters for ``prefix``.
+
+        Prefixes of known words are answered exactly from the trie; n-gram
+        statistics are only consulted for out-of-vocabulary prefixes.
+        """
         self._ensure_thread()
 
-        if not self.ready:
-            return self._fallback_letters(prefix, k)
+        if not self.loaded:
+            return list(FALLBACK_LETTERS[:k])
 
-        return self._suggest_letters_cached(prefix, k)
+        key = (prefix, k)
+        letters = self.letter_cache.get(key)
+        if letters is None:
+            letters = self._letters_for(prefix, k)
+            self.letter_cache.put(key, letters)
+        return letters
 
-    @lru_cache(maxsize=2048)
-    def _suggest_letters_cached(self, prefix: str, k: int = 3) -> list[str]:
-        """Cached implementation for suggesting letters once data is ready."""
-        # ``_ensure_thread`` and readiness checks happen in ``suggest_letters``.
-        cleaned = "".join(c for c in prefix.lower() if c.isalpha())
-        if not cleaned:
-            assert self.start_letters is not None
-            source = self.start_letters
-        else:
-            last2 = cleaned[-2:]
-            if len(last2) == 2 and self.trigrams is not None and last2 in self.trigrams:
-                source = self.trigrams[last2]
-            else:
-                last1 = cleaned[-1]
-                assert self.bigrams is not None and self.start_letters is not None
-                source = self.bigrams.get(last1, self.start_letters)
-        return [letter for letter, _ in source.most_common(k)]
+    def suggest_next_words(self, previous: str | None, k: int = 3) -> list[str]:
+        """Return up to ``k`` words likely to follow ``previous``.
+
+        Learned transitions come first; remaining slots are filled with the
+        user's most used words and then the most common words overall, so
+        word keys are not left blank between words.
+        """
+        if not self.loaded:
+            return []
+        key = (None, previous, k)
+        words = self.word_cache.get(key)
+        if words is None:
+            words = []
+            if self.next_words is not None and previous:
+                words = self.next_words.successors(previous, k)
+            learned = self.user_vocab.top(k) if self.user_vocab else []
+            for w in chain(learned, self.words):
+                if len(words) >= k:
+                    break
+                if w.isalpha() and w not in words:
+                    words.append(w)
+            self.word_cache.put(key, words)
+        return words
+
+    def session(self) -> SuggestionSession:
+        """Return a :class:`SuggestionSession` for typing one word at a time."""
+        return SuggestionSession(self)
+
+    def _letters_for(self, prefix: str, k: int) -> list[str]:
+        return self._letters_at(self.trie.find(prefix.lower()), prefix, k)
+
+    def _letters_at(self, node: int, prefix: str, k: int) -> list[str]:
+        if self.user_vocab:
+            letters = self._blended_letters(node, prefix.lower(), k)
+            if letters:
+                return letters
+
+        if node >= 0:
+            letters = self.trie.next_letters(node, k)
+            if letters:
+                return letters
+
+        if self.ngrams is None:
+            return self.trie.next_letters(0, k)
+        return self.ngrams.next_letters(_letters(prefix), k)
+
+    def _blended_letters(self, node: int, prefix: str, k: int) -> list[str]:
+        assert self.user_vocab is not None
+        weights = dict(self.trie.next_letter_weights(node)) if node >= 0 else {}
+        n = len(prefix)
+        for word, score in self.user_vocab.completions(prefix):
+            if len(word) > n and word[n].isalpha():
+                weights[word[n]] = weights.get(word[n], 0.0) + self.user_weight * score
+        return sorted(weights, key=lambda c: -weights[c])[:k]
+
+    def _words_at(self, node: int, prefix: str, k: int) -> list[str]:
+        if node < 0:
+            return self._words_in(0, 0, prefix, k)
+        lo = int(self.trie.node_lo[node])
+        hi = int(self.trie.node_hi[node])
+        return self._words_in(lo, hi, prefix, k)
+
+    def _words_in(self, lo: int, hi: int, prefix: str, k: int) -> list[str]:
+        """Rank the ``[lo, hi)`` index slice for ``prefix``, blending user words."""
+        if self.scan_cost is not None:
+            gains = self._savings_in(lo, hi, prefix, k, max(k, SCAN_COST_POOL))
+            return [w for w, _ in gains]
+
+        ranks = self.index.top_ranks(lo, hi, k)
+        if not self.user_vocab:
+            return [self.words[r] for r in ranks]
+        scores = self._scores(ranks, prefix)
+        return sorted(scores, key=lambda w: -scores[w])[:k]
+
+    def _scores(self, ranks: list[int], prefix: str) -> dict[str, float]:
+        scores = {self.words[r]: 1.0 / (r + 1) for r in ranks}
+        if self.user_vocab:
+            for word, score in self.user_vocab.completions(prefix):
+                base = scores.get(word)
+                if base is None:
+                    rank = self.index.rank_of(word)
+                    base = 0.0 if rank is None else 1.0 / (rank + 1)
+                scores[word] = base + self.user_weight * score
+        return scores
+
+    def _savings_in(
+        self, lo: int, hi: int, prefix: str, k: int, pool: int
+    ) -> list[tuple[str, float]]:
+        """Return ``(word, expected seconds saved)`` for the ``k`` word slots.
+
+        The ``pool`` most probable words are weighed by their share of the
+        prefix's total score and the scan time picking them would save.
+        Slots are filled in scan order, each with the remaining word that
+        saves the most from that slot, since later slots take longer to
+        reach.
+        """
+        assert self.scan_cost is not None
+        scores = self._scores(self.index.top_ranks(lo, hi, pool), prefix)
+        node = self.trie.find(prefix)
+        total = float(self.trie.node_weight[node]) if node >= 0 else 0.0
+        if self.user_vocab:
+            total += sum(
+                self.user_weight * s for _, s in self.user_vocab.completions(prefix)
+            )
+        if total <= 0.0:
+            return []
+        shares = {w: s / total for w, s in scores.items()}
+        gains: list[tuple[str, float]] = []
+        for slot in range(min(k, len(shares))):
+            best = max(
+                (
+                    (w, p * self.scan_cost.savings(prefix, w, slot))
+                    for w, p in shares.items()
+                ),
+                key=lambda item: item[1],
+            )
+            gains.append(best)
+            del shares[best[0]]
+        return gains
+
+    def expected_savings(self, prefix: str, k: int = 3) -> list[tuple[str, float]]:
+        """Return the ``k`` best completions with their expected seconds saved.
+
+        Requires :attr:`scan_cost`; useful for benchmarking layouts, dwell
+        times and ranking modes.
+        """
+        if self.scan_cost is None:
+            raise ValueError("expected_savings needs a scan_cost model")
+        if not prefix or not self.loaded:
+            return []
+        p = prefix.lower()
+        lo, hi = self.index.prefix_range(p)
+        return self._savings_in(lo, hi, p, k, max(k, SCAN_COST_POOL))
+
+
+class SuggestionSession:
+    """Suggestions for a word typed one letter at a time.
+
+    The session keeps the trie node of every prefix of :attr:`prefix`, so
+    :meth:`push` is a single child lookup and :meth:`pop` just drops the last
+    node.  Nodes are resolved lazily, so a session created while the
+    predictor is still loading catches up once it is ready.
+    """
+
+    def __init__(self, predictor: Predictor) -> None:
+        self.predictor = predictor
+        self.prefix = ""
+        #: last committed word, used for next-word prediction
+        self.previous: str | None = None
+        self._trie: PrefixTrie | None = None
+        self._nodes: list[int] = [0]
+
+    def push(self, chars: str) -> None:
+        """Append ``chars`` to the current word."""
+        self.prefix += chars.lower()
+
+    def pop(self) -> None:
+        """Remove the last letter of the current word, if any."""
+        if self.prefix:
+            self.prefix = self.prefix[:-1]
+            if len(self._nodes) > len(self.prefix) + 1:
+                self._nodes.pop()
+
+    def reset(self) -> None:
+        """Start a new word."""
+        self.prefix = ""
+        del self._nodes[1:]
+
+    def commit(self, word: str | None = None) -> None:
+        """Finish ``word`` (default: :attr:`prefix`), learn it and start anew."""
+        word = self.prefix if word is None else word.lower()
+        if word:
+            self.predictor.learn(word, self.previous)
+            self.previous = word
+        self.reset()
+
+    def _node(self) -> int:
+        trie = self.predictor.trie
+        if trie is not self._trie:
+            self._trie = trie
+            del self._nodes[1:]
+        nodes = self._nodes
+        while len(nodes) <= len(self.prefix):
+            parent = nodes[-1]
+            c = self.prefix[len(nodes) - 1]
+            nodes.append(trie.child(parent, c) if parent >= 0 else -1)
+        return nodes[len(self.prefix)]
+
+    def words(self, k: int = 3) -> list[str]:
+        """Like :meth:`Predictor.suggest_words` for :attr:`prefix`.
+
+        Between words, predicts the word after :attr:`previous` instead.
+        """
+        self.predictor._ensure_thread()
+        if not self.prefix:
+            return self.predictor.suggest_next_words(self.previous, k)
+        if not self.predictor.loaded:
+            return []
+        return self.predictor._words_at(self._node(), self.prefix, k)
+
+    def letters(self, k: int = 3) -> list[str]:
+        """Like :meth:`Predictor.suggest_letters` for :attr:`prefix`."""
+        self.predictor._ensure_thread()
+        if not self.predictor.loaded:
+            return list(FALLBACK_LETTERS[:k])
+        return self.predictor._letters_at(self._node(), self.prefix, k)
+
+
+_default_predictor: Predictor | None = None
+_default_lock = threading.Lock()
+
+
+def get_default_predictor(**options: Any) -> Predictor:
+    """Return the shared predictor, creating it on first use.
+
+    The word list loads on a background thread, so this returns immediately.
+    The built model is cached in :data:`model_cache.CACHE_DIR` (pass
+    ``cache_dir=None`` to skip the cache) and learned words are kept in
+    :data:`~switch_interface.user_vocab.USER_VOCAB_FILE` and
+    :data:`~switch_interface.user_vocab.BIGRAM_FILE`.  ``options`` are extra
+    :class:`Predictor` arguments and only apply when this call creates the
+    predictor.
+    """
+    global _default_predictor
+    if _default_predictor is None:
+        with _default_lock:
+            if _default_predictor is None:
+                # read the paths now, not at import, so they can be redirected
+                options.setdefault("cache_dir", model_cache.CACHE_DIR)
+                if "user_vocab" not in options:
+                    path = _user_vocab.USER_VOCAB_FILE
+                    options["user_vocab"] = UserVocabulary(path)
+                if "next_words" not in options:
+                    options["next_words"] = WordBigrams(_user_vocab.BIGRAM_FILE)
+                _default_predictor = Predictor(background=True, **options)
+    return _default_predictor
 
 
-# A module-level predictor for simple use
-default_predictor = Predictor()
+def __getattr__(name: str) -> Predictor:
+    # ``default_predictor`` used to be built at import time; keep the name.
+    if name == "default_predictor":
+        return get_default_predictor()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def suggest_words(prefix: str, k: int = 3) -> list[str]:
-    """Wrapper around :meth:`Predictor.suggest_words` using ``default_predictor``."""
+    """Wrapper around :meth:`Predictor.suggest_words` using the default predictor."""
 
-    return default_predictor.suggest_words(prefix, k)
+    return get_default_predictor().suggest_words(prefix, k)
 
 
 def suggest_letters(prefix: str, k: int = 3) -> list[str]:
-    """Wrapper around :meth:`Predictor.suggest_letters` using ``default_predictor``."""
+    """Wrapper around :meth:`Predictor.suggest_letters` using the default predictor."""
 
-    return default_predictor.suggest_letters(prefix, k)
+    return get_default_predictor().suggest_letters(prefix, k)
 
 
 __all__ = [
+    "CacheInfo",
+    "FALLBACK_LETTERS",
+    "LetterNgrams",
     "Predictor",
-    "default_predictor",
+    "ProgressCallback",
+    "SuggestionCache",
+    "SuggestionSession",
+    "build_model_buffer",
+    "get_default_predictor",
     "suggest_words",
     "suggest_letters",
 ]
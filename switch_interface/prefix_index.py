@@ -0,0 +1,248 @@
+"""Sorted prefix index and trie answering frequency-ranked prefix queries."""
+
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_left
+from typing import Sequence
+
+import numpy as np
+
+
+def _prefix_end(prefix: str) -> str | None:
+    """Return the smallest string greater than every string starting with ``prefix``.
+
+    ``None`` means there is no such bound and the range extends to the end.
+    """
+    while prefix:
+        last = ord(prefix[-1])
+        if last < 0x10FFFF:
+            return prefix[:-1] + chr(last + 1)
+        prefix = prefix[:-1]
+    return None
+
+
+class PrefixIndex:
+    """Lexicographically sorted copy of a frequency-ordered word list.
+
+    Words starting with a prefix occupy one contiguous slice of the sorted
+    array, found with two bisections.  A sparse table over the frequency
+    ranks of that array answers range-minimum queries in constant time, so
+    the ``k`` most frequent completions come out of a small heap in
+    ``O(log n + k log k)`` regardless of how many words share the prefix.
+    """
+
+    def __init__(self, words: Sequence[str]) -> None:
+        self.words = list(words)
+        order = sorted(range(len(self.words)), key=self.words.__getitem__)
+        self.sorted_words = [self.words[i] for i in order]
+        #: frequency rank (index into ``words``) of each sorted position
+        self.ranks = np.asarray(order, dtype=np.int32)
+        #: sorted position of each frequency rank
+        self.positions = np.empty_like(self.ranks)
+        self.positions[self.ranks] = np.arange(len(self.ranks), dtype=np.int32)
+        #: every sparse-table level, concatenated
+        self.table = self._build_table(self.ranks)
+        self._levels = self._split_table(self.table, len(self.ranks))
+
+    @classmethod
+    def from_arrays(
+        cls, words: Sequence[str], arrays: dict[str, np.ndarray]
+    ) -> PrefixIndex:
+        """Rebuild an index from :meth:`to_arrays` output without re-sorting."""
+        self = cls.__new__(cls)
+        self.words = list(words)
+        self.ranks = arrays["ranks"]
+        self.positions = arrays["positions"]
+        self.table = arrays["table"]
+        self.sorted_words = [self.words[i] for i in self.ranks.tolist()]
+        self._levels = self._split_table(self.table, len(self.ranks))
+        return self
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """Return the packed arrays :meth:`from_arrays` needs."""
+        return {"ranks": self.ranks, "positions": self.positions, "table": self.table}
+
+    @staticmethod
+    def _build_table(ranks: np.ndarray) -> np.ndarray:
+        """Concatenate ``level[j][i] == ranks[i : i + 2**j].min()`` for every level."""
+        levels = [ranks]
+        width = 1
+        while 2 * width <= len(ranks):
+            prev = levels[-1]
+            levels.append(np.minimum(prev[:-width], prev[width:]))
+            width *= 2
+        return np.concatenate(levels)
+
+    @staticmethod
+    def _split_table(table: np.ndarray, n: int) -> list[np.ndarray]:
+        levels = []
+        start = 0
+        width = 1
+        while width <= n:
+            size = n - width + 1
+            levels.append(table[start : start + size])
+            start += size
+            width *= 2
+        return levels
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def prefix_range(self, prefix: str) -> tuple[int, int]:
+        """Return the ``[lo, hi)`` slice of :attr:`sorted_words` matching ``prefix``."""
+        lo = bisect_left(self.sorted_words, prefix)
+        end = _prefix_end(prefix)
+        hi = len(self.sorted_words) if end is None else bisect_left(
+            self.sorted_words, end, lo
+        )
+        return lo, hi
+
+    def _range_min(self, lo: int, hi: int) -> int:
+        level = (hi - lo).bit_length() - 1
+        row = self._levels[level]
+        return int(min(row[lo], row[hi - (1 << level)]))
+
+    def top_ranks(self, lo: int, hi: int, k: int) -> list[int]:
+        """Return the ``k`` smallest frequency ranks inside ``[lo, hi)``."""
+        if k <= 0 or lo >= hi:
+            return []
+        heap = [(self._range_min(lo, hi), lo, hi)]
+        out: list[int] = []
+        while heap and len(out) < k:
+            rank, a, b = heapq.heappop(heap)
+            out.append(rank)
+            pos = int(self.positions[rank])
+            if a < pos:
+                heapq.heappush(heap, (self._range_min(a, pos), a, pos))
+            if pos + 1 < b:
+                heapq.heappush(heap, (self._range_min(pos + 1, b), pos + 1, b))
+        return out
+
+    def rank_of(self, word: str) -> int | None:
+        """Return the frequency rank of ``word`` or ``None`` if absent."""
+        pos = bisect_left(self.sorted_words, word)
+        if pos < len(self.sorted_words) and self.sorted_words[pos] == word:
+            return int(self.ranks[pos])
+        return None
+
+    def complete(self, prefix: str, k: int) -> list[str]:
+        """Return up to ``k`` words starting with ``prefix`` in frequency order."""
+        lo, hi = self.prefix_range(prefix)
+        return [self.words[r] for r in self.top_ranks(lo, hi, k)]
+
+
+class PrefixTrie:
+    """Array-backed trie over the words of a :class:`PrefixIndex`.
+
+    Node ``0`` is the empty prefix.  Every node covers the ``[lo, hi)``
+    slice of :attr:`PrefixIndex.sorted_words` sharing its prefix, and its
+    outgoing edges are stored contiguously, ordered by the Zipf weight
+    (``1 / (rank + 1)``) of the words below them.  The first edges of a node
+    are therefore its most likely next letters, and walking one letter is a
+    ``str.find`` over at most an alphabet's worth of characters.
+    """
+
+    def __init__(self, index: PrefixIndex) -> None:
+        words = index.sorted_words
+        parents: list[int] = [-1]
+        chars: list[str] = ["\0"]
+        los: list[int] = [0]
+        his: list[int] = [len(words)]
+        path = [0]  # node of each prefix length of the previous word
+        prev = ""
+        for i, word in enumerate(words):
+            common = 0
+            limit = min(len(prev), len(word))
+            while common < limit and prev[common] == word[common]:
+                common += 1
+            for node in path[common + 1 :]:
+                his[node] = i
+            del path[common + 1 :]
+            for c in word[common:]:
+                parents.append(path[-1])
+                chars.append(c)
+                los.append(i)
+                his.append(len(words))
+                path.append(len(parents) - 1)
+            prev = word
+
+        weights = 1.0 / (index.ranks.astype(np.float64) + 1.0)
+        cum = np.concatenate(([0.0], np.cumsum(weights)))
+        self.node_lo = np.asarray(los, dtype=np.int32)
+        self.node_hi = np.asarray(his, dtype=np.int32)
+        self.node_weight = cum[self.node_hi] - cum[self.node_lo]
+
+        parent = np.asarray(parents, dtype=np.int32)
+        order = np.lexsort((-self.node_weight[1:], parent[1:])) + 1
+        self.edge_child = order.astype(np.int32)
+        edge_parent = parent[order]
+        nodes = np.arange(len(parents), dtype=np.int32)
+        self.edge_start = np.searchsorted(edge_parent, nodes, "left").astype(np.int32)
+        self.edge_end = np.searchsorted(edge_parent, nodes, "right").astype(np.int32)
+        self.edge_chars = "".join(chars[c] for c in order.tolist())
+
+    @classmethod
+    def from_arrays(cls, arrays: dict[str, np.ndarray]) -> PrefixTrie:
+        """Rebuild a trie from :meth:`to_arrays` output."""
+        self = cls.__new__(cls)
+        self.node_lo = arrays["node_lo"]
+        self.node_hi = arrays["node_hi"]
+        self.node_weight = arrays["node_weight"]
+        self.edge_child = arrays["edge_child"]
+        self.edge_start = arrays["edge_start"]
+        self.edge_end = arrays["edge_end"]
+        self.edge_chars = arrays["edge_chars"].tobytes().decode("utf-32-le")
+        return self
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """Return the trie as flat arrays; edge letters become UTF-32 code points."""
+        return {
+            "node_lo": self.node_lo,
+            "node_hi": self.node_hi,
+            "node_weight": self.node_weight,
+            "edge_child": self.edge_child,
+            "edge_start": self.edge_start,
+            "edge_end": self.edge_end,
+            "edge_chars": np.frombuffer(
+                self.edge_chars.encode("utf-32-le"), dtype="<u4"
+            ),
+        }
+
+    def __len__(self) -> int:
+        return len(self.node_lo)
+
+    def child(self, node: int, char: str) -> int:
+        """Return the node reached from ``node`` via ``char`` or ``-1``."""
+        j = self.edge_chars.find(
+            char, int(self.edge_start[node]), int(self.edge_end[node])
+        )
+        return -1 if j < 0 else int(self.edge_child[j])
+
+    def find(self, prefix: str) -> int:
+        """Return the node for ``prefix`` or ``-1`` if no word starts with it."""
+        node = 0
+        for c in prefix:
+            node = self.child(node, c)
+            if node < 0:
+                return -1
+        return node
+
+    def next_letters(self, node: int, k: int) -> list[str]:
+        """Return the ``k`` most likely alphabetic letters following ``node``."""
+        edges = self.edge_chars[int(self.edge_start[node]) : int(self.edge_end[node])]
+        return [c for c in edges if c.isalpha()][:k]
+
+    def next_letter_weights(self, node: int) -> list[tuple[str, float]]:
+        """Return ``(letter, weight)`` for every alphabetic edge of ``node``."""
+        start = int(self.edge_start[node])
+        end = int(self.edge_end[node])
+        children = self.edge_child[start:end].tolist()
+        return [
+            (c, float(self.node_weight[child]))
+            for c, child in zip(self.edge_chars[start:end], children)
+            if c.isalpha()
+        ]
+
+
+__all__ = ["PrefixIndex", "PrefixTrie"]
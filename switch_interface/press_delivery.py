@@ -0,0 +1,79 @@
+"""Deliver switch presses from the listening thread to the Tk main loop.
+
+Presses are queued and announced with a ``<<SwitchPress>>`` virtual event,
+which Tk processes as soon as the main loop is idle, instead of waiting for
+the next tick of a polling timer.  Generating the event from another thread
+needs a thread-enabled Tcl; without one, or when ``poll_ms`` is given, the
+queue is polled with ``after`` instead.
+"""
+
+from __future__ import annotations
+
+import logging
+import tkinter as tk
+from queue import Empty, SimpleQueue
+from typing import Any, Callable
+
+log = logging.getLogger(__name__)
+
+PRESS_EVENT = "<<SwitchPress>>"
+
+__all__ = ["PRESS_EVENT", "PressDelivery"]
+
+
+def _tcl_threaded(root: Any) -> bool:
+    try:
+        return bool(root.tk.call("info", "exists", "tcl_platform(threaded)"))
+    except (AttributeError, tk.TclError):
+        return False
+
+
+class PressDelivery:
+    """Call ``on_press(timestamp)`` on the Tk thread for every :meth:`post`.
+
+    Each instance on a root needs its own virtual ``event``.
+    """
+
+    def __init__(
+        self,
+        root: Any,
+        on_press: Callable[[float], None],
+        *,
+        poll_ms: int | None = None,
+        event: str = PRESS_EVENT,
+    ) -> None:
+        self.root = root
+        self.on_press = on_press
+        self.event = event
+        self.queue: SimpleQueue[float] = SimpleQueue()
+        self.event_driven = poll_ms is None and _tcl_threaded(root)
+        self.poll_ms = poll_ms or 10
+        if self.event_driven:
+            root.bind(event, self._drain)
+            # presses posted before the main loop starts cannot be signalled
+            root.after_idle(self._drain)
+        else:
+            log.debug("Polling for presses every %d ms", self.poll_ms)
+            root.after(self.poll_ms, self._poll)
+
+    def post(self, timestamp: float) -> None:
+        """Queue a press; safe to call from any thread."""
+        self.queue.put(timestamp)
+        if self.event_driven:
+            try:
+                self.root.event_generate(self.event, when="tail")
+            except (RuntimeError, tk.TclError) as exc:
+                # the main loop has not started yet or has already exited
+                log.debug("Could not signal press (%s)", exc)
+
+    def _drain(self, _event: Any = None) -> None:
+        while True:
+            try:
+                timestamp = self.queue.get_nowait()
+            except Empty:
+                return
+            self.on_press(timestamp)
+
+    def _poll(self) -> None:
+        self._drain()
+        self.root.after(self.poll_ms, self._poll)
@@ -0,0 +1,248 @@
+"""Replay recorded switch audio through the real-time detection path.
+
+Clips are streamed block by block through the same
+:class:`~switch_interface.audio.ring.SampleRing` and
+:func:`~switch_interface.detection.drain_presses` consumer that
+:func:`~switch_interface.detection.listen` runs, as fast as the CPU allows,
+so detector changes can be regression-tested on field recordings without
+hardware.  As in ``listen``, a trailing partial block is never processed.
+
+Run ``python -m switch_interface.replay CLIP [--labels LABELS]`` to print
+the presses, precision/recall against labelled press times and throughput.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+
+from .audio.ring import SampleRing
+from .detection import (
+    BIAS_TIME_CONSTANT_MS,
+    _decimation,
+    drain_presses,
+    make_detector,
+)
+
+__all__ = [
+    "ReplayResult",
+    "Score",
+    "load_clip",
+    "load_labels",
+    "replay",
+    "score",
+]
+
+_WAV_DTYPES = {1: np.uint8, 2: np.int16, 4: np.int32}
+
+
+@dataclass
+class ReplayResult:
+    """Presses found in a clip and how fast they were found."""
+
+    #: press times in seconds from the start of the clip
+    presses: np.ndarray
+    samplerate: int
+    blocksize: int
+    samples: int
+    elapsed: float
+
+    @property
+    def throughput(self) -> float:
+        """Samples processed per second of wall time."""
+        return self.samples / self.elapsed if self.elapsed > 0 else float("inf")
+
+    @property
+    def realtime_factor(self) -> float:
+        """How many times faster than real time the clip was processed."""
+        return self.throughput / self.samplerate
+
+
+@dataclass
+class Score:
+    true_positives: int
+    false_positives: int
+    false_negatives: int
+
+    @property
+    def precision(self) -> float:
+        found = self.true_positives + self.false_positives
+        return self.true_positives / found if found else 1.0
+
+    @property
+    def recall(self) -> float:
+        actual = self.true_positives + self.false_negatives
+        return self.true_positives / actual if actual else 1.0
+
+
+def _to_float32(samples: np.ndarray) -> np.ndarray:
+    """Return mono ``float32`` samples in ``[-1, 1]`` from any PCM array."""
+    arr = np.asarray(samples)
+    if arr.ndim == 2:
+        arr = arr.mean(axis=1) if arr.dtype.kind == "f" else arr[:, 0]
+    if arr.dtype == np.uint8:
+        return (arr.astype(np.float32) - 128.0) / 128.0
+    if arr.dtype.kind == "i":
+        return arr.astype(np.float32) / float(2 ** (8 * arr.dtype.itemsize - 1))
+    return arr.astype(np.float32, copy=False)
+
+
+def load_clip(path: str | Path) -> tuple[np.ndarray, int | None]:
+    """Return ``(samples, samplerate)`` from a ``.wav`` or ``.npy`` file.
+
+    Samples are mono ``float32``; integer PCM is scaled to ``[-1, 1]`` and
+    the first channel is used.  ``.npy`` files carry no sample rate, so it
+    is ``None`` for them.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".npy":
+        return _to_float32(np.load(path)), None
+    with wave.open(str(path), "rb") as wav:
+        width = wav.getsampwidth()
+        if width not in _WAV_DTYPES:
+            raise ValueError(f"unsupported WAV sample width: {width} bytes")
+        channels = wav.getnchannels()
+        rate = wav.getframerate()
+        frames = wav.readframes(wav.getnframes())
+    data = np.frombuffer(frames, dtype=_WAV_DTYPES[width]).reshape(-1, channels)
+    return _to_float32(data), rate
+
+
+def load_labels(path: str | Path) -> np.ndarray:
+    """Return labelled press times in seconds (``.npy`` or one per line)."""
+    path = Path(path)
+    if path.suffix.lower() == ".npy":
+        return np.asarray(np.load(path), dtype=np.float64).ravel()
+    return np.atleast_1d(np.loadtxt(path, dtype=np.float64, ndmin=1))
+
+
+def replay(
+    samples: np.ndarray,
+    samplerate: int,
+    *,
+    blocksize: int = 256,
+    upper_offset: float = -0.2,
+    lower_offset: float = -0.5,
+    debounce_ms: int = 40,
+    bias_time_constant_ms: float = BIAS_TIME_CONSTANT_MS,
+    decimate_to: int | None = None,
+) -> ReplayResult:
+    """Stream ``samples`` through the detector as :func:`listen` would."""
+    samples = _to_float32(samples)
+    decimator, rate, read_size = _decimation(samplerate, blocksize, decimate_to)
+    detector = make_detector(
+        upper_offset=upper_offset,
+        lower_offset=lower_offset,
+        samplerate=rate,
+        debounce_ms=debounce_ms,
+        bias_time_constant_ms=bias_time_constant_ms,
+    )
+    ring = SampleRing(2 * max(blocksize, read_size))
+    block = np.zeros(read_size, dtype=np.float32)
+    presses: list[float] = []
+
+    t0 = time.perf_counter()
+    whole = len(samples) - len(samples) % blocksize
+    for start in range(0, whole, blocksize):
+        ring.write(samples[start : start + blocksize], start / samplerate)
+        drain_presses(ring, detector, block, samplerate, presses.append, decimator)
+    elapsed = time.perf_counter() - t0
+
+    return ReplayResult(
+        presses=np.asarray(presses, dtype=np.float64),
+        samplerate=samplerate,
+        blocksize=blocksize,
+        samples=whole,
+        elapsed=elapsed,
+    )
+
+
+def score(
+    detected: Iterable[float], truth: Iterable[float], tolerance: float = 0.05
+) -> Score:
+    """Match presses to labels at most ``tolerance`` seconds apart.
+
+    Both are walked in time order and each label matches at most one press.
+    """
+    found = sorted(detected)
+    actual = sorted(truth)
+    i = j = tp = 0
+    while i < len(found) and j < len(actual):
+        diff = found[i] - actual[j]
+        if abs(diff) <= tolerance:
+            tp += 1
+            i += 1
+            j += 1
+        elif diff < 0:
+            i += 1
+        else:
+            j += 1
+    return Score(tp, len(found) - tp, len(actual) - tp)
+
+
+def _detector_settings(path: str | None) -> dict[str, Any]:
+    if path is None:
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    keys = (
+        "upper_offset",
+        "lower_offset",
+        "debounce_ms",
+        "bias_time_constant_ms",
+        "decimate_to",
+    )
+    return {k: data[k] for k in keys if k in data}
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Replay a recorded clip through the switch detector",
+    )
+    parser.add_argument("clip", help="Recording (.wav or .npy)")
+    parser.add_argument("--samplerate", type=int, help="Required for .npy clips")
+    parser.add_argument(
+        "--blocksize", type=int, nargs="+", default=[256], help="Block sizes to try"
+    )
+    parser.add_argument("--labels", help="Ground-truth press times in seconds")
+    parser.add_argument("--tolerance", type=float, default=0.05)
+    parser.add_argument("--config", help="Detector settings JSON (detector.json)")
+    parser.add_argument(
+        "--decimate-to", type=int, help="Detect at roughly this rate (Hz)"
+    )
+    parser.add_argument("--print-presses", action="store_true")
+    args = parser.parse_args(argv)
+
+    samples, rate = load_clip(args.clip)
+    rate = args.samplerate or rate
+    if rate is None:
+        parser.error("--samplerate is required for .npy clips")
+    settings = _detector_settings(args.config)
+    if args.decimate_to:
+        settings["decimate_to"] = args.decimate_to
+    truth = load_labels(args.labels) if args.labels else None
+
+    for blocksize in args.blocksize:
+        result = replay(samples, rate, blocksize=blocksize, **settings)
+        line = (
+            f"blocksize {blocksize:>5}: {len(result.presses):>4} presses, "
+            f"{result.throughput / 1e6:7.2f} Msamples/s "
+            f"({result.realtime_factor:,.0f}x real time)"
+        )
+        if truth is not None:
+            s = score(result.presses, truth, args.tolerance)
+            line += f", precision {s.precision:.3f}, recall {s.recall:.3f}"
+        print(line)
+        if args.print_presses:
+            print("  " + " ".join(f"{t:.4f}" for t in result.presses))
+
+
+if __name__ == "__main__":  # pragma: no cover - manual entry point
+    main()
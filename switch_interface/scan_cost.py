@@ -0,0 +1,102 @@
+"""Estimate how long a scanning user needs to select keys and type words.
+
+After every press the :class:`~switch_interface.scan_engine.Scanner` starts
+again from the first key (or row), so selecting a key costs the dwell time
+of everything highlighted before it plus, on average, half of its own
+dwell.  Row/column scanning pays that cost once for the row and once for
+the key within it.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+from .interfaces import ScannableKeyboard
+from .key_types import Action
+
+
+def _dwell(key: Any, dwell: float) -> float:
+    return dwell * (getattr(key, "dwell_mult", None) or 1)
+
+
+def key_times(
+    keys: Sequence[Any],
+    row_indices: Sequence[int],
+    row_start_indices: Sequence[int],
+    dwell: float,
+    row_column: bool = False,
+) -> list[float]:
+    """Return the expected seconds from scan reset to selecting each key."""
+    times: list[float] = []
+    if not row_column:
+        elapsed = 0.0
+        for key in keys:
+            d = _dwell(key, dwell)
+            times.append(elapsed + d / 2)
+            elapsed += d
+        return times
+
+    for idx, key in enumerate(keys):
+        row = row_indices[idx]
+        row_time = row * dwell + dwell / 2
+        start = row_start_indices[row]
+        before = sum(_dwell(k, dwell) for k in keys[start:idx])
+        times.append(row_time + before + _dwell(key, dwell) / 2)
+    return times
+
+
+class ScanCostModel:
+    """Selection times of the letter, space and word-prediction keys."""
+
+    def __init__(
+        self,
+        letter_times: dict[str, float],
+        word_slot_times: Sequence[float],
+        space_time: float = 0.0,
+    ) -> None:
+        self.letter_times = letter_times
+        self.word_slot_times = list(word_slot_times)
+        self.space_time = space_time
+        # letters missing from the page cost at least as much as the slowest key
+        self.missing_letter_time = max(letter_times.values(), default=0.0)
+
+    @classmethod
+    def from_keyboard(
+        cls, keyboard: ScannableKeyboard, dwell: float, row_column: bool = False
+    ) -> ScanCostModel:
+        """Build a model for the page currently shown by ``keyboard``."""
+        keys = [key for _, key in keyboard.key_widgets]
+        times = key_times(
+            keys, keyboard.row_indices, keyboard.row_start_indices, dwell, row_column
+        )
+        letters: dict[str, float] = {}
+        slots: list[float] = []
+        space = 0.0
+        for key, t in zip(keys, times):
+            action = getattr(key, "action", None)
+            label = getattr(key, "label", "")
+            if action == Action.predict_word:
+                slots.append(t)
+            elif action == Action.space:
+                space = t
+            elif action is None and len(label) == 1 and label.isalpha():
+                letters.setdefault(label.lower(), t)
+        return cls(letters, slots, space)
+
+    def typing_time(self, text: str) -> float:
+        """Seconds to type ``text`` key by key, ignoring prediction keys."""
+        return sum(self.letter_times.get(c, self.missing_letter_time) for c in text)
+
+    def savings(self, prefix: str, word: str, slot: int = 0) -> float:
+        """Seconds saved by picking ``word`` from word slot ``slot`` after ``prefix``.
+
+        A word prediction also types the trailing space.
+        """
+        if not self.word_slot_times:
+            return 0.0
+        slot_time = self.word_slot_times[min(slot, len(self.word_slot_times) - 1)]
+        typed = self.typing_time(word[len(prefix) :]) + self.space_time
+        return typed - slot_time
+
+
+__all__ = ["ScanCostModel", "key_times"]
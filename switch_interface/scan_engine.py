@@ -38,6 +38,16 @@ class Scanner:
             self.keyboard.root.after_cancel(self._after_id)
             self._after_id = None
 
+    def step(self) -> None:
+        """Advance the highlight now instead of waiting out the dwell.
+
+        Lets a second switch drive the scan (step scanning).
+        """
+        if self._after_id is not None:
+            self.keyboard.root.after_cancel(self._after_id)
+            self._after_id = None
+        self._tick()
+
     def _tick(self) -> None:
         if not self.row_column_scan:
             idx = self.key_cursor
@@ -0,0 +1,55 @@
+"""Time and trace memory of the calibration baseline on a synthetic clip.
+
+Runs ``auto_calibration._rolling_baseline`` on ``--seconds`` of noisy switch
+audio at ``--samplerate`` and reports wall time and the peak memory
+allocated (as traced by :mod:`tracemalloc`).  ``--compare`` also runs the
+former ``np.quantile`` over ``sliding_window_view`` version, whose peak
+grows with clip length times the sample rate, so keep such clips short.
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.ndimage import uniform_filter1d
+
+from switch_interface.auto_calibration import _rolling_baseline
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--seconds", type=float, default=60.0)
+parser.add_argument("--samplerate", type=int, default=48_000)
+parser.add_argument("--compare", action="store_true")
+args = parser.parse_args()
+
+fs = args.samplerate
+rng = np.random.default_rng(0)
+clip = 0.01 * rng.standard_normal(int(args.seconds * fs)).astype(np.float32)
+for start in rng.integers(0, len(clip) - fs // 10, size=int(args.seconds)):
+    clip[start : start + fs // 20] -= 0.5
+
+
+def windowed(raw: np.ndarray, fs: int) -> np.ndarray:
+    base = np.quantile(sliding_window_view(raw, fs), 0.80, axis=-1)
+    base = uniform_filter1d(base, size=fs, mode="nearest")
+    return np.pad(base, (fs - 1, 0), mode="edge")[: raw.size].astype(raw.dtype)
+
+
+benches = [("rank filter", _rolling_baseline)]
+if args.compare:
+    benches.append(("window view", windowed))
+
+print(f"{args.seconds:g} s at {fs} Hz ({clip.nbytes / 1e6:.1f} MB clip)")
+results = []
+for name, func in benches:
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    results.append(func(clip, fs))
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:>12}: {elapsed:7.3f} s, peak {peak / 1e6:9.1f} MB allocated")
+
+if len(results) == 2:
+    print(f"max difference {np.abs(results[0] - results[1]).max():.3g}")
@@ -0,0 +1,109 @@
+"""Compare the per-block cost of ``detect_edges`` and ``EdgeDetector``.
+
+With ``--channels`` above one, also compares one ``EdgeDetector`` per
+channel against a single ``MultiEdgeDetector``; with ``--decimate-to`` it
+also times an ``EdgeDetector`` behind a ``Decimator``.
+
+Feeds ten seconds of synthetic switch audio through each detector at the
+given block size and reports the time per block and the peak memory
+allocated while doing so (as traced by :mod:`tracemalloc`).
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from switch_interface.audio.decimate import Decimator, decimation_factor
+from switch_interface.detection import (
+    EdgeDetector,
+    EdgeState,
+    MultiEdgeDetector,
+    detect_edges,
+)
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--blocksize", type=int, default=64)
+parser.add_argument("--samplerate", type=int, default=44_100)
+parser.add_argument("--channels", type=int, default=1)
+parser.add_argument("--decimate-to", type=int)
+args = parser.parse_args()
+
+rng = np.random.default_rng(0)
+signal = 0.05 * rng.standard_normal(10 * args.samplerate).astype(np.float32)
+for start in rng.integers(0, len(signal) - 2000, size=30):
+    signal[start : start + 2000] -= 1.0
+blocks = [
+    signal[i : i + args.blocksize]
+    for i in range(0, len(signal) - args.blocksize + 1, args.blocksize)
+]
+refractory = int(0.04 * args.samplerate)
+
+
+def run_function() -> None:
+    state = EdgeState(armed=True, cooldown=0)
+    for block in blocks:
+        state, _ = detect_edges(block, state, -0.2, -0.5, refractory)
+
+
+detector = EdgeDetector(-0.2, -0.5, refractory)
+
+
+def run_detector() -> None:
+    for block in blocks:
+        detector.process(block)
+
+
+benches = [("detect_edges", run_function), ("EdgeDetector", run_detector)]
+
+if args.channels > 1:
+    # each channel gets the signal shifted so presses fall in different blocks
+    frames = np.stack(
+        [np.roll(signal, 997 * c) for c in range(args.channels)], axis=1
+    )
+    frame_blocks = [
+        frames[i : i + args.blocksize]
+        for i in range(0, len(frames) - args.blocksize + 1, args.blocksize)
+    ]
+    channel_blocks = [
+        [np.ascontiguousarray(b[:, c]) for c in range(args.channels)]
+        for b in frame_blocks
+    ]
+    per_channel = [EdgeDetector(-0.2, -0.5, refractory) for _ in range(args.channels)]
+    multi = MultiEdgeDetector(-0.2, -0.5, refractory, args.channels)
+
+    def run_per_channel() -> None:
+        for columns in channel_blocks:
+            for det, column in zip(per_channel, columns):
+                det.process_all(column)
+
+    def run_multi() -> None:
+        for block in frame_blocks:
+            multi.process_all(block)
+
+    benches += [("per channel", run_per_channel), ("MultiEdge", run_multi)]
+
+if args.decimate_to:
+    factor = decimation_factor(args.samplerate, args.decimate_to)
+    decimator = Decimator(factor)
+    decimated = EdgeDetector(-0.2, -0.5, int(0.04 * args.samplerate / factor))
+
+    def run_decimated() -> None:
+        for block in blocks:
+            decimated.process_all(decimator.process(block))
+
+    benches.append((f"decimated/{factor}", run_decimated))
+
+for name, func in benches:
+    func()  # warm up
+    t0 = time.perf_counter()
+    func()
+    per_block = (time.perf_counter() - t0) / len(blocks) * 1e6
+
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:>13}: {per_block:6.2f} µs/block, peak {peak - base:6d} B allocated")
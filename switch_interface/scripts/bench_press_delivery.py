@@ -0,0 +1,83 @@
+"""Measure switch-to-highlight latency through press delivery and the scanner.
+
+A background thread posts presses at random intervals, as ``listen`` does.
+On the Tk thread each press runs :meth:`Scanner.on_press` on the default
+layout, and the time from ``post`` until ``on_press`` has moved the
+highlight is recorded.  Runs once with the ``<<SwitchPress>>`` virtual event
+and once polling every 10 ms (the previous behaviour) and prints the median
+and 95th percentile.  Pass ``--max-median-ms`` to fail when the virtual
+event median exceeds a budget.  Needs a display.
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import threading
+import time
+
+from switch_interface.kb_gui import VirtualKeyboard
+from switch_interface.kb_layout_io import load_keyboard
+from switch_interface.modifier_state import ModifierState
+from switch_interface.predictive import Predictor
+from switch_interface.press_delivery import PressDelivery
+from switch_interface.scan_engine import Scanner
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--presses", type=int, default=200)
+parser.add_argument("--max-median-ms", type=float, default=None)
+args = parser.parse_args()
+
+# A tiny vocabulary keeps model building out of the measurement.
+predictor = Predictor(["the", "there", "then", "hello", "help"], cache_dir=None)
+
+
+def measure(poll_ms: int | None) -> list[float]:
+    vk = VirtualKeyboard(
+        load_keyboard(),
+        on_key=lambda key: None,
+        state=ModifierState(),
+        predictor=predictor,
+    )
+    vk.root.withdraw()
+    scanner = Scanner(vk, dwell=0.6)
+    scanner.start()
+    latencies: list[float] = []
+
+    def on_press(timestamp: float) -> None:
+        scanner.on_press()
+        latencies.append((time.perf_counter() - timestamp) * 1000)
+        if len(latencies) == args.presses:
+            vk.root.after_idle(vk.root.quit)
+
+    delivery = PressDelivery(vk.root, on_press, poll_ms=poll_ms)
+    if poll_ms is None and not delivery.event_driven:
+        print("Tcl is not thread-enabled; the event path falls back to polling")
+
+    def produce() -> None:
+        for _ in range(args.presses):
+            time.sleep(random.uniform(0.005, 0.03))
+            delivery.post(time.perf_counter())
+
+    vk.root.after(100, threading.Thread(target=produce, daemon=True).start)
+    vk.root.mainloop()
+    scanner.stop()
+    vk.root.destroy()
+    return latencies
+
+
+medians = {}
+for name, poll_ms in (("virtual event", None), ("10 ms polling", 10)):
+    lat = sorted(measure(poll_ms))
+    p95 = lat[int(0.95 * (len(lat) - 1))]
+    medians[name] = statistics.median(lat)
+    print(
+        f"{name:>13}: post -> Scanner.on_press done: "
+        f"median {medians[name]:6.3f} ms, p95 {p95:6.3f} ms"
+    )
+budget = args.max_median_ms
+if budget is not None and medians["virtual event"] > budget:
+    sys.exit(
+        f"press delivery median {medians['virtual event']:.3f} ms "
+        f"exceeds budget of {budget:.3f} ms"
+    )
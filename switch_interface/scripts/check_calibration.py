@@ -1,22 +1,24 @@
 from pathlib import Path
 
 import numpy as np
-from switch_interface.auto_calibration import calibrate, _count_events
+from switch_interface.auto_calibration import calibrate, _has_duplicates
+from switch_interface.replay import load_clip, replay, score
 
 ROOT = Path(__file__).resolve().parents[2]
 CLIP = ROOT / "tests" / "data" / "calibration_long.npy"
 FS = 48_000
 
-data = np.load(str(CLIP))
+data, _ = load_clip(CLIP)
 cfg  = calibrate(data, fs=FS, target_presses=50, verbose=True)   # prints DEBUG info
-gt   = _count_events(data, FS,
-                     cfg.upper_offset, cfg.lower_offset, debounce_ms=8)
-from switch_interface.auto_calibration import _has_duplicates
 assert len(cfg.events) == 50
 assert not _has_duplicates(cfg.events, cfg.debounce_ms, FS)
 
-precision = 1.0                                # by design, no false+
-recall    = len(cfg.events) / len(gt)
+# reference: the live detector path with a short debounce
+gt = replay(data, FS, blocksize=64,
+            upper_offset=cfg.upper_offset, lower_offset=cfg.lower_offset,
+            debounce_ms=8)
+s = score(np.asarray(cfg.events) / FS, gt.presses, tolerance=0.005)
 
-print(f"\nPrecision: {precision:.3f}  Recall: {recall:.3f}")
+print(f"\nPrecision: {s.precision:.3f}  Recall: {s.recall:.3f}  "
+      f"({gt.realtime_factor:,.0f}x real time)")
 print(cfg)
@@ -0,0 +1,33 @@
+"""Measure the cold-start time of ``python -m switch_interface``.
+
+``--help`` performs every import the real entry point does before the first
+window appears, then exits, so its wall time tracks start-up cost without a
+display or an audio device.  Pass ``--max-ms`` to fail when the median
+exceeds a budget.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--runs", type=int, default=5)
+parser.add_argument("--max-ms", type=float, default=None)
+args = parser.parse_args()
+
+timings: list[float] = []
+for _ in range(args.runs):
+    t0 = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "switch_interface", "--help"],
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    timings.append((time.perf_counter() - t0) * 1000)
+
+median = statistics.median(timings)
+print(f"cold start: median {median:.0f} ms  (min {min(timings):.0f}, max {max(timings):.0f}, n={args.runs})")
+if args.max_ms is not None and median > args.max_ms:
+    sys.exit(f"cold start {median:.0f} ms exceeds budget of {args.max_ms:.0f} ms")
@@ -1,18 +1,34 @@
+import queue
 import numpy as np, sounddevice as sd, time
-from switch_interface.auto_calibration import calibrate
 from switch_interface.detection import listen
+from switch_interface.online_calibration import OnlineCalibrator
 
 FS = 48_000
-TARGET = 15
-print(f"▶  Press the switch exactly {TARGET} times …")
-rec = sd.rec(int(17 * FS), samplerate=FS, channels=1, dtype="int16")
-sd.wait()
-samples = rec[:, 0].astype("float32") / 32768.0
-cfg  = calibrate(samples, fs=FS, target_presses=TARGET, verbose=True)
+MAX_SECONDS = 17
+print(f"▶  Press the switch until the estimate settles (at most {MAX_SECONDS} s) …")
+blocks: queue.Queue = queue.Queue()
+calib = OnlineCalibrator(FS)
+with sd.InputStream(samplerate=FS, blocksize=64, channels=1, dtype="float32",
+                    callback=lambda indata, *_: blocks.put(indata[:, 0].copy())):
+    deadline = time.monotonic() + MAX_SECONDS
+    while calib.n < MAX_SECONDS * FS and not calib.converged:
+        try:
+            block = blocks.get(timeout=max(deadline - time.monotonic(), 0.1))
+        except queue.Empty:
+            print("  no audio from the input; stopping")
+            break
+        est = calib.feed(block)
+        if est is not None:
+            print(f"  {est.presses:2d} presses  up={est.upper_offset:+.4f}  "
+                  f"low={est.lower_offset:+.4f}  depth={est.depth:.4f}"
+                  + ("  ✓ settled" if est.converged else ""))
+if not calib.n:
+    raise SystemExit("No audio was recorded; check the input device.")
+cfg = calib.result(target_presses=calib.presses)
 
 print("\n▶  Real-time listening (Ctrl-C to stop). Press the switch at will.")
-def on_press():
-    print("PRESS", round(time.time(), 3))
+def on_press(timestamp):
+    print("PRESS", round(time.time(), 3), f"(lag {time.perf_counter() - timestamp:.4f}s)")
 
 listen(
     on_press,
@@ -0,0 +1,299 @@
+"""Bounded records of the words a user actually types.
+
+:class:`UserVocabulary` keeps decaying per-word counts and
+:class:`WordBigrams` counts which word follows which.  Both persist to
+append-only logs under ``~/.switch_interface/`` that are compacted once they
+hold ``compact_every`` superseded lines.
+
+UserVocabulary
+--------------
+
+Every committed word adds ``1`` to its score and scores halve every
+``half_life_days``.  Instead of rescaling all scores as time passes, each
+word stores the time-invariant key ``log2(score) + t / half_life``: ordering
+by key is ordering by current score, and ``score(t) == 2 ** (key - t /
+half_life)``.
+
+Its log holds ``word<TAB>key`` lines; the last line for a word wins.
+
+WordBigrams
+-----------
+Transitions live in fixed-size ``int32``/``float32`` arrays indexed by
+interned word ids, so memory is bounded by ``capacity`` and finding the
+successors of a word is one vectorised comparison.  Its log holds
+``prev<TAB>word<TAB>count`` lines whose counts add up.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import time
+from typing import Iterable
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+_DATA_DIR = os.path.join(os.path.expanduser("~"), ".switch_interface")
+USER_VOCAB_FILE = os.path.join(_DATA_DIR, "vocabulary.log")
+BIGRAM_FILE = os.path.join(_DATA_DIR, "bigrams.log")
+
+
+def _valid_word(word: str) -> bool:
+    return any(c.isalpha() for c in word) and "\t" not in word and "\n" not in word
+
+
+class _AppendLog:
+    """Line-oriented log file that tolerates I/O errors."""
+
+    def __init__(self, path: str | None) -> None:
+        self.path = path
+        self.lines = 0
+
+    def read(self) -> list[str]:
+        if self.path is None:
+            return []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return []
+        self.lines = len(lines)
+        return lines
+
+    def append(self, line: str) -> None:
+        if self.path is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self.lines += 1
+        except OSError as exc:
+            log.debug("Could not append to %s (%s)", self.path, exc)
+
+    def rewrite(self, lines: Iterable[str]) -> None:
+        if self.path is None:
+            return
+        tmp = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            count = 0
+            with open(tmp, "w", encoding="utf-8") as f:
+                for line in lines:
+                    f.write(line + "\n")
+                    count += 1
+            os.replace(tmp, self.path)
+            self.lines = count
+        except OSError as exc:
+            log.debug("Could not compact %s (%s)", self.path, exc)
+
+
+class UserVocabulary:
+    """Decayed word counts capped at ``capacity`` entries."""
+
+    def __init__(
+        self,
+        path: str | None = USER_VOCAB_FILE,
+        *,
+        capacity: int = 2000,
+        half_life_days: float = 14.0,
+        compact_every: int = 1000,
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be > 0")
+        if half_life_days <= 0:
+            raise ValueError("half_life_days must be > 0")
+        self.capacity = capacity
+        self.half_life = half_life_days * 86_400.0
+        self.compact_every = compact_every
+        self.path = path
+        self.keys: dict[str, float] = {}
+        self._log = _AppendLog(path)
+        self._replay()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, word: object) -> bool:
+        return word in self.keys
+
+    # ───────── scoring ─────────────────────────────────────────────────────
+    def score(self, word: str, now: float | None = None) -> float:
+        """Return the decayed count of ``word`` (``0.0`` if unknown)."""
+        key = self.keys.get(word)
+        if key is None:
+            return 0.0
+        t = time.time() if now is None else now
+        return 2.0 ** (key - t / self.half_life)
+
+    def learn(self, word: str, now: float | None = None) -> bool:
+        """Count one use of ``word``; return ``False`` if it was ignored."""
+        word = word.strip().lower()
+        if not _valid_word(word):
+            return False
+        t = time.time() if now is None else now
+        key = math.log2(self.score(word, t) + 1.0) + t / self.half_life
+        self.keys[word] = key
+        self._evict()
+        if word in self.keys:  # an evicted word must not come back on replay
+            self._append(word, key)
+        return True
+
+    def completions(
+        self, prefix: str, now: float | None = None
+    ) -> list[tuple[str, float]]:
+        """Return ``(word, score)`` for every learned word starting with ``prefix``."""
+        t = time.time() if now is None else now
+        return [
+            (w, 2.0 ** (key - t / self.half_life))
+            for w, key in self.keys.items()
+            if w.startswith(prefix)
+        ]
+
+    def top(self, k: int) -> list[str]:
+        """Return the ``k`` highest-scoring learned words."""
+        return sorted(self.keys, key=lambda w: -self.keys[w])[:k]
+
+    def _evict(self) -> None:
+        while len(self.keys) > self.capacity:
+            del self.keys[min(self.keys, key=self.keys.__getitem__)]
+
+    # ───────── persistence ─────────────────────────────────────────────────
+    def _replay(self) -> None:
+        for line in self._log.read():
+            word, _, key = line.partition("\t")
+            try:
+                self.keys[word] = float(key)
+            except ValueError:
+                log.debug("Skipping malformed vocabulary line %r", line)
+        self._evict()
+
+    def _append(self, word: str, key: float) -> None:
+        if self._log.lines - len(self.keys) >= self.compact_every:
+            self.compact()
+        else:
+            self._log.append(f"{word}\t{key!r}")
+
+    def compact(self) -> None:
+        """Rewrite the log with a single line per live word."""
+        self._log.rewrite(f"{w}\t{k!r}" for w, k in self.keys.items())
+
+
+class WordBigrams:
+    """Bounded word-to-next-word counts stored as integer-id arrays."""
+
+    def __init__(
+        self,
+        path: str | None = BIGRAM_FILE,
+        *,
+        capacity: int = 20_000,
+        compact_every: int = 5_000,
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be > 0")
+        self.path = path
+        self.capacity = capacity
+        self.compact_every = compact_every
+        self.prev_ids = np.full(capacity, -1, dtype=np.int32)
+        self.next_ids = np.full(capacity, -1, dtype=np.int32)
+        self.counts = np.zeros(capacity, dtype=np.float32)
+        self._used = 0
+        self._slots: dict[tuple[int, int], int] = {}
+        self._ids: dict[str, int] = {}
+        self._words: list[str] = []
+        self._log = _AppendLog(path)
+        self._replay()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _intern(self, word: str) -> int:
+        wid = self._ids.get(word)
+        if wid is None:
+            wid = len(self._words)
+            self._ids[word] = wid
+            self._words.append(word)
+        return wid
+
+    def _reintern(self) -> None:
+        """Drop ids no live transition refers to."""
+        live = np.unique(
+            np.concatenate((self.prev_ids[: self._used], self.next_ids[: self._used]))
+        )
+        remap = np.full(len(self._words), -1, dtype=np.int32)
+        remap[live] = np.arange(len(live), dtype=np.int32)
+        self._words = [self._words[i] for i in live.tolist()]
+        self._ids = {w: i for i, w in enumerate(self._words)}
+        used = slice(0, self._used)
+        self.prev_ids[used] = remap[self.prev_ids[used]]
+        self.next_ids[used] = remap[self.next_ids[used]]
+        self._slots = {
+            (int(p), int(n)): i
+            for i, (p, n) in enumerate(
+                zip(self.prev_ids[used].tolist(), self.next_ids[used].tolist())
+            )
+        }
+
+    def add(self, prev: str, word: str, count: float = 1.0) -> bool:
+        """Count ``count`` occurrences of ``word`` following ``prev``."""
+        prev = prev.strip().lower()
+        word = word.strip().lower()
+        if not self._add(prev, word, count):
+            return False
+        if self._log.lines - len(self._slots) >= self.compact_every:
+            self.compact()
+        else:
+            self._log.append(f"{prev}\t{word}\t{count!r}")
+        return True
+
+    def _add(self, prev: str, word: str, count: float) -> bool:
+        if not (_valid_word(prev) and _valid_word(word)):
+            return False
+        if len(self._words) + 2 > 2 * self.capacity:
+            self._reintern()
+        key = (self._intern(prev), self._intern(word))
+        slot = self._slots.get(key)
+        if slot is None:
+            if self._used < self.capacity:
+                slot = self._used
+                self._used += 1
+            else:
+                slot = int(np.argmin(self.counts))
+                del self._slots[
+                    (int(self.prev_ids[slot]), int(self.next_ids[slot]))
+                ]
+                self.counts[slot] = 0.0
+            self._slots[key] = slot
+            self.prev_ids[slot], self.next_ids[slot] = key
+        self.counts[slot] += count
+        return True
+
+    def successors(self, prev: str, k: int) -> list[str]:
+        """Return up to ``k`` words most often typed after ``prev``."""
+        pid = self._ids.get(prev.strip().lower())
+        if pid is None or k <= 0:
+            return []
+        slots = np.flatnonzero(self.prev_ids[: self._used] == pid)
+        order = slots[np.argsort(-self.counts[slots], kind="stable")][:k]
+        return [self._words[i] for i in self.next_ids[order].tolist()]
+
+    def _replay(self) -> None:
+        for line in self._log.read():
+            prev, word, count = (line.split("\t") + ["", "", ""])[:3]
+            try:
+                self._add(prev, word, float(count))
+            except ValueError:
+                log.debug("Skipping malformed bigram line %r", line)
+
+    def compact(self) -> None:
+        """Rewrite the log with a single line per live transition."""
+        self._log.rewrite(
+            f"{self._words[p]}\t{self._words[n]}\t{float(self.counts[slot])!r}"
+            for (p, n), slot in self._slots.items()
+        )
+
+
+__all__ = ["BIGRAM_FILE", "USER_VOCAB_FILE", "UserVocabulary", "WordBigrams"]
@@ -1,5 +1,7 @@
 import os
 import sys
+
+import pytest
 from types import SimpleNamespace
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -21,3 +23,14 @@ if 'pynput.keyboard' not in sys.modules:
     dummy = SimpleNamespace(Key=_DummyKey, Controller=_DummyController)
     sys.modules['pynput'] = SimpleNamespace(keyboard=dummy)
     sys.modules['pynput.keyboard'] = dummy
+
+
+@pytest.fixture(autouse=True)
+def _no_home_writes(tmp_path, monkeypatch):
+    """Keep the default predictor's model cache and logs out of ``~``."""
+    from switch_interface import model_cache, user_vocab
+
+    home = tmp_path / ".switch_interface"
+    monkeypatch.setattr(model_cache, "CACHE_DIR", str(home))
+    monkeypatch.setattr(user_vocab, "USER_VOCAB_FILE", str(home / "vocabulary.log"))
+    monkeypatch.setattr(user_vocab, "BIGRAM_FILE", str(home / "bigrams.log"))
@@ -2,10 +2,18 @@ import sys
 from types import SimpleNamespace
 
 import numpy as np
+import pytest
+from numpy.lib.stride_tricks import sliding_window_view
 
 sys.modules.setdefault("sounddevice", SimpleNamespace())
 
-from switch_interface.auto_calibration import _rolling_baseline, _choose_thresholds
+from switch_interface.auto_calibration import (
+    _ClipBlocks,
+    _choose_thresholds,
+    _rolling_baseline,
+    _rolling_quantile,
+)
+from switch_interface.detection import EdgeDetector, bias_decay
 
 
 def test_rolling_baseline_constant():
@@ -18,6 +26,15 @@ def test_rolling_baseline_constant():
     assert np.allclose(new, old)
 
 
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+@pytest.mark.parametrize("win_len", [1, 6, 101, 1000])
+@pytest.mark.parametrize("q", [0.0, 0.5, 0.8, 1.0])
+def test_rolling_quantile_matches_windowed_quantile(dtype, win_len, q):
+    raw = np.random.default_rng(win_len).standard_normal(3000).astype(dtype)
+    expected = np.quantile(sliding_window_view(raw, win_len), q, axis=-1)
+    assert np.array_equal(_rolling_quantile(raw, win_len, q), expected)
+
+
 def test_rolling_baseline_ramp():
     fs = 1000
     t = np.arange(fs * 5)
@@ -44,3 +61,34 @@ def test_offsets_preserved():
     troughs = raw[trough_idx] if trough_idx.size else np.array([raw.min()])
     expected = -0.40 * (med - np.median(troughs))
     assert abs((up - med) - expected) < 1e-6
+
+
+def _runtime_presses(samples, upper, lower, refractory, block, decay):
+    detector = EdgeDetector(upper, lower, refractory, bias_decay=decay)
+    presses = []
+    for start in range(0, len(samples) - block + 1, block):
+        count = detector.process_all(samples[start : start + block])
+        presses.extend([start] * count)
+    return presses
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+@pytest.mark.parametrize("block", [16, 64, 100])
+def test_clip_blocks_match_runtime_detector(dtype, block):
+    rng = np.random.default_rng(block)
+    for _ in range(30):
+        n = int(rng.integers(1, 4000))
+        # presses as held steps, plus noise that crosses on its own
+        steps = rng.choice([0.0, 0.8, -0.5], size=n // 20 + 1)
+        raw = np.repeat(steps, 20)[:n] + rng.normal(0, 0.1, n)
+        raw = raw.astype(dtype)
+        # time constants from a few blocks to far longer than the clip
+        decay = bias_decay(float(rng.uniform(5, 2000)), 1000)
+        clip = _ClipBlocks(raw, block, decay)
+        for _ in range(5):
+            upper = float(rng.uniform(0, 0.6))
+            lower = -float(rng.uniform(0, 0.6))
+            refractory = int(rng.integers(0, 300))
+            assert clip.events(upper, lower, refractory) == _runtime_presses(
+                raw, upper, lower, refractory, block, decay
+            )
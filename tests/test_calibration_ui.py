@@ -181,3 +181,28 @@ def test_calibrate_canvas_and_stream(monkeypatch):
     assert isinstance(res, calibration.DetectorConfig)
     assert DummyTk.instance.canvas is not None
     assert len(calls) == 1
+
+
+def test_preview_detector_tracks_bias_like_runtime(monkeypatch):
+    _setup_dummy_tk(monkeypatch)
+    calls = _setup_dummy_sd(monkeypatch)
+    monkeypatch.setattr(
+        "switch_interface.audio.backends.wasapi.get_extra_settings",
+        lambda: None,
+    )
+    import switch_interface.calibration as calibration
+    from switch_interface.detection import bias_decay
+
+    importlib.reload(calibration)
+    detectors = []
+
+    class RecordingDetector(calibration.EdgeDetector):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            detectors.append(self)
+
+    monkeypatch.setattr(calibration, "EdgeDetector", RecordingDetector)
+    config = calibration.DetectorConfig(samplerate=8000, bias_time_constant_ms=50.0)
+    calibration.calibrate(config)
+    assert detectors[0].bias_decay == pytest.approx(bias_decay(50.0, 8000))
+    assert calls[0]["samplerate"] == 8000
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from switch_interface.audio.decimate import Decimator, decimation_factor
+
+
+def _stream(decimator, signal, blocksize):
+    return np.concatenate(
+        [
+            decimator.process(signal[start : start + blocksize]).copy()
+            for start in range(0, len(signal), blocksize)
+        ]
+    )
+
+
+@pytest.mark.parametrize("blocksize", [1, 7, 64, 253, 5000])
+def test_output_does_not_depend_on_block_size(blocksize):
+    signal = np.random.default_rng(0).standard_normal(5000).astype(np.float32)
+    assert (_stream(Decimator(11), signal, blocksize) == signal[::11]).all()
+
+
+def test_channels_keep_the_same_samples():
+    signal = np.random.default_rng(1).standard_normal(2000).astype(np.float32)
+    frames = np.stack([signal, -signal], axis=1)
+    out = _stream(Decimator(4), frames, 100)
+    assert (out == frames[::4]).all()
+
+
+def test_source_index_maps_outputs_back_to_input():
+    decimator = Decimator(12)
+    decimator.process(np.zeros(100, dtype=np.float32))
+    decimator.process(np.zeros(100, dtype=np.float32))
+    # outputs sit on input samples 0, 12, ..., 108 is the first in block two
+    assert decimator.first == 8
+    assert decimator.source_index(2) == 32
+    assert decimation_factor(44_100, 4000) == 11
+    assert decimation_factor(8000, 16_000) == 1
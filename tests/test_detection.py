@@ -0,0 +1,241 @@
+import sys
+import threading
+from dataclasses import replace
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+sys.modules.setdefault("sounddevice", SimpleNamespace())
+
+from switch_interface.audio.wakeup import Wakeup
+from switch_interface.detection import (
+    EdgeDetector,
+    EdgeState,
+    MultiEdgeDetector,
+    _block_time,
+    bias_decay,
+    detect_edges,
+    detect_presses,
+)
+
+
+def _taps(starts, length=4096, width=50):
+    signal = np.zeros(length, dtype=np.float32)
+    for s in starts:
+        signal[s : s + width] = -1.0
+    return signal
+
+
+def _run(signal, blocksize, refractory):
+    state = EdgeState(armed=True, cooldown=0)
+    found = []
+    for start in range(0, len(signal), blocksize):
+        state, idx = detect_presses(
+            signal[start : start + blocksize], state, -0.2, -0.5, refractory
+        )
+        found.extend((idx + start).tolist())
+    return found
+
+
+def test_double_tap_in_one_block_is_not_merged():
+    signal = _taps([100, 400], length=2048)
+    state, idx = detect_presses(signal, EdgeState(True, 0), -0.2, -0.5, 200)
+    assert idx.tolist() == [100, 400]
+
+    _, pressed = detect_edges(signal, EdgeState(True, 0), -0.2, -0.5, 200)
+    assert pressed  # but only once
+
+
+@pytest.mark.parametrize("blocksize", [1, 7, 64, 256, 2048, 4096])
+def test_press_offsets_do_not_depend_on_block_size(blocksize):
+    # 1500 follows 1400 inside the refractory period and must be dropped
+    signal = _taps([100, 400, 1400, 1500, 3000])
+    assert _run(signal, blocksize, refractory=200) == [100, 400, 1400, 3000]
+
+
+def test_bounce_within_refractory_period_is_ignored():
+    signal = _taps([500, 530, 560], width=10)
+    assert _run(signal, 64, refractory=100) == [500]
+
+
+def test_block_time_uses_adc_clock():
+    info = SimpleNamespace(inputBufferAdcTime=10.0, currentTime=10.5)
+    t = _block_time(info, 1000, 1000)
+    fallback = _block_time(None, 1000, 1000)
+    assert fallback == pytest.approx(t - 0.5, abs=0.05)
+
+
+def _noisy_taps(seed, length=20_000):
+    rng = np.random.default_rng(seed)
+    signal = 0.05 * rng.standard_normal(length).astype(np.float32)
+    for s in rng.integers(0, length - 200, size=40):
+        signal[s : s + rng.integers(5, 150)] -= 1.0
+    return signal
+
+
+@pytest.mark.parametrize("decay", [None, 0.999])
+@pytest.mark.parametrize("blocksize", [3, 16, 64, 333, 2048])
+def test_edge_detector_matches_functions(blocksize, decay):
+    signal = _noisy_taps(blocksize)
+    refractory = 90
+    state = EdgeState(armed=True, cooldown=0)
+    all_state = EdgeState(armed=True, cooldown=0)
+    single = EdgeDetector(-0.2, -0.5, refractory, bias_decay=decay)
+    multi = EdgeDetector(-0.2, -0.5, refractory, bias_decay=decay)
+    for start in range(0, len(signal), blocksize):
+        block = signal[start : start + blocksize]
+        state, pressed = detect_edges(block, state, -0.2, -0.5, refractory, decay)
+        press = single.process(block)
+        assert (press >= 0) == pressed
+        assert single.state == state
+
+        all_state, idx = detect_presses(
+            block, all_state, -0.2, -0.5, refractory, decay
+        )
+        count = multi.process_all(block)
+        assert multi.presses[:count].tolist() == idx.tolist()
+        assert multi.state == all_state
+
+
+def test_edge_detector_reuses_buffers():
+    detector = EdgeDetector(-0.2, -0.5, 10)
+    signal = _taps([10, 400, 1400], length=4096)
+    assert detector.process_all(signal[:64]) == 1
+    buffers = (detector._samples, detector._cross, detector.presses)
+    for start in range(64, len(signal), 64):
+        detector.process_all(signal[start : start + 64])
+    after = (detector._samples, detector._cross, detector.presses)
+    assert all(a is b for a, b in zip(after, buffers))
+
+
+@pytest.mark.parametrize("decay", [None, 0.999])
+@pytest.mark.parametrize("blocksize", [3, 64, 2048])
+def test_multi_detector_matches_one_detector_per_channel(blocksize, decay):
+    signal = np.stack([_noisy_taps(1), _noisy_taps(2), _noisy_taps(3)], axis=1)
+    uppers, lowers, refractory = [-0.2, -0.3, -0.1], [-0.5, -0.6, -0.4], [90, 10, 300]
+    multi = MultiEdgeDetector(uppers, lowers, refractory, 3, bias_decay=decay)
+    singles = [
+        EdgeDetector(u, lo, r, bias_decay=decay)
+        for u, lo, r in zip(uppers, lowers, refractory)
+    ]
+    for start in range(0, len(signal), blocksize):
+        block = signal[start : start + blocksize]
+        count = multi.process_all(block)
+        presses = multi.presses[:count].tolist()
+        assert presses == sorted(presses)
+        got = list(zip(multi.switches[:count].tolist(), presses))
+        expected = []
+        for ch, single in enumerate(singles):
+            n = single.process_all(np.ascontiguousarray(block[:, ch]))
+            expected.extend((ch, int(i)) for i in single.presses[:n])
+            state = multi.state(ch)
+            assert state.bias == pytest.approx(single.state.bias, rel=1e-4, abs=1e-7)
+            assert replace(state, bias=0.0) == replace(single.state, bias=0.0)
+        assert sorted(got) == sorted(expected)
+
+
+def test_multi_detector_dip_between_channel_thresholds():
+    # the dip crosses channel 0's lower threshold but not channel 1's
+    signal = np.zeros((256, 2), dtype=np.float32)
+    signal[100:140] = -0.45
+    multi = MultiEdgeDetector([-0.1, -0.3], [-0.4, -0.6], [10, 10], 2)
+    single = EdgeDetector(-0.1, -0.4, 10)
+    count = multi.process_all(signal[:128])
+    n = single.process_all(np.ascontiguousarray(signal[:128, 0]))
+    assert multi.switches[:count].tolist() == [0]
+    assert multi.presses[:count].tolist() == single.presses[:n].tolist() == [100]
+
+
+def test_bias_time_constant_does_not_depend_on_block_size():
+    fs = 8000
+    decay = bias_decay(100.0, fs)
+    signal = np.full(fs, 0.5, dtype=np.float32)  # step from the 0.0 start
+
+    ends = {}
+    for blocksize in (1, 50, 2000):
+        state = EdgeState(armed=True, cooldown=0)
+        for start in range(0, fs, blocksize):
+            block = signal[start : start + blocksize]
+            state, _ = detect_presses(block, state, -0.2, -0.5, 10, decay)
+            if start + blocksize == 4000:
+                ends[blocksize] = state.bias
+    assert ends[1] == pytest.approx(ends[50]) == pytest.approx(ends[2000])
+    # half a second is five time constants
+    assert ends[50] == pytest.approx(0.5 * (1 - np.exp(-5)))
+
+
+def test_presses_on_drifting_baseline_match_across_block_sizes():
+    fs = 8000
+    decay = bias_decay(200.0, fs)
+    t = np.arange(4 * fs)
+    signal = (0.3 * np.sin(2 * np.pi * t / (3 * fs))).astype(np.float32)
+    for s in (3000, 9000, 15000, 24000):
+        signal[s : s + 400] -= 1.0
+
+    found = []
+    for blocksize in (32, 1024):
+        detector = EdgeDetector(-0.2, -0.5, 80, bias_decay=decay)
+        presses = []
+        for start in range(0, len(signal), blocksize):
+            count = detector.process_all(signal[start : start + blocksize])
+            presses.extend((detector.presses[:count] + start).tolist())
+        found.append(presses)
+    assert found[0] == found[1] == [3000, 9000, 15000, 24000]
+
+
+def test_listen_detects_presses_off_the_audio_callback(monkeypatch):
+    import importlib
+
+    from switch_interface.audio.ring import SampleRing
+
+    streams = []
+
+    class InputStream:
+        def __init__(self, **kwargs):
+            self.callback = kwargs["callback"]
+            streams.append(self)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    sd_mod = SimpleNamespace(
+        InputStream=InputStream,
+        PortAudioError=RuntimeError,
+        query_hostapis=lambda idx: {"name": "ALSA"},
+        default=SimpleNamespace(hostapi=0),
+    )
+    monkeypatch.setitem(sys.modules, "sounddevice", sd_mod)
+    import switch_interface.audio.backends.wasapi as wasapi
+    import switch_interface.detection as detection
+
+    importlib.reload(wasapi)
+    importlib.reload(detection)
+
+    signal = _taps([10, 100], length=256)[:, None]
+    info = SimpleNamespace(inputBufferAdcTime=5.0, currentTime=5.0)
+    sleeps = iter([False, True])
+
+    def fake_sleep(_):
+        if next(sleeps):
+            raise KeyboardInterrupt
+        streams[0].callback(signal[:128], 128, info, 0)
+        streams[0].callback(signal[128:], 128, info, 0)
+
+    class SteppedWakeup(Wakeup):
+        def wait(self, timeout=None):
+            fake_sleep(timeout)
+            return super().wait(0)
+
+    monkeypatch.setattr(detection, "Wakeup", SteppedWakeup)
+    presses = []
+    ring = SampleRing(1024)
+    detection.listen(
+        presses.append, samplerate=1000, blocksize=128, debounce_ms=20, ring=ring
+    )
+    assert len(presses) == 2
+    assert presses[1] - presses[0] == pytest.approx(0.09)
+    assert ring.metrics().read == 256
@@ -1,7 +1,19 @@
 import logging
 import math
+import sys
+from types import SimpleNamespace
+
 import numpy as np
-from switch_interface.auto_calibration import calibrate
+import pytest
+
+sys.modules.setdefault("sounddevice", SimpleNamespace())
+
+from switch_interface import auto_calibration
+from switch_interface.auto_calibration import (
+    CalibrationSession,
+    SweepResult,
+    calibrate,
+)
 
 
 def test_calibration_fails_on_noise(caplog):
@@ -38,3 +50,122 @@ def test_calibration_passes():
     assert res.calib_ok
     assert res.baseline_std > 0
     assert res.min_gap >= 0.25
+
+
+def _four_presses(fs):
+    raw = np.zeros(fs * 5, dtype=np.float32)
+    for idx in range(4):
+        start = (idx + 1) * fs
+        raw[start : start + fs // 20] -= 0.5
+    return raw
+
+
+def test_session_memoises_counts():
+    fs = 1000
+    session = CalibrationSession(_four_presses(fs), fs)
+    events = session.count(-0.1, -0.3, 20)
+    assert events == [960, 1984, 2944, 3968]
+    assert session.count(-0.1, -0.3, 20) is events
+    assert session.count(-0.1, -0.3, 30) == events
+
+
+def test_calibrate_reuses_a_session_passed_in():
+    fs = 1000
+    raw = _four_presses(fs)
+    session = CalibrationSession(raw, fs)
+    first = calibrate(raw, fs, target_presses=4, session=session)
+    assert session._counts
+    assert calibrate(raw.copy(), fs, target_presses=4, session=session) == first
+    assert calibrate(raw, fs, target_presses=4) == first
+
+    raw[fs // 2 : fs // 2 + fs // 20] -= 0.5
+    with pytest.raises(ValueError):
+        calibrate(raw, fs, target_presses=5, session=session)
+    assert len(calibrate(raw, fs, target_presses=5).events) == 5
+
+
+def test_sweep_prefers_the_middle_of_the_matching_region():
+    counts = np.array(
+        [
+            [9, 7, 6, 5, 5],
+            [7, 5, 5, 5, 5],
+            [5, 5, 5, 5, 5],
+            [6, 5, 5, 5, 5],
+            [7, 6, 5, 5, 4],
+        ]
+    )
+    sweep = SweepResult(
+        np.array([0.8, 0.9, 1.0, 1.1, 1.2]), np.array([10, 20, 30, 40, 50]), counts, 5
+    )
+    # scanning debounce at scale 1 would stop at 10 ms, on the region's edge
+    assert sweep.robustness()[2, 0] == 1
+    assert sweep.robustness()[2, 2] == 2
+    assert sweep.best() == (1.0, 30)
+
+
+def test_sweep_in_workers_matches_in_process():
+    fs = 1000
+    raw = _four_presses(fs)
+    raw += 0.05 * np.random.default_rng(2).standard_normal(raw.size).astype(
+        np.float32
+    )
+    kwargs = dict(debounces=[10, 30], scales=[0.5, 1.0, 2.0])
+    serial = CalibrationSession(raw, fs).sweep(-0.1, -0.3, 4, **kwargs)
+    pooled = CalibrationSession(raw, fs).sweep(-0.1, -0.3, 4, workers=2, **kwargs)
+    assert np.array_equal(pooled.counts, serial.counts)
+
+
+def test_sweep_counts_in_process_by_default(monkeypatch):
+    fs = 1000
+    used = []
+    monkeypatch.setattr(
+        CalibrationSession,
+        "_count_in_workers",
+        lambda self, *args: used.append(args[-1]),
+    )
+    session = CalibrationSession(_four_presses(fs), fs)
+    session.sweep(-0.1, -0.3, 4, debounces=[10, 30])
+    assert used == []
+    session.sweep(-0.1, -0.3, 4, debounces=[10, 30], workers=3)
+    assert used == [3]
+
+
+def test_sweep_stops_counting_cells_that_cannot_be_best():
+    fs = 1000
+    raw = _four_presses(fs)
+    raw += 0.08 * np.random.default_rng(3).standard_normal(raw.size).astype(
+        np.float32
+    )
+    session = CalibrationSession(raw, fs)
+    sweep = session.sweep(-0.1, -0.3, 4)
+    full = np.array(
+        [
+            [len(session.count(-0.1 * sc, -0.3 * sc, int(d))) for d in sweep.debounces]
+            for sc in sweep.scales.tolist()
+        ]
+    )
+    assert (sweep.counts < full).any()  # some counts were cut short
+    assert np.all(sweep.counts <= full)
+    assert np.array_equal(sweep.exact, sweep.counts == full)
+    exact = SweepResult(sweep.scales, sweep.debounces, full, 4)
+    assert np.array_equal(sweep.robustness(), exact.robustness())
+    assert sweep.best() == exact.best()
+
+
+def test_full_sweep_counts_every_cell():
+    fs = 1000
+    raw = _four_presses(fs)
+    raw += 0.08 * np.random.default_rng(3).standard_normal(raw.size).astype(
+        np.float32
+    )
+    session = CalibrationSession(raw, fs)
+    session.sweep(-0.1, -0.3, 4)  # leaves lower bounds in the memo
+    sweep = session.sweep(-0.1, -0.3, 4, full=True)
+    full = np.array(
+        [
+            [len(session.count(-0.1 * sc, -0.3 * sc, int(d))) for d in sweep.debounces]
+            for sc in sweep.scales.tolist()
+        ]
+    )
+    assert np.array_equal(sweep.counts, full)
+    assert sweep.exact is not None and sweep.exact.all()
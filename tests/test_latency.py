@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+import switch_interface.latency as latency
+from switch_interface.latency import LatencyHistogram, LatencyTracker
+
+
+def test_histogram_percentiles():
+    hist = LatencyHistogram(max_ms=100.0, resolution_ms=1.0)
+    assert hist.percentile(50) is None
+    for ms in range(1, 101):
+        hist.record(ms - 0.5)
+    hist.record(5_000.0)  # overflow
+    assert len(hist) == 101
+    assert hist.percentile(50) == pytest.approx(51.0)
+    assert hist.percentile(99) == pytest.approx(100.0)
+    assert hist.percentile(100) == 100.0
+
+
+def test_tracker_stages_and_log_line():
+    tracker = LatencyTracker(resolution_ms=1.0)
+    adc = 10.0
+    tracker.mark("detected", adc, now=adc + 0.0045)
+    tracker.handle(adc, lambda: tracker.mark_current("emitted"))
+    tracker.mark_current("emitted")  # no press in flight: ignored
+
+    summary = tracker.summary()
+    assert summary["detected"] == {"n": 1, "p50": 5.0, "p95": 5.0, "p99": 5.0}
+    assert summary["emitted"]["n"] == 1
+    assert summary["handled"]["n"] == 1
+    assert json.loads(tracker.log_line())["press_latency_ms"] == summary
+    assert "detected" in tracker.report()
+
+
+def test_handled_includes_the_scanners_work(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(latency.time, "perf_counter", lambda: now[0])
+    tracker = LatencyTracker(resolution_ms=1.0)
+
+    def scanner():
+        now[0] += 0.002
+        tracker.mark_current("emitted")
+        now[0] += 0.005  # highlight update after the key went out
+
+    now[0] = 0.0035
+    tracker.handle(0.0, scanner)
+    summary = tracker.summary()
+    medians = [summary[stage]["p50"] for stage in ("dequeued", "emitted", "handled")]
+    assert medians == [4.0, 6.0, 11.0]
+
+
+def test_handled_is_not_marked_when_the_scanner_fails():
+    tracker = LatencyTracker()
+
+    def scanner():
+        raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        tracker.handle(0.0, scanner)
+    assert tracker.summary()["handled"]["n"] == 0
+    assert tracker.current is None
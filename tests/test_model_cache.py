@@ -0,0 +1,51 @@
+import numpy as np
+
+import switch_interface.predictive as predictive
+from switch_interface import model_cache
+
+
+def test_pack_round_trip():
+    arrays = {
+        "a": np.arange(5, dtype=np.int32),
+        "b": np.linspace(0, 1, 6).reshape(2, 3),
+        "empty": np.zeros(0, dtype=np.uint8),
+    }
+    meta, out = model_cache.unpack(model_cache.pack({"lang": "en"}, arrays))
+    assert meta == {"lang": "en"}
+    for name, arr in arrays.items():
+        assert out[name].dtype == arr.dtype
+        assert np.array_equal(out[name], arr)
+
+
+def test_load_rejects_stale_meta(tmp_path):
+    path = str(tmp_path / "model.bin")
+    model_cache.save(path, {"n_words": 10}, {"x": np.ones(3)})
+    assert model_cache.load(path, {"n_words": 10}) is not None
+    assert model_cache.load(path, {"n_words": 20}) is None
+    assert model_cache.load(str(tmp_path / "missing.bin"), {}) is None
+
+
+def test_predictor_warm_start_from_cache(tmp_path, monkeypatch):
+    words = ["the", "then", "there", "that", "cat", "cart"]
+    calls = []
+
+    def fake_top_n_list(lang, n):
+        calls.append((lang, n))
+        return words
+
+    monkeypatch.setattr(predictive, "top_n_list", fake_top_n_list)
+    cold = predictive.Predictor(n_words=6, cache_dir=str(tmp_path))
+    cold.suggest_letters("th")
+    cold.thread.join()
+    assert (tmp_path / "predictor-en-6.bin").exists()
+
+    warm = predictive.Predictor(n_words=6, cache_dir=str(tmp_path))
+    assert calls == [("en", 6)]
+    assert warm.ready and warm.thread is None
+    assert warm.suggest_words("th", 3) == cold.suggest_words("th", 3)
+    assert warm.suggest_letters("ca", 2) == cold.suggest_letters("ca", 2)
+    assert warm.suggest_letters("zq", 1) == cold.suggest_letters("zq", 1)
+
+    other = predictive.Predictor(n_words=5, cache_dir=str(tmp_path))
+    assert calls[-1] == ("en", 5)
+    assert not other.ready
@@ -0,0 +1,108 @@
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+sys.modules.setdefault("sounddevice", SimpleNamespace())
+
+from switch_interface.auto_calibration import (
+    _choose_thresholds,
+    _rolling_baseline,
+    calibrate,
+)
+import switch_interface.auto_calibration as auto_calibration
+import switch_interface.online_calibration as online_calibration
+from switch_interface.online_calibration import OnlineCalibrator
+
+
+def _presses(fs, count, *, seed=0, noise=0.002):
+    """A quiet clip with ``count`` 50 ms presses about 0.7 s apart."""
+    rng = np.random.default_rng(seed)
+    raw = noise * rng.standard_normal(int(fs * (1.5 + 0.7 * count)))
+    starts = (fs * (1.2 + 0.7 * np.arange(count) + rng.uniform(0, 0.1, count))).astype(
+        int
+    )
+    for start in starts:
+        raw[start : start + fs // 20] -= 0.5
+    return raw.astype(np.float32)
+
+
+def _feed(calibrator, raw, blocksize):
+    estimates = []
+    for start in range(0, len(raw), blocksize):
+        estimate = calibrator.feed(raw[start : start + blocksize])
+        if estimate is not None:
+            estimates.append(estimate)
+    return estimates
+
+
+@pytest.mark.parametrize("blocksize", [64, 100])
+def test_final_estimate_matches_batch_thresholds(blocksize):
+    fs = 1000
+    raw = _presses(fs, 10)
+    calibrator = OnlineCalibrator(fs)
+    _feed(calibrator, raw, blocksize)
+    estimate = calibrator.finish()
+
+    baseline = _rolling_baseline(raw, fs)
+    upper, lower = _choose_thresholds(raw, baseline, fs)
+    med = float(np.median(baseline))
+    assert estimate.baseline == med
+    assert estimate.upper_offset == upper - med
+    assert estimate.lower_offset == lower - med
+    assert calibrator.presses == 10
+    assert calibrator.result(target_presses=10) == calibrate(
+        raw, fs, target_presses=10, blocksize=blocksize
+    )
+
+
+def test_estimates_follow_presses_and_converge():
+    fs = 1000
+    raw = _presses(fs, 12, seed=1, noise=0.0)
+    calibrator = OnlineCalibrator(fs, min_interval=0.2)
+    estimates = _feed(calibrator, raw, 64)
+
+    # one estimate after the first second, then one per press
+    assert len(estimates) == 13
+    assert [e.presses for e in estimates[1:]] == list(range(1, 13))
+    assert not estimates[1].converged
+    assert calibrator.converged
+    settled = next(e for e in estimates if e.converged)
+    assert settled.presses < 12
+    # stopping at convergence still calibrates the presses heard so far
+    cut = int(settled.seconds * fs)
+    res = calibrate(raw[:cut], fs, target_presses=settled.presses)
+    assert len(res.events) == settled.presses
+    assert res.calib_ok
+
+
+def test_presses_before_detection_are_recounted_at_the_fed_block_size(monkeypatch):
+    fs = 1000
+    raw = _presses(fs, 4, seed=2)
+    recounts = []
+
+    class RecordingClip(online_calibration._ClipBlocks):
+        def __init__(self, samples, block, decay):
+            super().__init__(samples, block, decay)
+            recounts.append(block)
+
+    monkeypatch.setattr(online_calibration, "_ClipBlocks", RecordingClip)
+    calibrator = OnlineCalibrator(fs)
+    _feed(calibrator, raw, 100)
+    assert recounts == [100]
+    assert calibrator.presses == 4
+
+
+def test_result_reuses_the_baseline_computed_while_recording(monkeypatch):
+    fs = 1000
+    raw = _presses(fs, 4, seed=3)
+    calibrator = OnlineCalibrator(fs)
+    _feed(calibrator, raw, 64)
+    expected = calibrate(raw, fs, target_presses=4)
+
+    def recompute(*_args):
+        raise AssertionError("baseline recomputed")
+
+    monkeypatch.setattr(auto_calibration, "_rolling_baseline", recompute)
+    assert calibrator.result(target_presses=4) == expected
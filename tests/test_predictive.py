@@ -1,4 +1,8 @@
 import importlib
+import threading
+
+from wordfreq import top_n_list
+
 import switch_interface.predictive as predictive
 
 
@@ -10,10 +14,165 @@ def test_letter_suggestion():
 
 
 def test_ngram_thread_starts_on_demand(monkeypatch):
-    importlib.reload(predictive)
-    assert predictive.default_predictor.thread is None
+    predictor = predictive.Predictor(cache_dir=None)
+    assert predictor.thread is None
 
-    letters = predictive.suggest_letters("an")
+    letters = predictor.suggest_letters("an")
     assert len(letters) > 0
-    assert predictive.default_predictor.thread is not None
+    assert predictor.thread is not None
+
+
+def test_prefix_index_matches_linear_scan():
+    words = ["the", "to", "then", "there", "apple", "than", "t", "thermal", "app"]
+    predictor = predictive.Predictor(words)
+    for prefix in ["t", "th", "the", "ther", "app", "x", "T"]:
+        expected = [w for w in words if w.startswith(prefix.lower())][:3]
+        assert predictor.suggest_words(prefix, 3) == expected
+
+
+def test_prefix_index_keeps_frequency_order():
+    from switch_interface.prefix_index import PrefixIndex
+
+    words = top_n_list("en", 5000)
+    index = PrefixIndex(words)
+    for prefix in ["a", "co", "pre", "s", "zz"]:
+        expected = [w for w in words if w.startswith(prefix)][:10]
+        assert index.complete(prefix, 10) == expected
+
+
+def test_trie_letters_are_prefix_exact():
+    from collections import defaultdict
+
+    words = top_n_list("en", 3000)
+    predictor = predictive.Predictor(words)
+    for prefix in ["", "t", "th", "str", "qu"]:
+        weights: defaultdict[str, float] = defaultdict(float)
+        for rank, w in enumerate(words):
+            if w.startswith(prefix) and len(w) > len(prefix) and w[len(prefix)].isalpha():
+                weights[w[len(prefix)]] += 1.0 / (rank + 1)
+        expected = sorted(weights, key=lambda c: -weights[c])[:3]
+        assert predictor.suggest_letters(prefix, 3) == expected
+
+
+def test_out_of_vocabulary_prefix_backs_off_to_ngrams():
+    predictor = predictive.Predictor(["cat", "bat", "cart", "cot", "dog"])
+    assert predictor.trie.find("xq") == -1
+    assert predictor.suggest_letters("xq", 1) == ["c"]  # start letters
+    predictor.thread.join()
+    assert predictor.suggest_letters("xa", 1) == ["t"]  # bigram a → t
+
+
+def test_import_does_not_load_word_list(monkeypatch):
+    import wordfreq
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("word list loaded at import time")
+
+    monkeypatch.setattr(wordfreq, "top_n_list", _fail)
+    importlib.reload(predictive)
+    assert predictive._default_predictor is None
+    monkeypatch.undo()
+    importlib.reload(predictive)
+
+
+def test_background_load_serves_fallback_until_ready():
+    gate = threading.Event()
+
+    class SlowWords(list):
+        def __bool__(self):
+            gate.wait()
+            return True
+
+    predictor = predictive.Predictor(SlowWords(["hello", "help"]), background=True)
+    assert not predictor.loaded
+    assert predictor.suggest_words("he") == []
+    assert predictor.suggest_letters("he", 2) == list(predictive.FALLBACK_LETTERS[:2])
+
+    gate.set()
+    assert predictor.wait_loaded(5)
+    assert predictor.suggest_words("he") == ["hello", "help"]
+    assert predictor.suggest_letters("hel", 2) == ["l", "p"]
+
+
+def test_suggestion_caches_are_per_instance_and_bounded():
+    import gc
+    import weakref
+
+    predictor = predictive.Predictor(["apple", "apply", "ant"], cache_size=2)
+    predictor.suggest_words("ap")
+    predictor.suggest_words("ap")
+    predictor.suggest_words("an")
+    predictor.suggest_words("a")
+    info = predictor.cache_info()["words"]
+    assert (info.hits, info.misses, info.currsize) == (1, 3, 2)
+
+    predictor.thread.join()
+    ref = weakref.ref(predictor)
+    del predictor
+    gc.collect()
+    assert ref() is None
+
+
+def test_letter_cache_invalidated_when_ngrams_arrive(monkeypatch):
+    predictor = predictive.Predictor(["cat", "bat", "cot"])
+    monkeypatch.setattr(predictor, "_ensure_thread", lambda: None)
+    assert predictor.suggest_letters("xa", 1) == ["c"]  # trie start letters
+    predictor._build_ngrams()
+    assert predictor.suggest_letters("xa", 1) == ["t"]  # bigram a → t
+
+
+def test_session_matches_full_prefix_lookups():
+    predictor = predictive.Predictor(top_n_list("en", 3000))
+    session = predictor.session()
+    for step in ["t", "h", "e", "r", "<", "<", "i", "q", "<", "<", "<", "<", "<", "s"]:
+        if step == "<":
+            session.pop()
+        else:
+            session.push(step)
+        if session.prefix:
+            assert session.words(3) == predictor.suggest_words(session.prefix, 3)
+        assert session.letters(3) == predictor.suggest_letters(session.prefix, 3)
+    session.reset()
+    assert session.prefix == ""
+    assert session.words() == predictor.suggest_next_words(None) == ["the", "to", "and"]
+
+
+def test_session_catches_up_after_background_load():
+    gate = threading.Event()
+
+    class SlowWords(list):
+        def __bool__(self):
+            gate.wait()
+            return True
+
+    predictor = predictive.Predictor(SlowWords(["help", "hello"]), background=True)
+    session = predictor.session()
+    session.push("hel")
+    assert session.words() == []
+    gate.set()
+    predictor.wait_loaded(5)
+    assert session.words() == ["help", "hello"]
+    session.push("l")
+    assert session.letters(1) == ["o"]
+
+
+def test_process_build_reports_progress_and_matches_thread_build():
+    words = ["the", "there", "then", "that", "cat", "car"]
+    stages = []
+    predictor = predictive.Predictor(
+        words,
+        build_in_process=True,
+        cache_dir=None,
+        on_progress=lambda stage, fraction: stages.append((stage, fraction)),
+    )
+    assert predictor.wait_loaded(60)
+    assert predictor.ready and predictor.thread is None
+    assert stages[0] == ("starting", 0.0)
+    assert stages[-1] == ("ready", 1.0)
+    fractions = [f for _, f in stages]
+    assert fractions == sorted(fractions)
 
+    reference = predictive.Predictor(words)
+    for prefix in ["th", "ca", "x", "thx"]:
+        assert predictor.suggest_words(prefix) == reference.suggest_words(prefix)
+        assert predictor.suggest_letters(prefix) == reference.suggest_letters(prefix)
@@ -0,0 +1,81 @@
+import tkinter as tk
+
+from switch_interface.press_delivery import PRESS_EVENT, PressDelivery
+
+
+class DummyRoot:
+    def __init__(self, threaded=True):
+        self.bindings = {}
+        self.scheduled = []
+        self.generated = []
+        self.tk = self
+        self.threaded = threaded
+
+    def call(self, *args):
+        if args[:2] == ("info", "exists"):
+            return 1 if self.threaded else 0
+        raise tk.TclError("unexpected call")
+
+    def bind(self, sequence, func):
+        self.bindings[sequence] = func
+
+    def after(self, ms, func):
+        self.scheduled.append((ms, func))
+
+    def after_idle(self, func):
+        self.scheduled.append((0, func))
+
+    def event_generate(self, sequence, when=None):
+        self.generated.append((sequence, when))
+        self.bindings[sequence](None)
+
+
+def test_presses_arrive_through_virtual_event():
+    root = DummyRoot()
+    got = []
+    delivery = PressDelivery(root, got.append)
+    assert delivery.event_driven
+    assert [ms for ms, _ in root.scheduled] == [0]  # only the idle flush
+
+    delivery.post(1.5)
+    delivery.post(2.5)
+    assert got == [1.5, 2.5]
+    assert root.generated == [(PRESS_EVENT, "tail")] * 2
+
+
+def test_signal_failure_keeps_press_queued():
+    root = DummyRoot()
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("main thread is not in main loop")
+
+    got = []
+    delivery = PressDelivery(root, got.append)
+    root.event_generate = fail
+    delivery.post(1.0)
+    assert got == []
+    root.scheduled[0][1]()  # idle flush once the loop runs
+    assert got == [1.0]
+
+
+def test_unthreaded_tcl_falls_back_to_polling():
+    root = DummyRoot(threaded=False)
+    got = []
+    delivery = PressDelivery(root, got.append)
+    assert not delivery.event_driven
+    delivery.post(3.0)
+    assert got == [] and not root.generated
+    ms, poll = root.scheduled.pop()
+    poll()
+    assert ms == 10 and got == [3.0]
+    assert len(root.scheduled) == 1  # re-armed
+
+
+def test_deliveries_on_one_root_use_their_own_events():
+    root = DummyRoot()
+    selects, steps = [], []
+    select = PressDelivery(root, selects.append)
+    step = PressDelivery(root, steps.append, event="<<SwitchStep>>")
+    select.post(1.0)
+    step.post(2.0)
+    assert (selects, steps) == ([1.0], [2.0])
@@ -0,0 +1,107 @@
+import sys
+import wave
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+sys.modules.setdefault("sounddevice", SimpleNamespace())
+
+from switch_interface.auto_calibration import calibrate
+from switch_interface.detection import make_detector
+from switch_interface.replay import load_clip, load_labels, main, replay, score
+
+FS = 8000
+PRESSES = [0.25, 0.5, 0.55, 1.2, 1.9]
+
+
+def _clip():
+    rng = np.random.default_rng(1)
+    samples = 0.02 * rng.standard_normal(2 * FS)
+    for t in PRESSES:
+        i = int(t * FS)
+        samples[i : i + 200] -= 0.9
+    return samples.astype(np.float32)
+
+
+@pytest.mark.parametrize("blocksize", [32, 256, 2048])
+def test_replay_finds_presses_at_any_block_size(blocksize):
+    result = replay(_clip(), FS, blocksize=blocksize, debounce_ms=20)
+    # the 1.9 s press falls in the unprocessed partial block at 2048
+    s = score(result.presses, PRESSES[: 4 if blocksize == 2048 else 5], 0.002)
+    assert (s.precision, s.recall) == (1.0, 1.0)
+    assert result.realtime_factor > 1
+
+
+def test_replay_matches_the_streaming_detector():
+    clip = _clip()
+    detector = make_detector(
+        upper_offset=-0.2, lower_offset=-0.5, samplerate=FS, debounce_ms=20
+    )
+    expected = []
+    for start in range(0, len(clip) - len(clip) % 64, 64):
+        count = detector.process_all(clip[start : start + 64])
+        expected.extend((detector.presses[:count] + start) / FS)
+    result = replay(clip, FS, blocksize=64, debounce_ms=20)
+    assert result.presses.tolist() == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("blocksize", [64, 256])
+def test_calibration_counts_the_presses_replay_finds(blocksize):
+    clip = _clip()
+    res = calibrate(clip, FS, target_presses=len(PRESSES), blocksize=blocksize)
+    result = replay(
+        clip,
+        FS,
+        blocksize=blocksize,
+        upper_offset=res.upper_offset,
+        lower_offset=res.lower_offset,
+        debounce_ms=res.debounce_ms,
+    )
+    assert len(result.presses) == len(PRESSES)
+    # calibrate reports the block each press was detected in
+    blocks = np.rint(result.presses * FS).astype(int) // blocksize * blocksize
+    assert res.events == blocks.tolist()
+
+
+@pytest.mark.parametrize("blocksize", [32, 256])
+def test_replay_with_decimation_finds_the_same_presses(blocksize):
+    result = replay(_clip(), FS, blocksize=blocksize, debounce_ms=20, decimate_to=1000)
+    full = replay(_clip(), FS, blocksize=blocksize, debounce_ms=20)
+    assert len(result.presses) == len(full.presses)
+    # presses are reported on the first kept sample after the edge
+    assert result.presses == pytest.approx(full.presses, abs=8 / FS)
+
+
+def test_score_counts_misses_and_false_alarms():
+    s = score([0.1, 0.5, 0.9], [0.11, 0.52, 0.7], tolerance=0.015)
+    assert (s.true_positives, s.false_positives, s.false_negatives) == (1, 2, 2)
+    assert s.precision == pytest.approx(1 / 3)
+    assert s.recall == pytest.approx(1 / 3)
+
+
+def test_load_wav_npy_and_labels(tmp_path, capsys):
+    clip = _clip()
+    pcm = (clip * 32767).astype("<i2")
+    wav_path = tmp_path / "clip.wav"
+    with wave.open(str(wav_path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(FS)
+        wav.writeframes(pcm.tobytes())
+    samples, rate = load_clip(wav_path)
+    assert rate == FS
+    assert np.allclose(samples, clip, atol=1e-4)
+
+    np.save(tmp_path / "clip.npy", pcm)
+    samples, rate = load_clip(tmp_path / "clip.npy")
+    assert rate is None and np.allclose(samples, clip, atol=1e-4)
+
+    labels = tmp_path / "clip.txt"
+    labels.write_text("\n".join(map(str, PRESSES)))
+    assert load_labels(labels).tolist() == PRESSES
+
+    main([str(wav_path), "--labels", str(labels), "--blocksize", "64", "512"])
+    out = capsys.readouterr().out.splitlines()
+    assert len(out) == 2
+    assert all("precision 1.000, recall 1.000" in line for line in out)
@@ -0,0 +1,65 @@
+import threading
+
+import numpy as np
+
+from switch_interface.audio.ring import SampleRing
+
+
+def test_capacity_rounds_up_and_wraps():
+    ring = SampleRing(6)
+    assert ring.capacity == 8
+    out = np.zeros(5, dtype=np.float32)
+    for start in range(0, 40, 5):
+        assert ring.write(np.arange(start, start + 5, dtype=np.float32))
+        assert ring.read_into(out) == 5
+        assert out.tolist() == list(range(start, start + 5))
+    assert len(ring) == 0
+
+
+def test_overrun_drops_whole_block_and_is_counted():
+    ring = SampleRing(8)
+    assert ring.write(np.ones(6, dtype=np.float32))
+    assert not ring.write(np.ones(4, dtype=np.float32))
+    metrics = ring.metrics()
+    assert (metrics.overruns, metrics.dropped, metrics.high_water) == (1, 4, 6)
+    assert len(ring) == 6
+
+
+def test_anchor_timestamps_samples():
+    ring = SampleRing(16)
+    ring.write(np.zeros(4, dtype=np.float32), timestamp=1.0)
+    ring.write(np.zeros(4, dtype=np.float32), timestamp=1.5)
+    assert ring.time_of(6, samplerate=8) == 1.75
+    assert ring.time_of(0, samplerate=8) == 1.0
+
+
+def test_multichannel_frames_wrap_together():
+    ring = SampleRing(8, channels=2)
+    out = np.zeros((3, 2), dtype=np.float32)
+    for start in range(0, 30, 3):
+        frames = np.arange(2 * start, 2 * start + 6, dtype=np.float32).reshape(3, 2)
+        assert ring.write(frames)
+        assert ring.read_into(out) == 3
+        assert (out == frames).all()
+
+
+def test_threaded_transfer_preserves_order():
+    ring = SampleRing(256)
+    total = 5_000
+    received: list[float] = []
+
+    def produce():
+        sent = 0
+        while sent < total:
+            chunk = np.arange(sent, min(sent + 16, total), dtype=np.float32)
+            if ring.write(chunk):
+                sent += len(chunk)
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    out = np.zeros(16, dtype=np.float32)
+    while len(received) < total:
+        n = ring.read_into(out)
+        received.extend(out[:n].tolist())
+    producer.join()
+    assert received == list(range(total))
@@ -0,0 +1,72 @@
+import types
+
+import pytest
+
+from switch_interface.key_types import Action
+from switch_interface.predictive import Predictor
+from switch_interface.scan_cost import ScanCostModel, key_times
+
+
+def _key(label, action=None, dwell_mult=None):
+    return types.SimpleNamespace(label=label, action=action, dwell_mult=dwell_mult)
+
+
+def test_key_times_linear_and_row_column():
+    keys = [_key("a"), _key("b", dwell_mult=2), _key("c"), _key("d")]
+    rows = [0, 0, 1, 1]
+    starts = [0, 2]
+    assert key_times(keys, rows, starts, 1.0) == [0.5, 2.0, 3.5, 4.5]
+    assert key_times(keys, rows, starts, 1.0, row_column=True) == [
+        1.0,
+        2.5,
+        2.0,
+        3.0,
+    ]
+
+
+def test_model_from_keyboard_finds_letters_slots_and_space():
+    keys = [
+        _key("", Action.predict_word),
+        _key("x"),
+        _key("Y"),
+        _key("space", Action.space),
+    ]
+    kb = types.SimpleNamespace(
+        key_widgets=[(None, k) for k in keys],
+        row_indices=[0, 0, 0, 0],
+        row_start_indices=[0],
+    )
+    model = ScanCostModel.from_keyboard(kb, dwell=1.0)
+    assert model.word_slot_times == [0.5]
+    assert model.letter_times == {"x": 1.5, "y": 2.5}
+    assert model.space_time == 3.5
+    assert model.savings("x", "xyy") == pytest.approx(2.5 * 2 + 3.5 - 0.5)
+
+
+def test_ranking_prefers_words_that_save_scan_time():
+    letters = {c: i + 0.5 for i, c in enumerate("abcdefghijklmnopqrstuvwxyz")}
+    model = ScanCostModel(letters, [0.5], space_time=0.5)
+    pred = Predictor(["ab", "abcdefgh"], cache_dir=None)
+    assert pred.suggest_words("a", 2) == ["ab", "abcdefgh"]
+
+    pred.scan_cost = model
+    assert pred.suggest_words("a", 2) == ["abcdefgh", "ab"]
+    gains = dict(pred.expected_savings("a", 2))
+    assert gains["ab"] == pytest.approx(1.5 / 1.5)
+    assert gains["abcdefgh"] == pytest.approx(31.5 * 0.5 / 1.5)
+
+    pred.scan_cost = None
+    assert pred.suggest_words("a", 2) == ["ab", "abcdefgh"]
+    with pytest.raises(ValueError):
+        pred.expected_savings("a")
+
+
+def test_savings_use_the_slot_each_word_lands_in():
+    letters = {c: i + 0.5 for i, c in enumerate("abcdefghijklmnopqrstuvwxyz")}
+    model = ScanCostModel(letters, [0.5, 10.5], space_time=0.5)
+    pred = Predictor(["ab", "abcdefgh"], cache_dir=None, scan_cost=model)
+    gains = pred.expected_savings("a", 2)
+    assert [w for w, _ in gains] == ["abcdefgh", "ab"]
+    assert gains[0][1] == pytest.approx(31.5 * 0.5 / 1.5)
+    # "ab" is only reached in the slower second slot, where it costs time
+    assert gains[1][1] == pytest.approx((2.0 - 10.5) / 1.5)
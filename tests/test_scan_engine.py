@@ -101,3 +101,16 @@ def test_reset_scan_row_resets_to_row_start_without_global_reset():
     # next tick should proceed to index 1 again
     kb.root.scheduled.pop(0)()
     assert kb.highlight_index == 1
+
+
+def test_step_advances_without_waiting_for_dwell():
+    kb = DummyKeyboard()
+    scanner = Scanner(kb, dwell=0.1)
+    scanner.start()
+    assert kb.highlight_index == 0
+    scanner.step()
+    scanner.step()
+    assert kb.highlight_index == 2
+    assert len(kb.root.scheduled) == 1
+    scanner.on_press()
+    assert kb.pressed == [2]
@@ -0,0 +1,260 @@
+import contextlib
+import importlib
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+sys.modules.setdefault("sounddevice", SimpleNamespace())
+
+import switch_interface.detection as detection
+from switch_interface.audio.supervisor import AudioSupervisor, InputState
+from switch_interface.audio.wakeup import Wakeup
+
+
+class FakeDevice:
+    """Scripted device: each open either fails or delivers ``blocks`` callbacks."""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.opens = 0
+        self.callback = None
+        self.pending = 0
+
+    @contextlib.contextmanager
+    def open(self, *, callback, **kwargs):
+        self.opens += 1
+        outcome = self.script.pop(0) if self.script else "fail"
+        if outcome == "fail":
+            raise RuntimeError("device unplugged")
+        self.callback = callback
+        self.pending = outcome
+        yield self
+
+    @property
+    def active(self):
+        return True
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _run(script, stop_after, **options):
+    device = FakeDevice(script)
+    clock = Clock()
+    states = []
+    refreshes = []
+    polls = []
+
+    def sleep(seconds):
+        clock.now += seconds
+        if device.pending:
+            device.pending -= 1
+            device.callback("audio")
+
+    supervisor = AudioSupervisor(
+        stall_timeout=0.1,
+        on_state=states.append,
+        open_stream=device.open,
+        refresh_devices=lambda: refreshes.append(clock.now),
+        clock=clock,
+        sleep=sleep,
+        **options,
+    )
+    # backoff waits go through the stop event; record and skip them
+    waits = []
+    supervisor._stop.wait = lambda delay: waits.append(delay) or False
+
+    def on_poll():
+        polls.append(clock.now)
+        if len(polls) >= stop_after:
+            supervisor.stop()
+
+    supervisor.run(lambda *a: None, on_poll, 0.01)
+    return supervisor, device, states, refreshes, waits
+
+
+def test_reopens_a_stalled_stream_and_reports_states():
+    # first stream delivers 3 blocks then stalls; the second keeps going
+    supervisor, device, states, refreshes, waits = _run([3, 1000], stop_after=40)
+    assert device.opens == 2
+    assert supervisor.reconnects == 1
+    assert refreshes == []  # the cached device was reused
+    assert states == [
+        InputState.connecting,
+        InputState.running,
+        InputState.reconnecting,
+        InputState.running,
+        InputState.stopped,
+    ]
+    assert waits == [0.05]
+
+
+def test_backoff_grows_and_refreshes_devices_until_it_reconnects():
+    supervisor, device, states, refreshes, waits = _run(
+        ["fail"] * 6 + [1000], stop_after=5, initial_backoff=0.1, max_backoff=1.0
+    )
+    assert waits == pytest.approx([0.1, 0.2, 0.4, 0.8, 1.0, 1.0])
+    assert len(refreshes) == 5  # every retry after the first
+    assert states[-2:] == [InputState.running, InputState.stopped]
+    assert supervisor.error is None
+    assert supervisor.reconnects == 0
+
+
+def test_errors_from_the_consumer_propagate_without_reconnecting():
+    device = FakeDevice([1000])
+    supervisor = AudioSupervisor(
+        open_stream=device.open, refresh_devices=lambda: None, sleep=lambda s: None
+    )
+
+    def on_poll():
+        raise ValueError("detector bug")
+
+    with pytest.raises(ValueError, match="detector bug"):
+        supervisor.run(lambda *a: None, on_poll, 0.01)
+    assert device.opens == 1
+    assert supervisor.reconnects == 0
+    assert supervisor.error is None
+    assert supervisor.state is InputState.stopped
+
+
+def test_open_input_resolves_each_device_once(monkeypatch):
+    import switch_interface.audio.stream as stream
+
+    importlib.reload(stream)
+
+    opened = []
+
+    class Backend:
+        @contextlib.contextmanager
+        def open(self, **kwargs):
+            opened.append(kwargs["device"])
+            yield None
+
+    lookups = []
+    monkeypatch.setattr(stream, "_discover_backends", lambda: None)
+    monkeypatch.setattr(
+        stream, "_select_backend", lambda device: lookups.append(device) or Backend()
+    )
+    for _ in range(3):
+        with stream.open_input(samplerate=1, blocksize=1, callback=None, device="usb"):
+            pass
+    assert lookups == ["usb"] and opened == ["usb"] * 3
+    stream.refresh_devices()
+    with stream.open_input(samplerate=1, blocksize=1, callback=None, device="usb"):
+        pass
+    assert lookups == ["usb", "usb"]
+
+
+def test_refresh_devices_restarts_portaudio_only_if_it_can(monkeypatch):
+    import switch_interface.audio.stream as stream
+
+    calls = []
+    monkeypatch.setattr(
+        stream,
+        "sd",
+        SimpleNamespace(
+            _terminate=lambda: calls.append("terminate"),
+            _initialize=lambda: calls.append("initialize"),
+        ),
+    )
+    stream.refresh_devices()
+    assert calls == ["terminate", "initialize"]
+
+    monkeypatch.setattr(stream, "sd", SimpleNamespace())  # private API gone
+    stream._RESOLVED["usb"] = None
+    stream.refresh_devices()
+    assert stream._RESOLVED == {}
+
+
+def test_stop_before_run_is_not_lost():
+    device = FakeDevice([1000])
+    supervisor = AudioSupervisor(open_stream=device.open, refresh_devices=lambda: None)
+    supervisor.stop()
+    runner = threading.Thread(
+        target=supervisor.run, args=(lambda *a: None, lambda: None, 0.01), daemon=True
+    )
+    runner.start()
+    runner.join(5)
+    assert not runner.is_alive()
+    assert device.opens == 0
+    assert supervisor.state is InputState.stopped
+
+def test_wakeup_cuts_the_poll_wait_short():
+    wake = Wakeup()
+    wake.set()
+    device = FakeDevice([1000])
+    polls = []
+
+    def sleep(seconds):
+        raise AssertionError("waited with sleep instead of the wakeup")
+
+    supervisor = AudioSupervisor(
+        open_stream=device.open, refresh_devices=lambda: None, sleep=sleep
+    )
+
+    def on_poll():
+        polls.append(time.monotonic())
+        if len(polls) < 3:
+            device.callback("audio")  # the callback signals more work
+        elif len(polls) == 3:
+            threading.Timer(0.05, supervisor.stop).start()
+
+    start = time.monotonic()
+    supervisor.run(lambda *a: wake.set(), on_poll, 10.0, wake=wake)
+    assert len(polls) == 4
+    assert time.monotonic() - start < 5
+    assert supervisor.state is InputState.stopped
+
+
+def test_listen_keeps_detecting_after_a_reconnect(monkeypatch):
+    press = np.zeros((64, 1), dtype=np.float32)
+    press[32:] = -1.0
+    idle = np.zeros((64, 1), dtype=np.float32)
+    # the first stream goes quiet after two blocks and is reopened
+    feeds = iter([press, idle] + [None] * 5 + [idle, press, idle])
+    device = FakeDevice([2, 1000])
+    clock = Clock()
+    presses = []
+
+    def sleep(seconds):
+        clock.now += seconds
+        block = next(feeds, None)
+        if block is not None:
+            device.callback(block, 64, None, 0)
+        if len(presses) == 2:
+            supervisor.stop()
+
+    supervisor = AudioSupervisor(
+        stall_timeout=0.25,
+        open_stream=device.open,
+        refresh_devices=lambda: None,
+        clock=clock,
+        sleep=sleep,
+    )
+    supervisor._stop.wait = lambda delay: False
+
+    class SteppedWakeup(Wakeup):
+        def wait(self, timeout=None):
+            sleep(timeout)
+            return super().wait(0)
+
+    monkeypatch.setattr(detection, "Wakeup", SteppedWakeup)
+    detection.listen(
+        presses.append,
+        samplerate=1000,
+        blocksize=64,
+        debounce_ms=10,
+        supervisor=supervisor,
+    )
+    assert len(presses) == 2
+    assert device.opens == 2
+    assert supervisor.state is InputState.stopped
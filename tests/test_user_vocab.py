@@ -0,0 +1,96 @@
+import pytest
+
+from switch_interface.predictive import Predictor
+from switch_interface.user_vocab import UserVocabulary, WordBigrams
+
+DAY = 86_400.0
+
+
+def test_scores_accumulate_and_decay():
+    vocab = UserVocabulary(None, half_life_days=1.0)
+    vocab.learn("Aspirin", now=0.0)
+    vocab.learn("aspirin", now=0.0)
+    assert vocab.score("aspirin", now=0.0) == pytest.approx(2.0)
+    assert vocab.score("aspirin", now=DAY) == pytest.approx(1.0)
+    assert not vocab.learn("  ")
+    assert not vocab.learn("123")
+
+
+def test_capacity_evicts_weakest_word():
+    vocab = UserVocabulary(None, capacity=2)
+    for word in ["alice", "alice", "bob", "carol"]:
+        vocab.learn(word, now=0.0)
+    assert len(vocab) == 2
+    assert "alice" in vocab and "bob" not in vocab
+
+
+def test_log_replays_and_compacts(tmp_path):
+    path = str(tmp_path / "vocab.log")
+    vocab = UserVocabulary(path, compact_every=3)
+    for _ in range(5):
+        vocab.learn("ibuprofen", now=0.0)
+    assert len(open(path).read().splitlines()) == 1  # compacted on the 5th
+    vocab.learn("jo", now=0.0)
+    assert len(open(path).read().splitlines()) == 2
+
+    again = UserVocabulary(path)
+    assert again.score("ibuprofen", now=0.0) == pytest.approx(5.0)
+    assert again.score("jo", now=0.0) == pytest.approx(1.0)
+
+
+def test_words_evicted_on_learning_are_not_logged(tmp_path):
+    path = tmp_path / "vocab.log"
+    vocab = UserVocabulary(str(path), capacity=1)
+    for _ in range(3):
+        vocab.learn("ibuprofen", now=0.0)
+    vocab.learn("jo", now=0.0)  # scores 1, below ibuprofen's 3: evicted
+    assert "jo" not in vocab
+    assert "jo" not in path.read_text()
+    assert list(UserVocabulary(str(path)).keys) == ["ibuprofen"]
+
+
+def test_learned_words_rank_in_predictions():
+    words = ["the", "then", "there", "them", "they"]
+    predictor = Predictor(words, user_vocab=UserVocabulary(None), user_weight=1.0)
+    assert predictor.suggest_words("th", 2) == ["the", "then"]
+    assert predictor.suggest_letters("thx", 1) != ["o"]
+
+    for _ in range(4):
+        predictor.learn("thomas")
+    predictor.learn("they")
+    assert predictor.suggest_words("th", 2) == ["thomas", "they"]
+    assert predictor.suggest_letters("th", 1) == ["o"]
+    session = predictor.session()
+    session.push("tho")
+    assert session.words(3) == ["thomas"]
+
+
+def test_word_bigrams_bounded_and_persistent(tmp_path):
+    path = str(tmp_path / "bigrams.log")
+    bigrams = WordBigrams(path, capacity=3)
+    for prev, word in [("i", "want"), ("i", "want"), ("i", "need"), ("want", "tea")]:
+        bigrams.add(prev, word)
+    assert bigrams.successors("I", 2) == ["want", "need"]
+    bigrams.add("need", "help")  # evicts a count-1 transition
+    assert len(bigrams) == 3
+    assert bigrams.successors("i", 1) == ["want"]
+
+    again = WordBigrams(path, capacity=3)
+    assert again.successors("i", 1) == ["want"]
+    assert again.successors("need", 1) == ["help"]
+
+
+def test_next_word_prediction_between_words():
+    predictor = Predictor(
+        ["the", "to", "and", "coffee", "tea"],
+        user_vocab=UserVocabulary(None),
+        next_words=WordBigrams(None),
+    )
+    session = predictor.session()
+    assert session.words(3) == ["the", "to", "and"]
+    for word in ["i", "want", "tea"]:
+        session.push(word)
+        session.commit()
+    session.commit("I")
+    assert session.previous == "i"
+    assert session.words(3) == ["want", "i", "tea"]
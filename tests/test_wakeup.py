@@ -0,0 +1,27 @@
+import threading
+
+from switch_interface.audio.wakeup import Wakeup
+
+
+def test_set_wakes_a_waiting_consumer():
+    wake = Wakeup()
+    try:
+        assert not wake.wait(0)
+        threading.Timer(0.01, wake.set).start()
+        assert wake.wait(5)
+        wake.clear()
+        assert not wake.wait(0)
+    finally:
+        wake.close()
+
+
+def test_set_never_blocks_when_wakeups_pile_up():
+    wake = Wakeup()
+    try:
+        for _ in range(1_000_000):  # far more than the socket buffer holds
+            wake.set()
+        wake.clear()
+        assert not wake.wait(0)
+    finally:
+        wake.close()
+    wake.set()  # and not after close either
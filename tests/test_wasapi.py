@@ -3,6 +3,8 @@ import sys
 import types
 import pytest
 
+from switch_interface.audio.wakeup import Wakeup
+
 
 def _reload_with_dummy_sd(monkeypatch, sd_mod):
     monkeypatch.setitem(sys.modules, "sounddevice", sd_mod)
@@ -67,7 +69,11 @@ def test_listen_retries_shared_mode(monkeypatch):
     import switch_interface.detection as detection
     importlib.reload(detection)
 
-    monkeypatch.setattr(detection.time, "sleep", lambda _: (_ for _ in ()).throw(KeyboardInterrupt))
+    class InterruptedWakeup(Wakeup):
+        def wait(self, timeout=None):
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(detection, "Wakeup", InterruptedWakeup)
 
     detection.listen(lambda: None, samplerate=1, blocksize=1)
 
@@ -102,7 +108,11 @@ def test_listen_raises_runtime_error(monkeypatch):
     import switch_interface.detection as detection
     importlib.reload(detection)
 
-    monkeypatch.setattr(detection.time, "sleep", lambda _: (_ for _ in ()).throw(KeyboardInterrupt))
+    class InterruptedWakeup(Wakeup):
+        def wait(self, timeout=None):
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(detection, "Wakeup", InterruptedWakeup)
 
     with pytest.raises(RuntimeError):
         detection.listen(lambda: None, samplerate=1, blocksize=1)